@@ -0,0 +1,234 @@
+import gzip
+import logging
+import mmap
+import os
+import sys
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, List
+
+# 按 orjson → ujson → 标准库json 的顺序选择JSON后端，导入时只确定一次，
+# 热路径直接调用模块级的_loads/_dumps
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    orjson = None
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+    _loads = _json.loads
+
+    def _dumps(obj):
+        return _json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# simdjson使用SIMD指令扫描结构字符，并支持按需访问字段，解析速度最快
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# msgspec按已知的文件结构生成专用解码器，只解码用到的两个字段，其余字段直接跳过。
+# 两个字段不限定类型：类型化解码是严格的，否则一条名称为数字的物品就会使整个文件解码失败，
+# 而其他解析路径只会保留或跳过该物品，输出不应取决于安装了哪个可选库
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+else:
+    class _Keyword(msgspec.Struct):
+        objectID: Any = None
+        objectName: Any = None
+
+
+    class _KeywordData(msgspec.Struct):
+        keywords: List[_Keyword]
+
+    class _ReturnDocument(msgspec.Struct):
+        data: _KeywordData
+
+    _decode_return_document = msgspec.json.Decoder(_ReturnDocument).decode
+
+# ijson流式解析，大文件时只在内存中保留当前物品，降低峰值内存
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# 超过该大小的文件使用流式解析（字节）
+STREAM_THRESHOLD = 32 * 1024 * 1024
+
+# JSON解析失败时抛出的异常类型，各JSON后端的解析错误均为ValueError子类
+DECODE_ERRORS = (ValueError, msgspec.DecodeError) if msgspec is not None else (ValueError,)
+
+# 输出文件：按ID排序的ids/names并列数组，文件名以.gz结尾时写入gzip压缩后的内容
+MAPPING_FILE = 'item_mapping.json.gz'
+
+# 设置日志配置：显式创建处理器和格式器，不在导入时调用basicConfig改动根日志器
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(_handler)
+
+
+def _prefetch(f):
+    """通知内核立即在后台预读整个文件，磁盘读取与后续的解析准备重叠进行"""
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+
+@contextmanager
+def _open_buffer(filename):
+    """将文件只读映射到内存，解析器直接从页缓存读取，省去read()的整块拷贝"""
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap无法映射空文件，交由解析器报告解析错误
+            yield b''
+            return
+        _prefetch(f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                # 顺序访问提示，内核提前预读后续页面
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                yield view
+
+
+def _complete_pairs(items):
+    """从物品字典中取出(objectID, objectName)，跳过缺少ID或名称的物品"""
+    return ((object_id, name) for item in items
+            if (object_id := item.get('objectID')) is not None
+            and (name := item.get('objectName')) is not None)
+
+
+def iter_item_pairs(filename):
+    """逐个返回文件中data.keywords数组物品的(objectID, objectName)"""
+    if ijson is not None and os.path.getsize(filename) >= STREAM_THRESHOLD:
+        with open(filename, 'rb') as f:
+            yield from _complete_pairs(ijson.items(f, 'data.keywords.item'))
+        return
+    
+    if msgspec is not None:
+        with _open_buffer(filename) as buf:
+            document = _decode_return_document(buf)
+        for keyword in document.data.keywords:
+            if keyword.objectID is not None and keyword.objectName is not None:
+                yield keyword.objectID, keyword.objectName
+        return
+    
+    # 读取并解析JSON文件
+    if simdjson is not None:
+        # 按需解析：只有访问到的keywords字段才会转换为Python对象
+        parser = simdjson.Parser()
+        with open(filename, 'rb') as f:
+            _prefetch(f)
+            data = parser.parse(f.read())
+    elif orjson is not None:
+        # orjson可以直接解析内存映射的缓冲区
+        with _open_buffer(filename) as buf:
+            data = _loads(buf)
+    else:
+        with open(filename, 'rb') as f:
+            _prefetch(f)
+            data = _loads(f.read())
+    yield from _complete_pairs(data['data']['keywords'])
+
+
+def build_item_mapping(filename):
+    """构建物品ID到名称的映射"""
+    # dict()直接消费(ID, 名称)键值对
+    return dict(iter_item_pairs(filename))
+
+
+
+def build_item_index(item_mapping):
+    """将映射转换为按ID排序的两个并列数组，查询时二分查找
+    
+    return.txt中的ID可能是数字也可能是字符串，统一转为字符串后再排序，避免混合类型比较出错
+    """
+    pairs = sorted((str(object_id), name) for object_id, name in item_mapping.items())
+    return {'ids': [object_id for object_id, _ in pairs], 'names': [name for _, name in pairs]}
+
+
+def load_item_index(filename=MAPPING_FILE):
+    """读取write_output写出的物品映射文件，返回可直接交给lookup_item_name的ids/names索引"""
+    with open(filename, 'rb') as f:
+        payload = f.read()
+    if filename.endswith('.gz'):
+        payload = gzip.decompress(payload)
+    return _loads(payload)
+
+
+
+def lookup_item_name(item_index, object_id):
+    """在build_item_index生成的索引中查找物品名称，找不到时返回None"""
+    ids = item_index['ids']
+    object_id = str(object_id)
+    pos = bisect_left(ids, object_id)
+    if pos < len(ids) and ids[pos] == object_id:
+        return item_index['names'][pos]
+    return None
+
+
+def write_report(item_mapping, stream=None):
+    """将物品对应关系清单整体编码为UTF-8后一次写入，不经过逐行的文本编码和日志处理器"""
+    if stream is None:
+        stream = sys.stdout
+    payload = "".join(f"ID: {obj_id} -> 名称: {name}\n" for obj_id, name in item_mapping.items())
+    # 没有底层字节缓冲区的文本流（如被替换的sys.stdout）退回到文本写入
+    buffer = getattr(stream, 'buffer', None)
+    if buffer is None:
+        stream.write(payload)
+        stream.flush()
+        return
+    stream.flush()
+    buffer.write(payload.encode('utf-8'))
+    buffer.flush()
+
+
+def write_output(filename, payload):
+    """写入输出文件，.gz文件使用低压缩级别以减少CPU开销"""
+    if filename.endswith('.gz'):
+        payload = gzip.compress(payload, compresslevel=1)
+    # 直接使用文件描述符写入，绕过缓冲层；整块数据通常一次write即可写完
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        with memoryview(payload) as view:
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        # 只同步数据本身，不强制刷新无关的元数据
+        getattr(os, 'fdatasync', os.fsync)(fd)
+    finally:
+        os.close(fd)
+
+
+if __name__ == '__main__':
+    try:
+        # 提取物品ID和名称的映射关系
+        item_mapping = build_item_mapping('return.txt')
+    
+        # 记录结果：清单整体拼接后一次写入标准输出
+        logger.info("物品ID与名称对应关系:")
+        write_report(item_mapping)
+    
+        # 以按ID排序的并列数组保存：读取方无需重建字典，用lookup_item_name二分查找；
+        # 先完整序列化为紧凑的bytes，再一次性写入
+        write_output(MAPPING_FILE, _dumps(build_item_index(item_mapping)))
+    
+        logger.info("结果已保存到 %s 文件", MAPPING_FILE)
+    
+
+    except FileNotFoundError:
+        logger.error("未找到return.txt文件")
+    except DECODE_ERRORS as e:
+        logger.error("JSON解析错误: %s", e)
+    except Exception as e:
+        logger.error("处理过程中发生错误: %s", e)
\ No newline at end of file
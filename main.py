@@ -15,6 +15,8 @@ class DFMQueryApp(toga.App):
         self.config_file = "user_config.ini"
         self.openid = ""
         self.access_token = ""
+        # 共享的HTTP会话，同一主机的后续请求复用已建立的TCP+TLS连接
+        self.http = requests.Session()
         self.load_config()
     
     def load_config(self):
@@ -200,7 +202,7 @@ class DFMQueryApp(toga.App):
             
             # 获取帮助文档内容
             help_url = "https://docs.qq.com/document/DS2hWc29pSGVIa3dM"
-            response = requests.get(help_url, timeout=15)
+            response = self.http.get(help_url, timeout=15)
             
             if response.status_code == 200:
                 # 尝试获取文档内容
@@ -417,7 +419,7 @@ class DFMQueryApp(toga.App):
             }
             
             # 发送POST请求
-            response = requests.post(url, params=params, headers=headers, timeout=10)
+            response = self.http.post(url, params=params, headers=headers, timeout=10)
             
             # 打印调试信息
             print(f"查询类型: {query_type}")
@@ -1138,7 +1140,7 @@ class DFMQueryApp(toga.App):
                 query_params['item'] = item_id
                 
                 # 发送POST请求
-                response = requests.post(url, params=query_params, headers=headers, timeout=10)
+                response = self.http.post(url, params=query_params, headers=headers, timeout=10)
                 
                 if response.status_code == 200:
                     data = response.json()
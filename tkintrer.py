@@ -1,22 +1,65 @@
-import http.client
 import json
+import csv
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog, font
 from datetime import datetime, timedelta
 import urllib.parse
 import threading
+import functools
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
+import re
+import shutil
 import ast
 import configparser
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout, ConnectionError
 import logging
-import traceback
-from typing import Dict, Any, Optional, List, Union
+import logging.handlers
+import sys
+from typing import Dict, Any, Optional, List, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
+from operator import itemgetter
 import time
+import random
 import socket
+import weakref
+
+# 安装了orjson时用它解析API响应，速度比标准库json快数倍；未安装时回退到标准库。
+# orjson.JSONDecodeError是json.JSONDecodeError的子类，原有的异常处理无需修改
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# 程序所在目录，配置文件和日志目录都相对于该目录
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# 配置文件路径在导入时解析一次
+_CONFIG_PATH = os.path.join(_APP_DIR, 'config.json')
+_LEGACY_CONFIG_PATH = os.path.join(_APP_DIR, 'config.ini')
+
+# 表格每批插入的行数：先显示第一批，滚动接近已显示行的底部时再追加下一批
+_TABLE_PAGE_ROWS = 200
+
+# 建立连接的超时时间（秒）
+_CONNECT_TIMEOUT = 3.05
+
+# 数据接口的主机地址及各图表固定的请求参数，查询和导出共用，构建请求时与动态参数合并
+_API_HOST = 'comm.ams.game.qq.com'
+_RECORD_CHART_PARAMS = {'iChartId': '316969', 'iSubChartId': '316969', 'sIdeToken': 'NoOapI'}
+_FRIEND_CHART_PARAMS = {'iChartId': '316968', 'iSubChartId': '316968', 'sIdeToken': 'KfXJwH'}
+_CURRENCY_CHART_PARAMS = {'iChartId': '319386', 'iSubChartId': '319386', 'sIdeToken': 'zMemOt'}
+_SPECIAL_DUTY_PARAMS = {'iChartId': '365589', 'iSubChartId': '365589', 'sIdeToken': 'bQaMCQ', 'source': '2'}
+
+# 下拉框的可选值，各标签页共用同一个元组
+_MODE_VALUES = ('sol', 'mp')
+_ACC_VALUES = ('qc', 'wx')
+_CURRENCY_VALUES = ('17020000010', '17888808889', '17888808888')
 
 
 class QueryStatus(Enum):
@@ -34,13 +77,27 @@ class QueryResult:
     status: QueryStatus
     data: Optional[Any] = None
     error: Optional[str] = None
-    timestamp: Optional[datetime] = None
+    timestamp: Optional[int] = None  # time.time_ns()，显示时再转换为datetime
     cached: bool = False
+    
+    def format_timestamp(self, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+        """格式化时间戳用于显示"""
+        if self.timestamp is None:
+            return ""
+        return datetime.fromtimestamp(self.timestamp / 1e9).strftime(fmt)
 
 
 class ErrorHandler:
     """统一的错误处理类"""
     
+    # 应用主窗口的弱引用，工作线程中的错误提示通过它转交主线程显示
+    _root_ref = None
+    
+    @staticmethod
+    def bind_root(root):
+        """记录应用主窗口"""
+        ErrorHandler._root_ref = weakref.ref(root)
+    
     @staticmethod
     def handle_exception(func_name: str, exception: Exception, 
                         show_ui: bool = True, log_error: bool = True) -> str:
@@ -48,13 +105,18 @@ class ErrorHandler:
         error_msg = f"{func_name} 发生错误: {str(exception)}"
         
         if log_error:
-            logging.error(f"{error_msg}\n{traceback.format_exc()}")
+            # 异常堆栈由logging在确实需要输出时才格式化
+            logging.error("%s", error_msg, exc_info=True)
         
         if show_ui:
-            # 避免在主线程外显示UI错误
             try:
-                if threading.current_thread() == threading.main_thread():
+                if threading.current_thread() is threading.main_thread():
                     messagebox.showerror("错误", error_msg)
+                else:
+                    # 主线程外不能直接操作UI，通过after交给主线程的事件循环显示
+                    root = ErrorHandler._root_ref() if ErrorHandler._root_ref is not None else None
+                    if root is not None:
+                        root.after(0, messagebox.showerror, "错误", error_msg)
             except:
                 pass
         
@@ -69,6 +131,10 @@ class ErrorHandler:
             return ErrorHandler.handle_exception(func.__name__, e)
 
 
+# 字典字符串的分词正则：引号字符串（未闭合时延伸到末尾）整体匹配，其余只匹配分隔用的逗号
+_DICT_TOKEN_RE = re.compile(r'''"(?:[^"\\]|\\.)*"?|'(?:[^'\\]|\\.)*'?|,''')
+
+
 def parse_dict_like_string(s: str) -> Dict[str, Any]:
     """优化的字典字符串解析函数"""
     if not s or s == '{}':
@@ -82,23 +148,22 @@ def parse_dict_like_string(s: str) -> Dict[str, Any]:
     if not s:
         return result
 
-    # 使用更高效的解析方法
+    # 快速路径：合法的Python字典字面量直接交给literal_eval一次解析
+    try:
+        parsed = ast.literal_eval('{' + s + '}')
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        parsed = None
+    if isinstance(parsed, dict) and all(isinstance(key, str) for key in parsed):
+        return parsed
+
+    # 回退：按引号外的逗号拆分键值对，由正则引擎完成分词
     pairs = []
     start = 0
-    in_quotes = False
-    quote_char = None
-
-    for i, char in enumerate(s):
-        if char in ('"', "'") and (i == 0 or s[i - 1] != '\\'):
-            if not in_quotes:
-                in_quotes = True
-                quote_char = char
-            elif char == quote_char:
-                in_quotes = False
-                quote_char = None
-        elif char == ',' and not in_quotes:
-            pairs.append(s[start:i].strip())
-            start = i + 1
+
+    for match in _DICT_TOKEN_RE.finditer(s):
+        if match.group() == ',':
+            pairs.append(s[start:match.start()].strip())
+            start = match.end()
 
     if start < len(s):
         pairs.append(s[start:].strip())
@@ -125,6 +190,193 @@ def parse_dict_like_string(s: str) -> Dict[str, Any]:
     return result
 
 
+# '#'分隔的字典样式记录（如干员使用数、高价值物品列表）中的键值对：
+# 键可带引号，值为单/双引号字符串，或到逗号、右花括号为止的原始文本
+_RECORD_KV_RE = re.compile(r"""['"]?(\w+)['"]?\s*:\s*(?:'([^']*)'|"([^"]*)"|([^,}]*))""")
+_INT_RE = re.compile(r'-?\d+')
+_FLOAT_RE = re.compile(r'-?\d+\.\d*|-?\.\d+')
+
+
+def _parse_records(text: str) -> List[Dict[str, Any]]:
+    """将'#'分隔的字典样式记录解析为字典列表，由正则一次提取每条记录的全部键值对
+    
+    未加引号的整数和小数直接转换为数值，其余未加引号的值（True、None、1e5等）交给literal_eval，
+    与parse_dict_like_string得到的类型一致，无法解析时保留原始字符串；没有键值对的记录被忽略。
+    含转义字符或相邻引号的记录正则无法正确切分字符串，整条交给parse_dict_like_string解析
+    """
+    records = []
+    for record in text.split('#'):
+        if '\\' in record or "''" in record or '""' in record:
+            fields = parse_dict_like_string(record.strip())
+            if fields:
+                records.append(fields)
+            continue
+        fields = {}
+        for key, single, double, raw in _RECORD_KV_RE.findall(record):
+            if raw:
+                raw = raw.strip()
+                if _INT_RE.fullmatch(raw):
+                    fields[key] = int(raw)
+                elif _FLOAT_RE.fullmatch(raw):
+                    fields[key] = float(raw)
+                else:
+                    try:
+                        fields[key] = ast.literal_eval(raw)
+                    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+                        fields[key] = raw
+            else:
+                fields[key] = single or double
+        if fields:
+            records.append(fields)
+    return records
+
+
+def _aggregate_operators(text: str) -> List[Tuple[str, int]]:
+    """汇总干员使用记录，返回按使用次数降序排列的(干员ID, 次数)列表
+    
+    一次遍历完成解析和累加；次数无法转换为整数或缺少干员ID的记录被忽略
+    """
+    counts = {}
+    get_count = counts.get
+    for op_item in _parse_records(text):
+        try:
+            op_count = int(op_item.get('inum', 0))
+        except (TypeError, ValueError):
+            continue
+        op_id = op_item.get('ArmedForceId')
+        if op_id is None or op_id == '':
+            continue
+        op_id = sys.intern(str(op_id))
+        counts[op_id] = get_count(op_id, 0) + op_count
+    return sorted(counts.items(), key=itemgetter(1), reverse=True)
+
+
+def _format_left_time(left_time_seconds):
+    """将剩余秒数格式化为HH:MM:SS，剩余时间为0时返回“已完成”"""
+    if left_time_seconds <= 0:
+        return "已完成"
+    minutes, seconds = divmod(left_time_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+# 表格视图的列定义：(列名, 列标题)，数据行按相同顺序给出各列的值
+_SPECIAL_DUTY_HEADERS = (('name', '名称'), ('status', '状态'), ('level', '等级'), ('remain_time', '剩余时间'))
+_CURRENCY_HEADERS = (('currency_type', '货币类型'), ('amount', '数量'), ('description', '说明'))
+
+
+# 常用tk原生控件的Python类型到Tk类名的映射，应用主题时直接按type()查找，不必经过Tcl调用winfo_class()
+_WIDGET_CLASS_NAMES = {
+    tk.Tk: 'Tk',
+    tk.Toplevel: 'Toplevel',
+    tk.Frame: 'Frame',
+    tk.Text: 'Text',
+    scrolledtext.ScrolledText: 'Text',
+    tk.Button: 'Button',
+    tk.Label: 'Label',
+    tk.Entry: 'Entry',
+    tk.Listbox: 'Listbox',
+    tk.Scrollbar: 'Scrollbar',
+    tk.Scale: 'Scale',
+    tk.Canvas: 'Canvas'
+}
+
+
+# 主线程检查后台配置写入是否完成的间隔（毫秒）
+_CONFIG_SAVE_POLL_MS = 20
+
+# 主线程检查后台物品映射是否加载完成的间隔（毫秒）
+_MAPPING_POLL_MS = 50
+
+# 自动刷新间隔延长（数据未变化或连续失败）时的上限（秒），配置的间隔更长时以配置为准
+_MAX_REFRESH_INTERVAL = 600
+
+# 数字字符串（整数或小数，可带负号），一次匹配完成判断，不必先生成替换后的新字符串
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+# 导出CSV时文本表格的列分隔符：制表符或连续多个空白字符
+_CSV_SEP_RE = re.compile(r'\s{2,}|\t')
+
+
+def _format_stat_value(value):
+    """将数字或数字字符串格式化为带千分位的文本，其他值原样返回"""
+    # 接口返回的数值多数已是int/float，按类型直接格式化，不必先转为字符串检查（bool原样返回）
+    value_type = type(value)
+    if value_type is int:
+        return f"{value:,}"
+    if value_type is float:
+        return f"{value:,.1f}"
+    if value_type is not str or not _NUM_RE.fullmatch(value):
+        return value
+    # 通过正则检查的字符串一定能转换为数值，不需要异常处理
+    if '.' in value:
+        return f"{float(value):,.1f}"
+    return f"{int(value):,}"
+
+
+# 各文本报告的标题行，按模式取用；sol以外的模式都按全面战场显示
+_DAILY_TITLES = {'sol': "=== 烽火地带昨日日报 ===\n\n", 'mp': "=== 全面战场昨日日报 ===\n\n"}
+_WEEKLY_TITLES = {'sol': "=== 烽火地带战场周报 ===\n\n", 'mp': "=== 全面战场战场周报 ===\n\n"}
+_FRIEND_TITLES = {'sol': "=== 烽火地带周报队友数据 ===\n\n", 'mp': "=== 全面战场周报队友数据 ===\n\n"}
+
+# 战场周报的字段及显示名称，按显示顺序排列
+_WEEKLY_FIELDS = (
+    ('Consume_Bullet_Num', '总消耗弹药数'),
+    ('Hit_Bullet_Num', '总命中子弹数'),
+    ('Kill_Num', '总击杀数'),
+    ('Kill_type1_Num', '载具击杀数量'),
+    ('Rank_Match_Score', '排位分'),
+    ('Rescue_Campmate_Count', '救援阵营队友数'),
+    ('Rescue_Teammate_Count', '救援小队队友数'),
+    ('SBattle_Support_CostScore', '局内支援呼叫消耗分数'),
+    ('SBattle_Support_UseNum', '局内支援呼叫次数'),
+    ('Teammate_Reborn_Num', '队友重生次数'),
+    ('Used_Time', '使用次数'),
+    ('by_Rescue_num', '被救援次数'),
+    ('continuous_Kill_Num', '最高连续击杀'),
+    ('total_Occupy', '占点数'),
+    ('total_gametime', '总游戏时长(秒)'),
+    ('total_num', '对局场次'),
+    ('total_score', '总得分'),
+    ('win_num', '胜场'),
+    ('DeployArmedForceType_KillNum', '本命干员完成击杀'),
+    ('DeployArmedForceType_gametime', '本命干员游戏时长(秒)'),
+    ('DeployArmedForceType_inum', '本命干员完成对局'),
+    ('max_inum_DeployArmedForceType', '本命干员ID'),
+    ('max_inum_mapid', '地图信息')
+)
+
+# 周报队友每位队友的字段及显示名称
+_FRIEND_FIELDS = (
+    ('Friend_total_sol_num', '总场次'),
+    ('Friend_is_Escape1_num', '撤离成功'),
+    ('Friend_is_Escape2_num', '撤离失败'),
+    ('Friend_Sum_Gained_Price', '总带出价值'),
+    ('Friend_Max_Gained_Price', '最高带出价值'),
+    ('Friend_consume_Price', '总战损'),
+    ('Friend_total_sol_KillPlayer', '击杀玩家数'),
+    ('Friend_total_sol_DeathCount', '死亡次数'),
+    ('Friend_total_sol_AssistCnt', '救援次数')
+)
+
+# 烽火周报基础字段及显示名称
+_FIRE_WEEKLY_FIELDS = (
+    ('Gained_Price', '本周总带出哈夫币'),
+    ('consume_Price', '本周总带入'),
+    ('rise_Price', '本周总利润'),
+    ('total_sol_num', '本周对局数'),
+    ('total_exacuation_num', '本周撤离成功数'),
+    ('total_Kill_Player', '本周击败干员数'),
+    ('total_Kill_AI', '本周击杀AI数'),
+    ('total_Kill_Boss', '本周击杀BOSS数'),
+    ('total_Death_Count', '本周死亡数'),
+    ('GainedPrice_overmillion_num', '本周百万撤离场次'),
+    ('total_Online_Time', '本周在线时长(秒)'),
+    ('Rank_Score', '排位分数'),
+    ('Mandel_brick_num', '本周曼德尔砖破译数')
+)
+
+
 class ThemeManager:
     def __init__(self):
         # 定义浅色和深色主题
@@ -162,201 +414,168 @@ class ThemeManager:
         }
         self.current_theme = 'light'
         self.style = None
-        self._widget_cache = {}  # 添加控件缓存
-        self._style_cache = {}   # 添加样式缓存
+        self._theme_gen = 0      # 主题代数，每次切换主题递增，控件上记录已应用的代数
+        
+        # 各主题的tk原生控件配置项，在initialize_style中一次性生成
+        self._tk_config_maps = {}
     
     def initialize_style(self):
-        """初始化ttk样式"""
+        """初始化ttk样式：启动时为每个主题创建一个ttk主题，切换主题时只需theme_use"""
         if self.style is None:
             self.style = ttk.Style()
-        self._configure_ttk_styles()
+        # 以系统当前的ttk主题为基础，只覆盖颜色相关的设置
+        parent = self.style.theme_use()
+        for name in self.themes:
+            self.style.theme_create(self._ttk_theme_name(name), parent=parent, settings=self._ttk_settings(name))
+            self._build_tk_config_map(name)
+        self.style.theme_use(self._ttk_theme_name(self.current_theme))
     
-    def _configure_ttk_styles(self):
-        """配置所有ttk控件的样式，使用缓存优化性能"""
-        theme = self.get_theme()
-        theme_key = self.current_theme
-        
-        # 检查样式缓存
-        if theme_key in self._style_cache:
-            return
-        
-        # 配置滚动条样式
-        self.style.configure(
-            "Vertical.TScrollbar",
-            background=theme['scrollbar_bg'],
-            troughcolor=theme['scrollbar_bg'],
-            arrowcolor=theme['fg'],
-            bordercolor=theme['scrollbar_bg']
-        )
-        self.style.configure(
-            "Horizontal.TScrollbar",
-            background=theme['scrollbar_bg'],
-            troughcolor=theme['scrollbar_bg'],
-            arrowcolor=theme['fg'],
-            bordercolor=theme['scrollbar_bg']
-        )
-        
-        # 配置其他ttk控件样式
-        self.style.configure(
-            "TButton",
-            background=theme['button_bg'],
-            foreground=theme['button_fg'],
-            borderwidth=1,
-            relief="solid",
-            padding=6
-        )
-        self.style.map(
-            "TButton",
-            background=[
-                ("disabled", theme['button_bg']),
-                ("active", theme['frame_bg'])
-            ],
-            foreground=[
-                ("disabled", theme['fg']),
-                ("active", theme['button_fg'])
-            ]
-        )
-        
-        self.style.configure(
-            "TEntry",
-            fieldbackground=theme['entry_bg'],
-            foreground=theme['entry_fg']
-        )
-        
-        self.style.configure(
-            "TCombobox",
-            fieldbackground=theme['entry_bg'],
-            background=theme['button_bg'],
-            foreground=theme['entry_fg'],
-            arrowcolor=theme['fg']
-        )
-        self.style.map(
-            "TCombobox",
-            fieldbackground=[("readonly", theme['entry_bg'])],
-            background=[("readonly", theme['button_bg'])],
-            foreground=[("readonly", theme['entry_fg'])]
-        )
-        
-        self.style.configure(
-            "TLabel",
-            background=theme['bg'],
-            foreground=theme['fg']
-        )
-        
-        self.style.configure(
-            "TFrame",
-            background=theme['frame_bg']
-        )
-        
-        self.style.configure(
-            "TNotebook",
-            background=theme['bg']
-        )
-        self.style.configure(
-            "TNotebook.Tab",
-            background=theme['tab_bg'],
-            foreground=theme['fg']
-        )
-        self.style.map(
-            "TNotebook.Tab",
-            background=[("selected", theme['active_tab_bg'])]
-        )
-        
-        self.style.configure(
-            "Treeview",
-            background=theme['entry_bg'],
-            foreground=theme['fg'],
-            fieldbackground=theme['entry_bg'],
-            rowheight=25
-        )
-        self.style.configure(
-            "Treeview.Heading",
-            background=theme['tab_bg'],
-            foreground=theme['fg']
-        )
-        self.style.map(
-            "Treeview",
-            background=[("selected", theme['highlight'])],
-            foreground=[("selected", "white")]
-        )
-        
-        # 缓存已配置的样式
-        self._style_cache[theme_key] = True
+    @staticmethod
+    def _ttk_theme_name(name):
+        """主题对应的ttk主题名"""
+        return f"{name}_custom"
+    
+    def _ttk_settings(self, name):
+        """生成指定主题的ttk样式设置，供theme_create使用"""
+        theme = self.themes[name]
+        scrollbar = {
+            'configure': {
+                'background': theme['scrollbar_bg'],
+                'troughcolor': theme['scrollbar_bg'],
+                'arrowcolor': theme['fg'],
+                'bordercolor': theme['scrollbar_bg']
+            }
+        }
+        return {
+            # 滚动条样式
+            'Vertical.TScrollbar': scrollbar,
+            'Horizontal.TScrollbar': scrollbar,
+            # 其他ttk控件样式
+            'TButton': {
+                'configure': {
+                    'background': theme['button_bg'],
+                    'foreground': theme['button_fg'],
+                    'borderwidth': 1,
+                    'relief': "solid",
+                    'padding': 6
+                },
+                'map': {
+                    'background': [("disabled", theme['button_bg']), ("active", theme['frame_bg'])],
+                    'foreground': [("disabled", theme['fg']), ("active", theme['button_fg'])]
+                }
+            },
+            'TEntry': {
+                'configure': {
+                    'fieldbackground': theme['entry_bg'],
+                    'foreground': theme['entry_fg']
+                }
+            },
+            'TCombobox': {
+                'configure': {
+                    'fieldbackground': theme['entry_bg'],
+                    'background': theme['button_bg'],
+                    'foreground': theme['entry_fg'],
+                    'arrowcolor': theme['fg']
+                },
+                'map': {
+                    'fieldbackground': [("readonly", theme['entry_bg'])],
+                    'background': [("readonly", theme['button_bg'])],
+                    'foreground': [("readonly", theme['entry_fg'])]
+                }
+            },
+            'TLabel': {
+                'configure': {'background': theme['bg'], 'foreground': theme['fg']}
+            },
+            'TFrame': {
+                'configure': {'background': theme['frame_bg']}
+            },
+            'TNotebook': {
+                'configure': {'background': theme['bg']}
+            },
+            'TNotebook.Tab': {
+                'configure': {'background': theme['tab_bg'], 'foreground': theme['fg']},
+                'map': {'background': [("selected", theme['active_tab_bg'])]}
+            },
+            'Treeview': {
+                'configure': {
+                    'background': theme['entry_bg'],
+                    'foreground': theme['fg'],
+                    'fieldbackground': theme['entry_bg'],
+                    'rowheight': 25
+                },
+                'map': {
+                    'background': [("selected", theme['highlight'])],
+                    'foreground': [("selected", "white")]
+                }
+            },
+            'Treeview.Heading': {
+                'configure': {'background': theme['tab_bg'], 'foreground': theme['fg']}
+            }
+        }
+    
+    def _build_tk_config_map(self, name):
+        """生成指定主题下tk原生控件的配置项"""
+        theme = self.themes[name]
+        
+        # 预先生成tk原生控件的配置项，应用主题时每个控件只需一次字典查找
+        self._tk_config_maps[name] = {
+            'Tk': {'bg': theme['bg']},
+            'Toplevel': {'bg': theme['bg']},
+            'Frame': {'bg': theme['bg']},
+            'Text': {'bg': theme['entry_bg'], 'fg': theme['entry_fg']},
+            'ScrolledText': {'bg': theme['entry_bg'], 'fg': theme['entry_fg']},
+            'Button': {'bg': theme['button_bg'], 'fg': theme['button_fg']},
+            'Label': {'bg': theme['bg'], 'fg': theme['fg']},
+            'Entry': {'bg': theme['entry_bg'], 'fg': theme['entry_fg']},
+            'Listbox': {'bg': theme['bg'], 'fg': theme['fg']},
+            'Scrollbar': {'bg': theme['scrollbar_bg'], 'troughcolor': theme['scrollbar_bg']},
+            'Scale': {'bg': theme['scrollbar_bg'], 'troughcolor': theme['scrollbar_bg']}
+        }
     
     def get_theme(self):
         """获取当前主题配置"""
         return self.themes[self.current_theme]
     
-    def toggle_theme(self):
-        """切换主题并更新样式，使用批量更新优化性能"""
-        self.current_theme = 'dark' if self.current_theme == 'light' else 'light'
-        
-        # 清除缓存，强制重新应用主题
-        self._widget_cache.clear()
-        self._style_cache.clear()
-        
-        if self.style:
-            self._configure_ttk_styles()
+    def set_theme(self, name):
+        """切换到指定主题：切换ttk主题后所有ttk控件自动更新，tk原生控件需重新应用主题"""
+        self.current_theme = name
+        if self.style is not None:
+            self.style.theme_use(self._ttk_theme_name(name))
+        
+        # 递增主题代数使所有控件的记录失效，强制重新应用主题
+        self._theme_gen += 1
         return self.get_theme()
     
+    def toggle_theme(self):
+        """在浅色和深色主题之间切换"""
+        return self.set_theme('dark' if self.current_theme == 'light' else 'light')
+    
     def apply_theme_to_widget(self, widget, recursive=True):
         """将主题应用到指定控件及其子控件，使用缓存优化性能"""
-        # 检查控件缓存
-        widget_id = str(widget)
-        if widget_id in self._widget_cache and self._widget_cache[widget_id] == self.current_theme:
+        # 检查控件上记录的主题代数，已应用当前主题的控件直接跳过
+        if getattr(widget, '_theme_gen', -1) == self._theme_gen:
             return
         
-        theme = self.get_theme()
-        
-        # 应用主题到当前控件
+        # 应用主题到当前控件：ttk控件的样式随ttk主题切换自动更新，只有tk原生控件需要直接设置属性
         try:
-            # 区分处理ttk控件和tk原生控件
-            if isinstance(widget, ttk.Widget):
-                # ttk控件通过样式设置，不要直接设置fg/bg属性
-                widget_class = widget.winfo_class()
-                style_map = {
-                    'TButton': "TButton",
-                    'TEntry': "TEntry", 
-                    'TLabel': "TLabel",
-                    'TCombobox': "TCombobox",
-                    'TFrame': "TFrame",
-                    'TNotebook': "TNotebook",
-                    'Treeview': "Treeview",
-                    'Vertical.TScrollbar': "Vertical.TScrollbar",
-                    'Horizontal.TScrollbar': "Horizontal.TScrollbar",
-                    'TCheckbutton': "TCheckbutton",
-                    'TRadiobutton': "TRadiobutton"
-                }
-                
-                if widget_class in style_map:
-                    widget.configure(style=style_map[widget_class])
-            else:
-                # tk原生控件可以直接设置属性
-                widget_name = widget.winfo_class()
-                config_map = {
-                    'Tk': {'bg': theme['bg']},
-                    'Toplevel': {'bg': theme['bg']},
-                    'Frame': {'bg': theme['bg']},
-                    'Text': {'bg': theme['entry_bg'], 'fg': theme['entry_fg']},
-                    'ScrolledText': {'bg': theme['entry_bg'], 'fg': theme['entry_fg']},
-                    'Button': {'bg': theme['button_bg'], 'fg': theme['button_fg']},
-                    'Label': {'bg': theme['bg'], 'fg': theme['fg']},
-                    'Entry': {'bg': theme['entry_bg'], 'fg': theme['entry_fg']},
-                    'Listbox': {'bg': theme['bg'], 'fg': theme['fg']},
-                    'Scrollbar': {'bg': theme['scrollbar_bg'], 'troughcolor': theme['scrollbar_bg']},
-                    'Scale': {'bg': theme['scrollbar_bg'], 'troughcolor': theme['scrollbar_bg']}
-                }
-                
-                if widget_name in config_map and hasattr(widget, 'config'):
-                    for key, value in config_map[widget_name].items():
-                        if key in widget.config():
-                            widget.config(**{key: value})
+            if not isinstance(widget, ttk.Widget):
+                widget_class = _WIDGET_CLASS_NAMES.get(type(widget))
+                if widget_class is None:
+                    # 未知类型的控件仍通过Tcl查询类名
+                    widget_class = widget.winfo_class()
+                widget_config = self._tk_config_maps[self.current_theme].get(widget_class)
+                if widget_config is not None:
+                    # 一次configure调用设置全部选项，不再逐项读取完整的选项表检查是否支持
+                    try:
+                        widget.configure(**widget_config)
+                    except tk.TclError:
+                        pass
         except Exception as e:
             # 记录异常但继续执行，避免一个控件的错误影响整体主题应用
             self.logger.error(f"应用主题到控件 {widget.winfo_class()} 时出错: {str(e)}")
         
-        # 缓存已处理的控件
-        self._widget_cache[widget_id] = self.current_theme
+        # 记录控件已应用的主题代数
+        widget._theme_gen = self._theme_gen
         
         # 递归应用到所有子控件
         if recursive:
@@ -367,6 +586,7 @@ class ThemeManager:
 class FHZDDataQueryTool:
     def __init__(self, root):
         self.root = root
+        ErrorHandler.bind_root(root)
         self.root.title("烽火地带数据查询工具 v3.0")
         self.root.geometry("1050x850")
         self.root.minsize(1000, 800)
@@ -383,9 +603,6 @@ class FHZDDataQueryTool:
         self.theme_manager.initialize_style()  # 初始化样式
         self.current_theme = self.theme_manager.get_theme()
         
-        # 保存所有创建的框架引用，用于主题切换
-        self.all_frames = []
-        
         # 设置字体以支持中文
         self.font_config = {
             'normal': ('Microsoft YaHei UI', 10),
@@ -406,7 +623,44 @@ class FHZDDataQueryTool:
         self.current_query_args = ()
         self.current_tab_index = 0
         self.current_query_result = None
+        # 显示方法已解析出的当前查询结果，格式化文本时直接复用，不再重复解析JSON
+        self._parsed_result = None
+        # 文本视图中格式化后的查询结果及其对应的原始结果，原始结果不变时直接复用
+        self._formatted_source = None
+        self._formatted_text = None
         self.current_view_mode = "text"  # 默认视图模式
+        # 最近一次的状态消息（刷新后保留，用于跳过重复消息）及是否已安排刷新状态栏
+        self._pending_status = ""
+        self._status_scheduled = False
+        # 最近10条状态历史，超出时自动丢弃最早的记录
+        self.query_history = deque(maxlen=10)
+        # 待显示的进度值，为None时表示没有待刷新的进度
+        self._pending_progress = None
+        # 最近一次待处理的鼠标移动（控件, y坐标），30毫秒内的多次移动只处理最后一次；为None时表示没有安排处理
+        self._pending_hover = None
+        # 当前高亮的（控件路径, 行），鼠标仍在同一行时跳过高亮更新
+        self._last_hover = (None, None)
+        # 指针是否位于表格内，不在表格内时忽略鼠标移动事件
+        self._hover_tracking = False
+        # 由setup_ui创建的控件和变量，创建前为None，使用时直接判断是否为None
+        self.progress_bar = None
+        self.progress_var = None
+        self.view_mode_var = None
+        self.result_tree = None
+        # 配置对话框及按当前配置刷新其选项的函数，首次打开时创建
+        self._config_window = None
+        self._sync_config_dialog = None
+        self.notebook = None
+        self.result_text = None
+        self.table_frame = None
+        self.tree = None
+        self._state_toggle_widgets = ()
+        # 表格的全部数据行及已插入表格的行数，其余行在滚动时分批插入
+        self._table_rows = []
+        self._table_row_index = 0
+        # 表格和文本框自上次清除后是否写入过内容，未写入时清除操作跳过对应的Tcl调用
+        self._tree_dirty = False
+        self._text_dirty = False
 
         self.operator_map = {
             "10007": "红狼",
@@ -425,15 +679,21 @@ class FHZDDataQueryTool:
         }
 
         self.item_mapping = {}
+        # 物品名称查询缓存：{原始物品ID: 名称}
+        self._name_cache = {}
+        # 最近一次通过校验的认证信息(openid, token, acctype)，相同输入不重复校验
+        self._validated_auth = None
         
         # 用于存储配置
         self.config = {
             'timeout': 30.0,              # API请求超时时间（秒）
             'retry_count': 3,              # API请求重试次数
+            'parallel_fetches': 8,         # 批量导出时的并发请求数
             'cache_expiry': 300,           # 缓存过期时间（秒）
             'auto_refresh': False,         # 是否启用自动刷新
             'refresh_interval': 60,        # 自动刷新间隔（秒）
             'show_detailed_logs': False,   # 是否显示详细日志
+            'confirm_exit': True,          # 关闭窗口时是否弹出确认对话框
             'export_format': 'txt',        # 默认导出格式
             'openid': self.default_openid, # 用户OpenID
             'token': self.default_token,   # 用户Token
@@ -444,19 +704,67 @@ class FHZDDataQueryTool:
         self._setup_logging()
         
         # 现在可以安全地加载物品映射，因为logger已初始化
-        self.load_item_mapping('return.txt')
-        
-        # 用于缓存查询结果
-        self.result_cache = {}
-        self.cache_timestamps = {}
+        # 在后台线程中读取和解析，与界面构建同时进行；查询物品名称前等待加载完成
+        self._mapping_ready = threading.Event()
+        self.set_status("正在加载物品映射...")
+        threading.Thread(target=self._bg_load_mapping, args=('return.txt',), daemon=True).start()
+        self.root.after(_MAPPING_POLL_MS, self._poll_mapping_ready)
+        
+        # 共享的HTTP会话：连接池保持长连接，后续请求复用已建立的TCP/TLS连接
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.http.mount('https://', adapter)
+        self.http.mount('http://', adapter)
+        
+        # 执行API请求的后台线程池，请求结果通过root.after交回主线程处理，请求期间界面保持响应
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        # 写入配置文件的单线程执行器，所有配置写入按提交顺序依次执行
+        self._config_executor = ThreadPoolExecutor(max_workers=1)
+        
+        # 用于缓存查询结果：{缓存键: (过期时刻(time.monotonic), 结果)}，按最近使用顺序排列，
+        # 超过上限时淘汰最久未使用的条目；后台请求线程共用，读写时持有锁
+        self.result_cache = OrderedDict()
+        self._cache_max = 128
+        self._cache_lock = threading.Lock()
+        # 正在进行中的API请求：{缓存键: Future}，只在主线程中读写
+        self._inflight = {}
+        # 正在进行的批量导出任务，同一时间只允许一个导出
+        self._export_future = None
         
         # 自动刷新相关变量
         self.auto_refresh_timer = None
+        # 下一次自动刷新的预定时刻（time.monotonic），按预定时刻而不是上次回调时刻计算间隔，避免周期漂移
+        self._next_refresh_at = 0.0
+        # 由setup_auto_refresh按配置设置，定时回调直接读取，不再每次查询配置字典
+        self._auto_refresh_enabled = False
+        self._refresh_interval = 60
+        # 连续刷新失败的次数，失败时按指数退避延长下一次刷新的间隔
+        self._auto_refresh_failures = 0
+        # 当前使用的刷新间隔：自动刷新得到的数据与上次相同时加倍，数据变化时恢复为配置的间隔
+        self._current_refresh_interval = 60
+        # 上一次自动刷新结果的哈希值，及是否正在等待自动刷新发出的查询返回
+        self._last_refresh_digest = None
+        self._awaiting_refresh_result = False
         self.setup_auto_refresh()
         
         # 设置UI界面，这会初始化所有UI变量
         self.setup_ui()
         
+        # 各查询的配置读取UI变量，在界面创建后生成一次
+        self._query_configs = self._build_query_configs()
+        
+        # 标签页索引到刷新查询函数的映射，顺序与setup_ui中添加标签页的顺序一致；认证设置页无需查询
+        self._tab_handlers = (
+            None,                           # 认证设置
+            self.query_daily_report,        # 昨日日报
+            self.query_weekly_report,       # 战场周报
+            self.query_friend_report,       # 周报队友
+            self.query_fire_weekly_report,  # 烽火周报
+            self.query_currency,            # 货币查询
+            self.query_secret,              # 每日密码
+            self.query_special_duty,        # 特勤处状态
+        )
+        
         # 加载配置，此时UI变量已存在
         self.load_config()
 
@@ -465,11 +773,13 @@ class FHZDDataQueryTool:
             "昨日日报-烽火地带": {
                 "fetch_func": self._get_daily_report_data,
                 "fetch_args": ["sol"],
+                "extra_args": ["s_area"],
                 "process_func": lambda data: self._process_daily_data(data, "sol")
             },
             "昨日日报-全面战场": {
                 "fetch_func": self._get_daily_report_data,
                 "fetch_args": ["mp"],
+                "extra_args": ["s_area"],
                 "process_func": lambda data: self._process_daily_data(data, "mp")
             },
             "战场周报-烽火地带": {
@@ -520,6 +830,7 @@ class FHZDDataQueryTool:
             "每日密码": {
                 "fetch_func": self._get_secret_data,
                 "fetch_args": [],
+                "extra_args": ["secret_source"],
                 "process_func": self._process_secret_data
             },
             "特勤处状态": {
@@ -528,35 +839,31 @@ class FHZDDataQueryTool:
                 "process_func": self._process_special_duty_data
             }
         }
+        # 各模块的请求参数在注册时预先组合，导出时只需按名称取出额外参数追加到固定参数之后
+        for module_def in self.module_definitions.values():
+            module_def["_arg_builder"] = self._make_arg_builder(module_def)
+        # 各模块导出复选框的变量只创建一次，每次打开选择对话框时复用，并保留上次的选择
+        self.module_vars = {name: tk.BooleanVar(value=True) for name in self.module_definitions}
     
     def load_config(self):
         """加载配置文件，增强错误恢复和备份机制"""
-        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.ini')
+        config_path = _CONFIG_PATH
         backup_path = config_path + '.backup'
+        legacy_path = _LEGACY_CONFIG_PATH
+        
+        # 新配置文件不存在时读取旧版INI配置，下次保存时迁移为JSON格式
+        source_path = config_path if os.path.exists(config_path) else legacy_path
         
         # 尝试加载主配置文件
-        if os.path.exists(config_path):
+        if os.path.exists(source_path):
             try:
-                config = configparser.ConfigParser()
-                config.read(config_path, encoding='utf-8')
-                if 'Settings' in config:
-                    self.config = {
-                        'timeout': config.getfloat('Settings', 'timeout', fallback=30.0),
-                        'retry_count': config.getint('Settings', 'retry_count', fallback=3),
-                        'theme': config.get('Settings', 'theme', fallback='light'),
-                        'cache_expiry': config.getint('Settings', 'cache_expiry', fallback=300),
-                        'auto_refresh': config.getboolean('Settings', 'auto_refresh', fallback=False),
-                        'refresh_interval': config.getint('Settings', 'refresh_interval', fallback=60),
-                        # 添加认证信息的加载
-                        'openid': config.get('Settings', 'openid', fallback=self.default_openid),
-                        'token': config.get('Settings', 'token', fallback=self.default_token),
-                        'acctype': config.get('Settings', 'acctype', fallback='qc'),
-                        'export_format': config.get('Settings', 'export_format', fallback='txt'),
-                        'show_detailed_logs': config.getboolean('Settings', 'show_detailed_logs', fallback=False)
-                    }
+                settings = self._read_config_file(source_path)
+                if settings is not None:
+                    self.config = self._default_config()
+                    self.config.update(settings)
                     # 应用主题设置
-                    self.theme_manager.current_theme = self.config.get('theme', 'light')
-                    self.current_theme = self.theme_manager.get_theme()
+                    self.current_theme = self.theme_manager.set_theme(self.config.get('theme', 'light'))
+                    self.theme_manager.apply_theme_to_widget(self.root)
                     
                     # 更新UI中的认证信息
                     self.openid_var.set(self.config['openid'])
@@ -564,7 +871,8 @@ class FHZDDataQueryTool:
                     self.acctype_var.set(self.config['acctype'])
                     
                     # 成功加载后创建备份
-                    self._create_config_backup()
+                    if source_path == config_path:
+                        self._create_config_backup()
                     return
             except Exception as e:
                 self.logger.error(f"主配置文件加载失败: {str(e)}")
@@ -573,11 +881,10 @@ class FHZDDataQueryTool:
                 if os.path.exists(backup_path):
                     try:
                         self.logger.info("尝试从备份文件恢复配置")
-                        config = configparser.ConfigParser()
-                        config.read(backup_path, encoding='utf-8')
-                        # 使用备份文件内容恢复
-                        with open(config_path, 'w', encoding='utf-8') as f:
-                            config.write(f)
+                        # 先确认备份文件可以正常解析，再用它覆盖主配置文件
+                        if self._read_config_file(backup_path) is None:
+                            raise ValueError("备份文件缺少配置内容")
+                        shutil.copy2(backup_path, config_path)
                         # 重新加载
                         self.load_config()
                         return
@@ -586,25 +893,13 @@ class FHZDDataQueryTool:
         
         # 如果主配置不存在或加载失败，使用默认配置
         self.logger.info("使用默认配置")
-        self.config = {
-            'timeout': 30.0,
-            'retry_count': 3,
-            'theme': 'light',
-            'cache_expiry': 300,
-            'auto_refresh': False,
-            'refresh_interval': 60,
-            'openid': self.default_openid,
-            'token': self.default_token,
-            'acctype': 'qc',
-            'export_format': 'txt',
-            'show_detailed_logs': False
-        }
+        self.config = self._default_config()
         
         # 也检查是否存在旧的认证配置文件，如果存在则迁移数据
-        old_auth_config = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'auth_config.ini')
+        old_auth_config = os.path.join(_APP_DIR, 'auth_config.ini')
         if os.path.exists(old_auth_config):
             try:
-                config = configparser.ConfigParser()
+                config = configparser.ConfigParser(interpolation=None)
                 config.read(old_auth_config, encoding='utf-8')
                 if 'Auth' in config:
                     # 如果主配置中没有认证信息，则从旧配置迁移
@@ -623,63 +918,142 @@ class FHZDDataQueryTool:
             except Exception as e:
                 self.logger.warning(f"迁移旧认证配置失败: {str(e)}")
     
+    def _default_config(self):
+        """返回默认配置"""
+        return {
+            'timeout': 30.0,
+            'retry_count': 3,
+            'parallel_fetches': 8,
+            'theme': 'light',
+            'cache_expiry': 300,
+            'auto_refresh': False,
+            'refresh_interval': 60,
+            'openid': self.default_openid,
+            'token': self.default_token,
+            'acctype': 'qc',
+            'export_format': 'txt',
+            'show_detailed_logs': False,
+            'confirm_exit': True
+        }
+    
+    def _read_config_file(self, path):
+        """读取配置文件并返回设置字典，兼容旧版INI格式；文件中没有配置内容时返回None"""
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # 旧版INI格式以节名开头
+        if content.lstrip().startswith('['):
+            config = configparser.ConfigParser(interpolation=None)
+            config.read_string(content)
+            if 'Settings' not in config:
+                return None
+            return {
+                'timeout': config.getfloat('Settings', 'timeout', fallback=30.0),
+                'retry_count': config.getint('Settings', 'retry_count', fallback=3),
+                'parallel_fetches': config.getint('Settings', 'parallel_fetches', fallback=8),
+                'theme': config.get('Settings', 'theme', fallback='light'),
+                'cache_expiry': config.getint('Settings', 'cache_expiry', fallback=300),
+                'auto_refresh': config.getboolean('Settings', 'auto_refresh', fallback=False),
+                'refresh_interval': config.getint('Settings', 'refresh_interval', fallback=60),
+                'openid': config.get('Settings', 'openid', fallback=self.default_openid),
+                'token': config.get('Settings', 'token', fallback=self.default_token),
+                'acctype': config.get('Settings', 'acctype', fallback='qc'),
+                'export_format': config.get('Settings', 'export_format', fallback='txt'),
+                'show_detailed_logs': config.getboolean('Settings', 'show_detailed_logs', fallback=False),
+                'confirm_exit': config.getboolean('Settings', 'confirm_exit', fallback=True)
+            }
+        
+        settings = json.loads(content)
+        if not isinstance(settings, dict):
+            raise ValueError("配置文件格式错误")
+        return settings
+    
     def _create_config_backup(self):
         """创建配置文件备份"""
-        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.ini')
+        config_path = _CONFIG_PATH
         backup_path = config_path + '.backup'
         try:
-            import shutil
             shutil.copy2(config_path, backup_path)
             self.logger.debug("配置文件备份已创建")
         except Exception as e:
-            self.logger.warning(f"创建配置文件备份失败: {str(e)}")
+            self.logger.warning("创建配置文件备份失败: %s", e)
+    
+    def save_config(self, on_success=None):
+        """在后台线程写入配置文件，界面不等待磁盘写入，保存成功后在主线程中调用on_success
+        
+        写入线程不接触Tk：由主线程通过root.after轮询写入是否完成，避免主线程与写入线程互相等待
+        """
+        future = self._config_executor.submit(self._write_config, self._config_snapshot())
+        self.root.after(_CONFIG_SAVE_POLL_MS, self._poll_config_save, future, on_success)
+    
+    def _poll_config_save(self, future, on_success):
+        """在主线程中检查配置写入是否完成，未完成时稍后再检查"""
+        if future.done():
+            self._on_config_saved(future, on_success)
+        else:
+            self.root.after(_CONFIG_SAVE_POLL_MS, self._poll_config_save, future, on_success)
     
-    def save_config(self):
-        """保存配置到文件，增强错误处理和备份机制"""
-        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.ini')
+    def _config_snapshot(self):
+        """在主线程中收集需要保存的配置项"""
+        return {
+            'timeout': self.config.get('timeout', 30.0),
+            'retry_count': self.config.get('retry_count', 3),
+            'parallel_fetches': self.config.get('parallel_fetches', 8),
+            'theme': self.theme_manager.current_theme,
+            'cache_expiry': self.config.get('cache_expiry', 300),
+            'auto_refresh': self.config.get('auto_refresh', False),
+            'refresh_interval': self.config.get('refresh_interval', 60),
+            'openid': self.config.get('openid', self.default_openid),
+            'token': self.config.get('token', self.default_token),
+            'acctype': self.config.get('acctype', 'qc'),
+            'export_format': self.config.get('export_format', 'txt'),
+            'show_detailed_logs': self.config.get('show_detailed_logs', False),
+            'confirm_exit': self.config.get('confirm_exit', True)
+        }
+    
+    def _on_config_saved(self, future, on_success=None):
+        """在主线程中处理已完成的配置写入结果，失败时提示错误"""
+        error_msg, restored = future.result()
+        if error_msg is not None:
+            messagebox.showerror("配置保存错误", error_msg)
+            if restored:
+                messagebox.showinfo("配置恢复", "配置保存失败，已从备份文件恢复")
+            return
+        if on_success is not None:
+            on_success()
+    
+    def _write_config(self, settings):
+        """在配置写入线程中将配置写入文件，返回(错误信息, 是否已从备份恢复)，成功时错误信息为None
+        
+        所有写入都经过同一个单线程执行器，避免并发写入同一个临时文件
+        """
+        config_path = _CONFIG_PATH
         temp_path = config_path + '.tmp'
         backup_path = config_path + '.backup'
         
         try:
-            # 首先创建临时文件
-            config = configparser.ConfigParser()
-            config['Settings'] = {
-                'timeout': str(self.config.get('timeout', 30.0)),
-                'retry_count': str(self.config.get('retry_count', 3)),
-                'theme': self.theme_manager.current_theme,
-                'cache_expiry': str(self.config.get('cache_expiry', 300)),
-                'auto_refresh': str(self.config.get('auto_refresh', False)),
-                'refresh_interval': str(self.config.get('refresh_interval', 60)),
-                'openid': self.config.get('openid', self.default_openid),
-                'token': self.config.get('token', self.default_token),
-                'acctype': self.config.get('acctype', 'qc'),
-                'export_format': self.config.get('export_format', 'txt'),
-                'show_detailed_logs': str(self.config.get('show_detailed_logs', False))
-            }
-            
             # 写入临时文件
+            content = json.dumps(settings, ensure_ascii=False, indent=2)
             with open(temp_path, 'w', encoding='utf-8') as f:
-                config.write(f)
+                f.write(content)
             
             # 验证临时文件
-            test_config = configparser.ConfigParser()
-            test_config.read(temp_path, encoding='utf-8')
-            if 'Settings' not in test_config:
-                raise ValueError("配置文件验证失败")
+            with open(temp_path, 'r', encoding='utf-8') as f:
+                if json.loads(f.read()) != settings:
+                    raise ValueError("配置文件验证失败")
             
             # 备份原文件
             if os.path.exists(config_path):
                 try:
-                    import shutil
                     shutil.copy2(config_path, backup_path)
                 except Exception as backup_error:
                     self.logger.warning(f"创建配置备份失败: {str(backup_error)}")
             
             # 原子替换
-            import shutil
-            shutil.move(temp_path, config_path)
+            os.replace(temp_path, config_path)
             
             self.logger.info("配置文件保存成功")
+            return None, False
             
         except Exception as e:
             # 清理临时文件
@@ -691,42 +1065,104 @@ class FHZDDataQueryTool:
             
             error_msg = f"无法保存配置文件: {str(e)}\n配置文件路径: {config_path}"
             self.logger.error(error_msg)
-            messagebox.showerror("配置保存错误", error_msg)
             
             # 尝试从备份恢复
+            restored = False
             if os.path.exists(backup_path):
                 try:
                     self.logger.info("尝试从备份恢复配置")
                     shutil.copy2(backup_path, config_path)
-                    messagebox.showinfo("配置恢复", "配置保存失败，已从备份文件恢复")
+                    restored = True
                 except Exception as restore_error:
                     self.logger.error(f"从备份恢复也失败: {str(restore_error)}")
+            return error_msg, restored
 
     def load_item_mapping(self, filename):
-        """加载物品ID到名称的映射"""
+        """加载物品ID到名称的映射，解析结果缓存为程序目录下的同名.cache.json文件，源文件未变化时直接加载缓存
+        
+        缓存只保存签名和映射这样的纯数据，不使用pickle，读取被替换的缓存文件不会执行任意代码
+        """
         try:
             if os.path.exists(filename):
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                for item in data['data']['keywords']:
-                    object_id = str(item['objectID'])
-                    object_name = item['objectName']
-                    self.item_mapping[object_id] = object_name
+                stat = os.stat(filename)
+                signature = (stat.st_mtime_ns, stat.st_size)
+                # 缓存与配置、日志一样放在程序目录下，不随启动时的工作目录散落
+                cache_path = os.path.join(_APP_DIR, os.path.splitext(os.path.basename(filename))[0] + '.cache.json')
+
+                
+                mapping = None
+                try:
+                    with open(cache_path, 'rb') as f:
+                        cached = _json_loads(f.read())
+                    # JSON中签名保存为列表
+                    if cached.get('signature') == list(signature):
+                        # 解析得到的字符串不是驻留的，重新驻留键
+                        mapping = {sys.intern(object_id): name for object_id, name in cached['mapping'].items()}
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    self.logger.debug(f'物品映射缓存不可用: {e}')
+                
+                if mapping is None:
+                    # 整体读取后一次解析，再用字典推导式构建映射
+                    with open(filename, 'rb') as f:
+                        data = json.loads(f.read())
+                    # 驻留物品ID字符串：查询时键与驻留的ID是同一对象，比较直接按身份短路
+                    mapping = {sys.intern(str(item['objectID'])): item['objectName'] for item in data['data']['keywords']}
+                    try:
+                        with open(cache_path, 'w', encoding='utf-8') as f:
+                            json.dump({'signature': signature, 'mapping': mapping}, f, ensure_ascii=False, separators=(',', ':'))
+                    except OSError as e:
+                        self.logger.debug(f'写入物品映射缓存失败: {e}')
+                
+                self.item_mapping = mapping
+                self._name_cache.clear()
                 self.logger.info(f'成功加载 {len(self.item_mapping)} 个物品映射')
             else:
                 self.logger.warning(f'文件 {filename} 不存在')
         except Exception as e:
             self.logger.error(f'加载物品映射失败: {e}')
 
+    def _bg_load_mapping(self, filename):
+        """后台线程中加载物品映射，完成后通知等待的查询；加载线程不接触Tk，状态栏由主线程轮询后更新"""
+        try:
+            self.load_item_mapping(filename)
+        finally:
+            self._mapping_ready.set()
+    
+    def _poll_mapping_ready(self):
+        """在主线程中检查物品映射是否加载完成，完成后更新状态栏"""
+        if self._mapping_ready.is_set():
+            self.set_status("就绪")
+        else:
+            self.root.after(_MAPPING_POLL_MS, self._poll_mapping_ready)
+
     def get_item_name(self, item_id):
-        """根据物品ID获取物品名称"""
+        """根据物品ID获取物品名称，结果按原始ID缓存，重复查询只需一次字典查找"""
+        if not self._mapping_ready.is_set():
+            self._mapping_ready.wait()
+        
+        try:
+            return self._name_cache[item_id]
+        except KeyError:
+            pass
+        except TypeError:
+            # 不可哈希的ID无法缓存
+            return str(item_id)
+        
         if isinstance(item_id, (int, str)):
-            str_id = str(item_id)
-            return self.item_mapping.get(str_id, str_id)
-        return str(item_id)
+            str_id = sys.intern(str(item_id))
+            name = self.item_mapping.get(str_id, str_id)
+        else:
+            name = str(item_id)
+        self._name_cache[item_id] = name
+        return name
 
     def setup_ui(self):
         """设置用户界面，采用现代化设计风格"""
+        # 常用字体配置绑定到局部变量，构建控件时不再重复查找
+        f_small = self.font_config['small']
+        
         # 设置窗口属性
         self.root.title("烽火地带数据查询工具")
         self.root.minsize(900, 700)  # 设置最小窗口大小
@@ -784,212 +1220,45 @@ class FHZDDataQueryTool:
         friend_frame.columnconfigure(1, weight=1)
         friend_frame.columnconfigure(3, weight=1)
 
-        # ===== 认证设置页面 =====
-        # 输入框容器，实现更好的对齐和布局
-        auth_input_frame = ttk.Frame(auth_frame)
-        auth_input_frame.pack(fill=tk.X, pady=(0, 20))
-        
-        # OpenID输入
-        ttk.Label(auth_input_frame, text="OpenID:", font=self.font_config['label']).grid(row=0, column=0, sticky=tk.W, pady=(10, 8))
-        self.openid_var = tk.StringVar(value=self.default_openid)
-        openid_entry = ttk.Entry(auth_input_frame, textvariable=self.openid_var, font=self.font_config['entry'])
-        openid_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(10, 8), padx=(15, 10))
-        ttk.Label(auth_input_frame, text="游戏账号的唯一标识符", font=self.font_config['small']).grid(row=0, column=2, sticky=tk.W, pady=(10, 8))
-
-        # Token输入
-        ttk.Label(auth_input_frame, text="Token:", font=self.font_config['label']).grid(row=1, column=0, sticky=tk.W, pady=8)
-        self.token_var = tk.StringVar(value=self.default_token)
-        token_entry = ttk.Entry(auth_input_frame, textvariable=self.token_var, font=self.font_config['entry'])
-        token_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), pady=8, padx=(15, 10))
-        ttk.Label(auth_input_frame, text="访问令牌", font=self.font_config['small']).grid(row=1, column=2, sticky=tk.W, pady=8)
-
-        # 账号类型选择
-        ttk.Label(auth_input_frame, text="账号类型:", font=self.font_config['label']).grid(row=2, column=0, sticky=tk.W, pady=8)
-        self.acctype_var = tk.StringVar(value="qc")
-        acctype_combo = ttk.Combobox(auth_input_frame, textvariable=self.acctype_var, width=15, state="readonly",
-                                     font=self.font_config['entry'])
-        acctype_combo['values'] = ('qc', 'wx')
-        acctype_combo.grid(row=2, column=1, sticky=tk.W, pady=8, padx=(15, 10))
-        ttk.Label(auth_input_frame, text="qc:QQ账号 wx:微信账号", font=self.font_config['small']).grid(row=2, column=2, sticky=tk.W, pady=8)
-        
-        # 保存按钮
-        save_auth_btn = ttk.Button(auth_frame, text="保存认证信息", command=self.save_auth_info, width=25)
-        save_auth_btn.pack(pady=10)
-        save_auth_btn.configure(cursor="hand2")  # 鼠标悬停显示手形指针
-
-        # ===== 昨日日报页面 =====
-        daily_input_frame = ttk.Frame(daily_frame)
-        daily_input_frame.pack(fill=tk.X, pady=(0, 20))
+        # 各标签页的输入变量在启动时创建：标签页控件延迟到首次显示时才构建，
+        # 但查询、导出和加载配置随时都会读取这些变量
+        now = datetime.now()
+        last_sunday = now - timedelta(days=(now.weekday() + 1) % 7)
+        default_date = last_sunday.strftime("%Y%m%d")
         
-        ttk.Label(daily_input_frame, text="资源类型:", font=self.font_config['label']).grid(row=0, column=0, sticky=tk.W, pady=(10, 8))
         self.daily_resource_var = tk.StringVar(value="sol")
-        daily_resource_combo = ttk.Combobox(daily_input_frame, textvariable=self.daily_resource_var, width=20,
-                                            state="readonly", font=self.font_config['entry'])
-        daily_resource_combo['values'] = ('sol', 'mp')
-        daily_resource_combo.grid(row=0, column=1, sticky=tk.W, pady=(10, 8), padx=(15, 10))
-        ttk.Label(daily_input_frame, text="sol:烽火地带 mp:全面战场", font=self.font_config['small']).grid(row=0, column=2, sticky=tk.W, pady=(10, 8))
-
-        ttk.Label(daily_input_frame, text="战区:", font=self.font_config['label']).grid(row=1, column=0, sticky=tk.W, pady=8)
         self.daily_area_var = tk.StringVar(value="36")
-        daily_area_entry = ttk.Entry(daily_input_frame, textvariable=self.daily_area_var, width=15, font=self.font_config['entry'])
-        daily_area_entry.grid(row=1, column=1, sticky=tk.W, pady=8, padx=(15, 10))
-        ttk.Label(daily_input_frame, text="默认:36(华东)", font=self.font_config['small']).grid(row=1, column=2, sticky=tk.W, pady=8)
-
-        # 查询按钮区域
-        daily_query_btn = ttk.Button(daily_frame, text="查询昨日日报", command=self.query_daily_report, width=20)
-        daily_query_btn.pack(pady=10, anchor=tk.W)
-        daily_query_btn.configure(cursor="hand2")
-
-        # ===== 战场周报页面 =====
-        last_sunday = datetime.now() - timedelta(days=(datetime.now().weekday() + 1) % 7)
-        default_date = last_sunday.strftime("%Y%m%d")
-        
-        weekly_input_frame = ttk.Frame(weekly_frame, padding=(10, 10, 10, 15))
-        weekly_input_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        # 统一标签宽度，保持对齐
-        label_width = 8
-        
-        ttk.Label(weekly_input_frame, text="统计日期:", width=label_width, font=self.font_config['label']).grid(row=0, column=0, sticky=tk.W, pady=(5, 8))
         self.weekly_date_var = tk.StringVar(value=default_date)
-        weekly_date_entry = ttk.Entry(weekly_input_frame, textvariable=self.weekly_date_var, width=20, font=self.font_config['entry'])
-        weekly_date_entry.grid(row=0, column=1, sticky=tk.W, pady=(5, 8), padx=(10, 15))
-        ttk.Label(weekly_input_frame, text="格式: YYYYMMDD", font=self.font_config['small']).grid(row=0, column=2, sticky=tk.W, pady=(5, 8))
-
-        ttk.Label(weekly_input_frame, text="战区:", width=label_width, font=self.font_config['label']).grid(row=1, column=0, sticky=tk.W, pady=8)
         self.weekly_area_var = tk.StringVar(value="36")
-        weekly_area_entry = ttk.Entry(weekly_input_frame, textvariable=self.weekly_area_var, width=15, font=self.font_config['entry'])
-        weekly_area_entry.grid(row=1, column=1, sticky=tk.W, pady=8, padx=(10, 15))
-
-        ttk.Label(weekly_input_frame, text="模式:", width=label_width, font=self.font_config['label']).grid(row=2, column=0, sticky=tk.W, pady=8)
         self.weekly_mode_var = tk.StringVar(value="sol")
-        weekly_mode_combo = ttk.Combobox(weekly_input_frame, textvariable=self.weekly_mode_var, width=20, state="readonly",
-                                         font=self.font_config['entry'])
-        weekly_mode_combo['values'] = ('sol', 'mp')
-        weekly_mode_combo.grid(row=2, column=1, sticky=tk.W, pady=8, padx=(10, 15))
-        ttk.Label(weekly_input_frame, text="sol:烽火地带 mp:全面战场", font=self.font_config['small']).grid(row=2, column=2, sticky=tk.W, pady=8)
-
-        # 查询按钮
-        btn_frame = ttk.Frame(weekly_frame)
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        weekly_query_btn = ttk.Button(btn_frame, text="查询战场周报", command=self.query_weekly_report, width=18)
-        weekly_query_btn.pack(anchor=tk.W)
-        weekly_query_btn.configure(cursor="hand2")
-
-        # ===== 队友周报页面 =====
-        friend_input_frame = ttk.Frame(friend_frame, padding=(10, 10, 10, 15))
-        friend_input_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        ttk.Label(friend_input_frame, text="统计日期:", width=label_width, font=self.font_config['label']).grid(row=0, column=0, sticky=tk.W, pady=(5, 8))
         self.friend_date_var = tk.StringVar(value=default_date)
-        friend_date_entry = ttk.Entry(friend_input_frame, textvariable=self.friend_date_var, width=20, font=self.font_config['entry'])
-        friend_date_entry.grid(row=0, column=1, sticky=tk.W, pady=(5, 8), padx=(10, 15))
-        ttk.Label(friend_input_frame, text="格式: YYYYMMDD", font=self.font_config['small']).grid(row=0, column=2, sticky=tk.W, pady=(5, 8))
-
-        # 第二行使用网格布局，确保对齐
-        row2_frame = ttk.Frame(friend_input_frame)
-        row2_frame.grid(row=1, column=0, columnspan=4, sticky=tk.W, pady=8)
-        
-        ttk.Label(row2_frame, text="战区:", width=5, font=self.font_config['label']).grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
         self.friend_area_var = tk.StringVar(value="36")
-        friend_area_entry = ttk.Entry(row2_frame, textvariable=self.friend_area_var, width=15, font=self.font_config['entry'])
-        friend_area_entry.grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
-        
-        ttk.Label(row2_frame, text="模式:", width=5, font=self.font_config['label']).grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
         self.friend_mode_var = tk.StringVar(value="sol")
-        friend_mode_combo = ttk.Combobox(row2_frame, textvariable=self.friend_mode_var, width=20, state="readonly",
-                                         font=self.font_config['entry'])
-        friend_mode_combo['values'] = ('sol', 'mp')
-        friend_mode_combo.grid(row=0, column=3, sticky=tk.W, padx=(0, 10))
-        ttk.Label(row2_frame, text="sol:烽火地带 mp:全面战场", font=self.font_config['small']).grid(row=0, column=4, sticky=tk.W)
-
-        # 查询按钮
-        btn_frame = ttk.Frame(friend_frame)
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        friend_query_btn = ttk.Button(btn_frame, text="查询周报队友", command=self.query_friend_report, width=18)
-        friend_query_btn.pack(anchor=tk.W)
-        friend_query_btn.configure(cursor="hand2")
-
-        # ===== 烽火周报页面 =====
-        fire_weekly_input_frame = ttk.Frame(fire_weekly_frame, padding=(10, 10, 10, 15))
-        fire_weekly_input_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        ttk.Label(fire_weekly_input_frame, text="统计日期:", width=label_width, font=self.font_config['label']).grid(row=0, column=0, sticky=tk.W, pady=(5, 8))
         self.fire_weekly_date_var = tk.StringVar(value=default_date)
-        fire_weekly_date_entry = ttk.Entry(fire_weekly_input_frame, textvariable=self.fire_weekly_date_var, width=20,
-                                           font=self.font_config['entry'])
-        fire_weekly_date_entry.grid(row=0, column=1, sticky=tk.W, pady=(5, 8), padx=(10, 15))
-        ttk.Label(fire_weekly_input_frame, text="格式: YYYYMMDD", font=self.font_config['small']).grid(row=0, column=2, sticky=tk.W, pady=(5, 8))
-
-        ttk.Label(fire_weekly_input_frame, text="战区:", width=label_width, font=self.font_config['label']).grid(row=1, column=0, sticky=tk.W, pady=8)
         self.fire_weekly_area_var = tk.StringVar(value="36")
-        fire_weekly_area_entry = ttk.Entry(fire_weekly_input_frame, textvariable=self.fire_weekly_area_var, width=15,
-                                           font=self.font_config['entry'])
-        fire_weekly_area_entry.grid(row=1, column=1, sticky=tk.W, pady=8, padx=(10, 15))
-
-        # 查询按钮
-        btn_frame = ttk.Frame(fire_weekly_frame)
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        fire_weekly_query_btn = ttk.Button(btn_frame, text="查询烽火周报", 
-                                           command=self.query_fire_weekly_report, width=18)
-        fire_weekly_query_btn.pack(anchor=tk.W)
-        fire_weekly_query_btn.configure(cursor="hand2")
-
-        # ===== 货币资产页面 =====
-        currency_input_frame = ttk.Frame(currency_frame, padding=(10, 10, 10, 15))
-        currency_input_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        ttk.Label(currency_input_frame, text="货币类型:", width=label_width, font=self.font_config['label']).grid(row=0, column=0, sticky=tk.W, pady=(5, 8))
         self.currency_type_var = tk.StringVar(value="17020000010")
-        currency_combo = ttk.Combobox(currency_input_frame, textvariable=self.currency_type_var, width=20,
-                                      state="readonly", font=self.font_config['entry'])
-        currency_combo['values'] = ('17020000010', '17888808889', '17888808888')
-        currency_combo.grid(row=0, column=1, sticky=tk.W, pady=(5, 8), padx=(10, 15))
-        
-        # 创建货币类型说明框架，更美观的布局
-        currency_info_frame = ttk.Frame(currency_input_frame)
-        currency_info_frame.grid(row=0, column=2, sticky=tk.W, pady=(5, 8), padx=(5, 0))
-        ttk.Label(currency_info_frame, text="17020000010 - 哈夫币", font=self.font_config['small']).pack(anchor=tk.W, pady=1)
-        ttk.Label(currency_info_frame, text="17888808889 - 三角券", font=self.font_config['small']).pack(anchor=tk.W, pady=1)
-        ttk.Label(currency_info_frame, text="17888808888 - 三角币", font=self.font_config['small']).pack(anchor=tk.W, pady=1)
-
-        # 查询按钮
-        btn_frame = ttk.Frame(currency_frame)
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        currency_query_btn = ttk.Button(btn_frame, text="查询货币资产", command=self.query_currency, width=18)
-        currency_query_btn.pack(anchor=tk.W)
-        currency_query_btn.configure(cursor="hand2")
-
-        # ===== 每日密码页面 =====
-        secret_input_frame = ttk.Frame(secret_frame, padding=(10, 10, 10, 15))
-        secret_input_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        ttk.Label(secret_input_frame, text="来源:", width=label_width, font=self.font_config['label']).grid(row=0, column=0, sticky=tk.W, pady=(5, 8))
         self.secret_source_var = tk.StringVar(value="2")
-        secret_source_entry = ttk.Entry(secret_input_frame, textvariable=self.secret_source_var, width=15, font=self.font_config['entry'])
-        secret_source_entry.grid(row=0, column=1, sticky=tk.W, pady=(5, 8), padx=(10, 15))
-        ttk.Label(secret_input_frame, text="默认为2", font=self.font_config['small']).grid(row=0, column=2, sticky=tk.W, pady=(5, 8))
-
-        # 查询按钮
-        btn_frame = ttk.Frame(secret_frame)
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        secret_query_btn = ttk.Button(btn_frame, text="查询每日密码", command=self.query_secret, width=18)
-        secret_query_btn.pack(anchor=tk.W)
-        secret_query_btn.configure(cursor="hand2")
+        
+        # 除默认显示的认证设置页外，其余标签页在首次切换到时才构建控件
+        self._tab_builders = {
+            1: (daily_frame, self._build_daily_tab),
+            2: (weekly_frame, self._build_weekly_tab),
+            3: (friend_frame, self._build_friend_tab),
+            4: (fire_weekly_frame, self._build_fire_weekly_tab),
+            5: (currency_frame, self._build_currency_tab),
+            6: (secret_frame, self._build_secret_tab),
+            7: (special_duty_frame, self._build_special_duty_tab)
+        }
+        self._built_tabs = {0}
 
-        # ===== 特勤处状态页面 =====
-        special_duty_input_frame = ttk.Frame(special_duty_frame, padding=(10, 20, 10, 20))
-        special_duty_input_frame.pack(fill=tk.X)
-        special_duty_query_btn = ttk.Button(special_duty_input_frame, text="查询特勤处状态", 
-                                           command=self.query_special_duty, width=18)
-        special_duty_query_btn.pack(anchor=tk.W)
-        special_duty_query_btn.configure(cursor="hand2")
+        # 认证设置页默认显示，启动时直接构建
+        self._build_auth_tab(auth_frame)
 
         # ===== 结果展示区域 =====
         result_frame = ttk.LabelFrame(main_frame, text="查询结果", padding=(12, 10, 12, 12))
         result_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10), padx=5)
         result_frame.columnconfigure(0, weight=1)
-        result_frame.rowconfigure(1, weight=1)
+        result_frame.rowconfigure(2, weight=1)
         
         # 设置窗口最大高度，避免超出屏幕
         screen_height = self.root.winfo_screenheight()
@@ -1002,7 +1271,7 @@ class FHZDDataQueryTool:
         
         # 状态栏标签
         self.status_var = tk.StringVar(value="就绪")
-        status_bar = ttk.Label(status_bar_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W, font=self.font_config['small'])
+        status_bar = ttk.Label(status_bar_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W, font=f_small)
         status_bar.grid(row=0, column=0, sticky=tk.EW, padx=5, pady=1)
         
         # 进度条
@@ -1019,20 +1288,20 @@ class FHZDDataQueryTool:
         view_selector_frame = ttk.Frame(result_frame)
         view_selector_frame.grid(row=0, column=0, sticky=tk.EW, pady=(0, 8))
         
-        ttk.Label(view_selector_frame, text="显示方式:", font=self.font_config['small']).pack(side=tk.LEFT, padx=5)
+        ttk.Label(view_selector_frame, text="显示方式:", font=f_small).pack(side=tk.LEFT, padx=5)
         self.view_mode_var = tk.StringVar(value="table")
         ttk.Radiobutton(view_selector_frame, text="表格视图", variable=self.view_mode_var, 
                        value="table", command=self._switch_view_mode).pack(side=tk.LEFT, padx=5)
         ttk.Radiobutton(view_selector_frame, text="文本视图", variable=self.view_mode_var, 
                        value="text", command=self._switch_view_mode).pack(side=tk.LEFT, padx=5)
         
-        # 添加分隔线提升视觉效果
+        # 添加分隔线提升视觉效果，单独占一行，不与视图选择器重叠
         separator = ttk.Separator(result_frame, orient='horizontal')
-        separator.grid(row=0, column=0, sticky=tk.EW, pady=(20, 0))
+        separator.grid(row=1, column=0, sticky=tk.EW, pady=(0, 8))
 
         # 创建结果容器框架
         result_content_frame = ttk.Frame(result_frame)
-        result_content_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        result_content_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         result_content_frame.columnconfigure(0, weight=1)
         result_content_frame.rowconfigure(0, weight=1)
         
@@ -1047,21 +1316,25 @@ class FHZDDataQueryTool:
         self.table_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # 表格滚动条
-        table_vscroll = ttk.Scrollbar(self.table_frame, orient=tk.VERTICAL)
+        self._table_vscroll = table_vscroll = ttk.Scrollbar(self.table_frame, orient=tk.VERTICAL)
         table_hscroll = ttk.Scrollbar(self.table_frame, orient=tk.HORIZONTAL)
         
-        # 创建表格
+        # 创建表格：垂直滚动时检查是否需要追加下一批数据行
         self.tree = ttk.Treeview(
             self.table_frame, 
-            yscrollcommand=table_vscroll.set,
+            yscrollcommand=self._on_tree_yscroll,
             xscrollcommand=table_hscroll.set,
             show="headings",
             selectmode="extended"
         )
         
-        # 配置表格样式
-        self.tree.tag_configure('even', background='#f0f0f0')
-        self.tree.tag_configure('odd', background='#ffffff')
+        # 配置表格样式：斑马纹标签只需配置一次，插入行时直接指定标签
+        self.tree.tag_configure('evenrow', background='#f0f0f0')
+        
+        # 鼠标悬停效果：<Motion>只绑定一次，由_hover_tracking标记控制只在指针位于表格内时跟踪移动，离开表格时清除高亮
+        self.tree.bind('<Motion>', self._on_tree_mouse_move)
+        self.tree.bind('<Enter>', self._on_tree_enter)
+        self.tree.bind('<Leave>', self._on_tree_leave)
         
         table_vscroll.config(command=self.tree.yview)
         table_hscroll.config(command=self.tree.xview)
@@ -1082,38 +1355,24 @@ class FHZDDataQueryTool:
         left_buttons = ttk.Frame(button_frame)
         left_buttons.pack(side=tk.LEFT, fill=tk.X)
         
-        clear_btn = ttk.Button(left_buttons, text="清空结果", command=self.clear_results, width=12)
-        clear_btn.pack(side=tk.LEFT, padx=4)
-        clear_btn.configure(cursor="hand2")
+        self.clear_btn = ttk.Button(left_buttons, text="清空结果", command=self.clear_results, width=12, cursor="hand2")
+        self.clear_btn.pack(side=tk.LEFT, padx=4)
 
-        refresh_btn = ttk.Button(left_buttons, text="刷新数据", command=self.refresh_data, width=12)
-        refresh_btn.pack(side=tk.LEFT, padx=4)
-        refresh_btn.configure(cursor="hand2")
+        self.refresh_btn = ttk.Button(left_buttons, text="刷新数据", command=self.refresh_data, width=12, cursor="hand2")
+        self.refresh_btn.pack(side=tk.LEFT, padx=4)
 
-        export_btn = ttk.Button(left_buttons, text="导出数据", command=self.export_data, width=12)
-        export_btn.pack(side=tk.LEFT, padx=4)
-        export_btn.configure(cursor="hand2")
-        export_btn.configure(cursor="hand2")
+        self.export_btn = ttk.Button(left_buttons, text="导出数据", command=self.export_data, width=12, cursor="hand2")
+        self.export_btn.pack(side=tk.LEFT, padx=4)
 
         # 右侧按钮组
         right_buttons = ttk.Frame(button_frame)
         right_buttons.pack(side=tk.RIGHT)
         
-        export_all_btn = ttk.Button(right_buttons, text="一键导出所有数据", command=self.show_export_selection, width=15)
+        export_all_btn = ttk.Button(right_buttons, text="一键导出所有数据", command=self.show_export_selection, width=15, cursor="hand2")
         export_all_btn.pack(side=tk.RIGHT, padx=5)
-        export_all_btn.configure(cursor="hand2")
 
-        help_btn = ttk.Button(right_buttons, text="使用帮助", command=self.show_help, width=10)
+        help_btn = ttk.Button(right_buttons, text="使用帮助", command=self.show_help, width=10, cursor="hand2")
         help_btn.pack(side=tk.RIGHT, padx=5)
-        help_btn.configure(cursor="hand2")
-        
-        # 保存框架引用，用于主题切换
-        self.all_frames = []
-        self.all_frames.extend([main_frame, auth_frame, daily_frame, weekly_frame, friend_frame, 
-                               fire_weekly_frame, currency_frame, secret_frame, special_duty_frame,
-                               result_frame, button_frame, title_frame, status_bar_frame, view_selector_frame,
-                               auth_input_frame, daily_input_frame, weekly_input_frame, fire_weekly_input_frame,
-                               currency_input_frame, secret_input_frame, currency_info_frame, result_content_frame])
 
         # 配置权重，使界面可响应式扩展
         main_frame.rowconfigure(2, weight=1)  # 结果区域占主要空间
@@ -1123,50 +1382,220 @@ class FHZDDataQueryTool:
         self.current_query_function = None
         self.current_query_args = ()
         
+        # 查询期间需要禁用的按钮在界面构建完成后收集一次，切换状态时直接遍历
+        self._state_toggle_widgets = (self.clear_btn, self.refresh_btn, self.export_btn)
+        
         # 应用默认主题
         self.theme_manager.apply_theme_to_widget(self.root)
 
+    def _add_field(self, parent, row, label_text, var, hint=None, values=None, width=20,
+                   label_width=None, pady=8, padx=(10, 15), sticky=tk.W):
+        """在parent的第row行添加“标签 + 输入框/下拉框 + 提示”表单字段，返回输入控件
+        
+        指定values时创建只读下拉框，否则创建输入框；hint为空时不添加提示标签
+        """
+        label_options = {'width': label_width} if label_width else {}
+        ttk.Label(parent, text=label_text, font=self.font_config['label'], **label_options).grid(
+            row=row, column=0, sticky=tk.W, pady=pady)
+        if values is not None:
+            widget = ttk.Combobox(parent, textvariable=var, values=values, width=width, state="readonly",
+                                  font=self.font_config['entry'])
+        else:
+            widget = ttk.Entry(parent, textvariable=var, width=width, font=self.font_config['entry'])
+        widget.grid(row=row, column=1, sticky=sticky, pady=pady, padx=padx)
+        if hint:
+            ttk.Label(parent, text=hint, font=self.font_config['small']).grid(row=row, column=2, sticky=tk.W, pady=pady)
+        return widget
+    
+    def _build_auth_tab(self, auth_frame):
+        """构建认证设置标签页的控件"""
+        # 输入框容器，实现更好的对齐和布局
+        auth_input_frame = ttk.Frame(auth_frame)
+        auth_input_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self.openid_var = tk.StringVar(value=self.default_openid)
+        self.token_var = tk.StringVar(value=self.default_token)
+        self.acctype_var = tk.StringVar(value="qc")
+        
+        # OpenID、Token输入和账号类型选择
+        self._add_field(auth_input_frame, 0, "OpenID:", self.openid_var, "游戏账号的唯一标识符",
+                        pady=(10, 8), padx=(15, 10), sticky=(tk.W, tk.E))
+        self._add_field(auth_input_frame, 1, "Token:", self.token_var, "访问令牌",
+                        padx=(15, 10), sticky=(tk.W, tk.E))
+        self._add_field(auth_input_frame, 2, "账号类型:", self.acctype_var, "qc:QQ账号 wx:微信账号",
+                        values=_ACC_VALUES, width=15, padx=(15, 10))
+        
+        # 保存按钮
+        save_auth_btn = ttk.Button(auth_frame, text="保存认证信息", command=self.save_auth_info, width=25, cursor="hand2")
+        save_auth_btn.pack(pady=10)
+
+    def _build_daily_tab(self, daily_frame):
+        """构建昨日日报标签页的控件"""
+        daily_input_frame = ttk.Frame(daily_frame)
+        daily_input_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self._add_field(daily_input_frame, 0, "资源类型:", self.daily_resource_var, "sol:烽火地带 mp:全面战场",
+                        values=_MODE_VALUES, pady=(10, 8), padx=(15, 10))
+        self._add_field(daily_input_frame, 1, "战区:", self.daily_area_var, "默认:36(华东)", width=15, padx=(15, 10))
+
+        # 查询按钮区域
+        daily_query_btn = ttk.Button(daily_frame, text="查询昨日日报", command=self.query_daily_report, width=20, cursor="hand2")
+        daily_query_btn.pack(pady=10, anchor=tk.W)
+
+    def _build_weekly_tab(self, weekly_frame):
+        """构建战场周报标签页的控件"""
+        # 统一标签宽度，保持对齐
+        label_width = 8
+        
+        weekly_input_frame = ttk.Frame(weekly_frame, padding=(10, 10, 10, 15))
+        weekly_input_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self._add_field(weekly_input_frame, 0, "统计日期:", self.weekly_date_var, "格式: YYYYMMDD",
+                        label_width=label_width, pady=(5, 8))
+        self._add_field(weekly_input_frame, 1, "战区:", self.weekly_area_var, width=15, label_width=label_width)
+        self._add_field(weekly_input_frame, 2, "模式:", self.weekly_mode_var, "sol:烽火地带 mp:全面战场",
+                        values=_MODE_VALUES, label_width=label_width)
+
+        # 查询按钮
+        btn_frame = ttk.Frame(weekly_frame)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        weekly_query_btn = ttk.Button(btn_frame, text="查询战场周报", command=self.query_weekly_report, width=18, cursor="hand2")
+        weekly_query_btn.pack(anchor=tk.W)
+
+    def _build_friend_tab(self, friend_frame):
+        """构建周报队友标签页的控件"""
+        # 常用字体配置绑定到局部变量，构建控件时不再重复查找
+        f_label, f_entry, f_small = self.font_config['label'], self.font_config['entry'], self.font_config['small']
+        
+        # 统一标签宽度，保持对齐
+        label_width = 8
+        
+        friend_input_frame = ttk.Frame(friend_frame, padding=(10, 10, 10, 15))
+        friend_input_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self._add_field(friend_input_frame, 0, "统计日期:", self.friend_date_var, "格式: YYYYMMDD",
+                        label_width=label_width, pady=(5, 8))
+
+        # 第二行使用网格布局，确保对齐
+        row2_frame = ttk.Frame(friend_input_frame)
+        row2_frame.grid(row=1, column=0, columnspan=4, sticky=tk.W, pady=8)
+        
+        ttk.Label(row2_frame, text="战区:", width=5, font=f_label).grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        friend_area_entry = ttk.Entry(row2_frame, textvariable=self.friend_area_var, width=15, font=f_entry)
+        friend_area_entry.grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
+        
+        ttk.Label(row2_frame, text="模式:", width=5, font=f_label).grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
+        friend_mode_combo = ttk.Combobox(row2_frame, textvariable=self.friend_mode_var, values=_MODE_VALUES, width=20,
+                                         state="readonly", font=f_entry)
+        friend_mode_combo.grid(row=0, column=3, sticky=tk.W, padx=(0, 10))
+        ttk.Label(row2_frame, text="sol:烽火地带 mp:全面战场", font=f_small).grid(row=0, column=4, sticky=tk.W)
+
+        # 查询按钮
+        btn_frame = ttk.Frame(friend_frame)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        friend_query_btn = ttk.Button(btn_frame, text="查询周报队友", command=self.query_friend_report, width=18, cursor="hand2")
+        friend_query_btn.pack(anchor=tk.W)
+
+    def _build_fire_weekly_tab(self, fire_weekly_frame):
+        """构建烽火周报标签页的控件"""
+        # 统一标签宽度，保持对齐
+        label_width = 8
+        
+        fire_weekly_input_frame = ttk.Frame(fire_weekly_frame, padding=(10, 10, 10, 15))
+        fire_weekly_input_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self._add_field(fire_weekly_input_frame, 0, "统计日期:", self.fire_weekly_date_var, "格式: YYYYMMDD",
+                        label_width=label_width, pady=(5, 8))
+        self._add_field(fire_weekly_input_frame, 1, "战区:", self.fire_weekly_area_var, width=15, label_width=label_width)
+
+        # 查询按钮
+        btn_frame = ttk.Frame(fire_weekly_frame)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        fire_weekly_query_btn = ttk.Button(btn_frame, text="查询烽火周报", 
+                                           command=self.query_fire_weekly_report, width=18, cursor="hand2")
+        fire_weekly_query_btn.pack(anchor=tk.W)
+
+    def _build_currency_tab(self, currency_frame):
+        """构建货币查询标签页的控件"""
+        f_small = self.font_config['small']
+        
+        # 统一标签宽度，保持对齐
+        label_width = 8
+        
+        currency_input_frame = ttk.Frame(currency_frame, padding=(10, 10, 10, 15))
+        currency_input_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self._add_field(currency_input_frame, 0, "货币类型:", self.currency_type_var,
+                        values=_CURRENCY_VALUES, label_width=label_width, pady=(5, 8))
+        
+        # 创建货币类型说明框架，更美观的布局
+        currency_info_frame = ttk.Frame(currency_input_frame)
+        currency_info_frame.grid(row=0, column=2, sticky=tk.W, pady=(5, 8), padx=(5, 0))
+        ttk.Label(currency_info_frame, text="17020000010 - 哈夫币", font=f_small).pack(anchor=tk.W, pady=1)
+        ttk.Label(currency_info_frame, text="17888808889 - 三角券", font=f_small).pack(anchor=tk.W, pady=1)
+        ttk.Label(currency_info_frame, text="17888808888 - 三角币", font=f_small).pack(anchor=tk.W, pady=1)
+
+        # 查询按钮
+        btn_frame = ttk.Frame(currency_frame)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        currency_query_btn = ttk.Button(btn_frame, text="查询货币资产", command=self.query_currency, width=18, cursor="hand2")
+        currency_query_btn.pack(anchor=tk.W)
+
+    def _build_secret_tab(self, secret_frame):
+        """构建每日密码标签页的控件"""
+        # 统一标签宽度，保持对齐
+        label_width = 8
+        
+        secret_input_frame = ttk.Frame(secret_frame, padding=(10, 10, 10, 15))
+        secret_input_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self._add_field(secret_input_frame, 0, "来源:", self.secret_source_var, "默认为2",
+                        width=15, label_width=label_width, pady=(5, 8))
+
+        # 查询按钮
+        btn_frame = ttk.Frame(secret_frame)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        secret_query_btn = ttk.Button(btn_frame, text="查询每日密码", command=self.query_secret, width=18, cursor="hand2")
+        secret_query_btn.pack(anchor=tk.W)
+
+    def _build_special_duty_tab(self, special_duty_frame):
+        """构建特勤处状态标签页的控件"""
+        special_duty_input_frame = ttk.Frame(special_duty_frame, padding=(10, 20, 10, 20))
+        special_duty_input_frame.pack(fill=tk.X)
+        special_duty_query_btn = ttk.Button(special_duty_input_frame, text="查询特勤处状态", 
+                                           command=self.query_special_duty, width=18, cursor="hand2")
+        special_duty_query_btn.pack(anchor=tk.W)
+
     def save_auth_info(self):
         """保存认证信息到配置文件"""
         try:
             # 验证输入
             openid = self.openid_var.get().strip()
             token = self.token_var.get().strip()
+            acctype = self.acctype_var.get().strip()
             
             if not openid or not token:
                 messagebox.showerror("错误", "OpenID和Token不能为空")
                 return
             
-            # 保存认证信息到主配置文件，与其他配置保持一致
-            config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.ini')
-            config = configparser.ConfigParser()
-            
-            # 如果配置文件存在，先读取现有配置
-            if os.path.exists(config_path):
-                config.read(config_path, encoding='utf-8')
-            
-            # 确保Settings节存在
-            if 'Settings' not in config:
-                config['Settings'] = {}
-            
-            # 添加认证信息到Settings节
-            config['Settings']['openid'] = openid
-            config['Settings']['token'] = token
-            config['Settings']['acctype'] = self.acctype_var.get().strip()
+            # 与内存中已加载的配置相同时无需写入文件
+            if (openid, token, acctype) == (self.config.get('openid'), self.config.get('token'), self.config.get('acctype')):
+                self.set_status("认证信息无变化")
+                return
             
-            # 写入配置文件
-            with open(config_path, 'w', encoding='utf-8') as f:
-                config.write(f)
+            # 认证信息已变更，清除Cookie缓存和校验记录
+            self._build_cookie.cache_clear()
+            self._validated_auth = None
             
-            # 同时更新内存中的配置
+            # 更新内存中的配置，再保存到主配置文件，与其他配置保持一致
             self.config['openid'] = openid
             self.config['token'] = token
-            self.config['acctype'] = self.acctype_var.get().strip()
+            self.config['acctype'] = acctype
             
-            messagebox.showinfo("成功", "认证信息已保存")
+            # 在后台写入配置文件，保存完成后在状态栏提示，失败时弹出错误提示
+            self.save_config(lambda: self.set_status("认证信息已保存"))
         except Exception as e:
-            # 更详细的错误信息，包含文件路径
-            error_msg = f"保存认证信息失败: {str(e)}\n配置文件路径: {config_path}"
+            error_msg = f"保存认证信息失败: {str(e)}"
             self.logger.error(error_msg)  # 记录错误日志
             messagebox.showerror("错误", error_msg)
     
@@ -1174,11 +1603,7 @@ class FHZDDataQueryTool:
         """切换应用主题"""
         self.current_theme = self.theme_manager.toggle_theme()
         
-        # 应用主题到所有保存的框架
-        for frame in self.all_frames:
-            self.theme_manager.apply_theme_to_widget(frame)
-        
-        # 应用主题到根窗口
+        # ttk控件随ttk主题切换自动更新，只需从根窗口遍历一次更新tk原生控件
         self.theme_manager.apply_theme_to_widget(self.root)
         
         # 保存主题设置
@@ -1186,27 +1611,33 @@ class FHZDDataQueryTool:
         self.save_config()
     
     def get_cookie(self):
-        """获取Cookie信息，增强错误处理和验证"""
-        openid = self.openid_var.get().strip()
-        token = self.token_var.get().strip()
-        acctype = self.acctype_var.get().strip()
-
+        """获取Cookie信息，认证信息未变化时跳过校验并复用已生成的Cookie"""
+        auth = (self.openid_var.get().strip(), self.token_var.get().strip(), self.acctype_var.get().strip())
+        if auth != self._validated_auth:
+            if not self._validate_auth(*auth):
+                return None
+            # 认证信息变化后缓存的结果可能属于之前的账号，不能再使用
+            with self._cache_lock:
+                self.result_cache.clear()
+            self._validated_auth = auth
+        return self._build_cookie(*auth)
+    
+    def _validate_auth(self, openid, token, acctype):
+        """校验认证信息，增强错误处理和验证，校验失败时返回False"""
         # 输入验证
         if not openid:
             error_msg = "OpenID不能为空"
             self.logger.error(error_msg)
             messagebox.showerror("输入错误", error_msg)
-            if hasattr(self, '_update_query_status'):
-                self._update_query_status(False)
-            return None
+            self._update_query_status(False)
+            return False
             
         if not token:
             error_msg = "Token不能为空"
             self.logger.error(error_msg)
             messagebox.showerror("输入错误", error_msg)
-            if hasattr(self, '_update_query_status'):
-                self._update_query_status(False)
-            return None
+            self._update_query_status(False)
+            return False
         
         # 格式验证
         if len(openid) < 10:
@@ -1220,45 +1651,55 @@ class FHZDDataQueryTool:
             messagebox.showwarning("格式警告", error_msg)
         
         # 账号类型验证
-        if acctype not in ['qc', 'wx']:
+        if acctype not in _ACC_VALUES:
             error_msg = f"账号类型不正确: {acctype}"
             self.logger.error(error_msg)
             messagebox.showerror("输入错误", error_msg)
-            if hasattr(self, '_update_query_status'):
-                self._update_query_status(False)
-            return None
-
-        cookie = f"openid={openid}; acctype={acctype}; appid=101491592; access_token={token}"
-        self.logger.debug(f"Cookie生成成功，长度: {len(cookie)}")
-        return cookie
+            self._update_query_status(False)
+            return False
+        
+        return True
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _build_cookie(openid, token, acctype):
+        """根据认证信息生成Cookie字符串，相同输入直接返回缓存结果"""
+        return f"openid={openid}; acctype={acctype}; appid=101491592; access_token={token}"
     
-    def _make_api_request(self, host, params, headers=None, timeout=30, max_retries=3):
-        """通用API请求方法，增强错误处理和恢复机制"""
+    def _make_api_request(self, host, params, headers=None, timeout=None, max_retries=None):
+        """通用API请求方法，增强错误处理和恢复机制
+        
+        在后台线程中执行，提示框通过root.after交给主线程显示
+        """
+        
+        # 未指定时使用配置中的超时时间和重试次数
+        if timeout is None:
+            timeout = self.config.get('timeout', 30.0)
+        if max_retries is None:
+            max_retries = max(1, self.config.get('retry_count', 3))
         
         # 参数验证
         if not host or not params:
             error_msg = "API请求参数无效：host或params为空"
             self.logger.error(error_msg)
-            messagebox.showerror("参数错误", error_msg)
+            self.root.after(0, messagebox.showerror, "参数错误", error_msg)
             return None
         
-        # 生成缓存键
-        cache_key = f"{host}:{hash(str(sorted(params.items())))}"
+        cache_key = self._api_cache_key(host, params)
         
-        # 检查缓存
-        if hasattr(self, 'api_cache') and cache_key in self.api_cache:
-            cached_result, cache_time = self.api_cache[cache_key]
-            if time.time() - cache_time < self.config.get('cache_expiry', 300):
-                self.logger.debug(f"使用缓存数据: {cache_key}")
-                return cached_result
-        
-        # 初始化缓存
-        if not hasattr(self, 'api_cache'):
-            self.api_cache = {}
+        # 检查缓存：一次字典查找取出过期时刻和结果，命中时移到末尾，过期时直接删除
+        with self._cache_lock:
+            entry = self.result_cache.get(cache_key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self.result_cache.move_to_end(cache_key)
+                    self.logger.debug("使用缓存数据: %s", cache_key)
+                    return entry[1]
+                del self.result_cache[cache_key]
         
         # 重试逻辑
         for attempt in range(max_retries):
-            conn = None
+            res = None
             try:
                 # 设置默认请求头
                 if headers is None:
@@ -1271,144 +1712,160 @@ class FHZDDataQueryTool:
                 if not all(isinstance(v, (str, int, float)) for v in params.values()):
                     raise ValueError("请求参数包含无效类型")
                 
-                # 执行请求
-                conn = http.client.HTTPSConnection(host, timeout=timeout)
-                payload = ''
-                
-                # 构建查询字符串
-                query_string = urllib.parse.urlencode(params)
-                full_path = f"/ide/?{query_string}"
-                
-                self.logger.debug(f"API请求: {host}{full_path}")
-                conn.request("POST", full_path, payload, headers)
-                
-                # 获取响应
-                res = conn.getresponse()
+                # 执行请求：通过共享会话发送，复用连接池中的连接
+                url = f"https://{host}/ide/"
+                # 拼接查询串的开销较大，只在调试日志开启时执行
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("API请求: %s?%s", url, urllib.parse.urlencode(params))
+                # 连接超时单独设置为较短的时间，服务器不可达时尽快进入重试，读取超时仍使用配置值
+                res = self.http.post(url, params=params, data='', headers=headers,
+                                     timeout=(min(_CONNECT_TIMEOUT, timeout), timeout))
                 
                 # 检查HTTP响应状态码
-                if res.status != 200:
-                    error_msg = f"HTTP请求失败，状态码: {res.status} {res.reason}"
+                if res.status_code != 200:
+                    error_msg = f"HTTP请求失败，状态码: {res.status_code} {res.reason}"
                     self.set_status(error_msg)
                     self.logger.error(error_msg)
                     
                     # 详细的错误处理
-                    if res.status == 401:
-                        messagebox.showerror("认证错误", "Token无效或已过期，请重新输入")
+                    if res.status_code == 401:
+                        self.root.after(0, messagebox.showerror, "认证错误", "Token无效或已过期，请重新输入")
                         return None
-                    elif res.status == 403:
-                        messagebox.showerror("权限错误", "访问被拒绝，请检查账号权限")
+                    elif res.status_code == 403:
+                        self.root.after(0, messagebox.showerror, "权限错误", "访问被拒绝，请检查账号权限")
                         return None
-                    elif res.status == 404:
-                        messagebox.showerror("资源错误", "请求的资源不存在")
+                    elif res.status_code == 404:
+                        self.root.after(0, messagebox.showerror, "资源错误", "请求的资源不存在")
                         return None
-                    elif 400 <= res.status < 500:
-                        messagebox.showerror("客户端错误", f"请求参数错误: {res.status}")
+                    elif 400 <= res.status_code < 500:
+                        self.root.after(0, messagebox.showerror, "客户端错误", f"请求参数错误: {res.status_code}")
                         return None
                     
                     # 5xx错误，继续重试
                     if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt  # 指数退避
-                        self.logger.warning(f"5xx错误，{wait_time}秒后重试 (尝试 {attempt + 1}/{max_retries})")
+                        wait_time = self._retry_delay(attempt)
+                        self.logger.warning("5xx错误，%.1f秒后重试 (尝试 %d/%d)", wait_time, attempt + 1, max_retries)
                         time.sleep(wait_time)
                         continue
                     else:
-                        messagebox.showerror("服务器错误", f"服务器错误 ({res.status})，请稍后重试")
+                        self.root.after(0, messagebox.showerror, "服务器错误", f"服务器错误 ({res.status_code})，请稍后重试")
                         return None
                 
-                data = res.read()
-                result = data.decode("utf-8")
+                result = res.content.decode("utf-8")
                 
                 # 验证响应数据
                 if not result or len(result) < 10:
                     self.logger.warning("响应数据异常短小")
                     
-                # 缓存成功的结果
-                self.api_cache[cache_key] = (result, time.time())
-                self.logger.info(f"API请求成功: {host}")
+                # 缓存成功的结果，超过上限时淘汰最久未使用的条目
+                with self._cache_lock:
+                    self.result_cache[cache_key] = (time.monotonic() + self.config.get('cache_expiry', 300), result)
+                    self.result_cache.move_to_end(cache_key)
+                    while len(self.result_cache) > self._cache_max:
+                        self.result_cache.popitem(last=False)
+                self.logger.info("API请求成功: %s", host)
                 return result
                 
-            except (http.client.HTTPException, TimeoutError, ConnectionError, socket.timeout) as e:
+            except (RequestException, TimeoutError, socket.timeout) as e:
                 error_msg = f"网络请求错误 (尝试 {attempt + 1}/{max_retries}): {str(e)}"
                 self.set_status("网络请求错误")
                 self.logger.warning(error_msg)
                 
                 if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # 指数退避
-                    self.logger.info(f"等待 {wait_time} 秒后重试...")
+                    wait_time = self._retry_delay(attempt)
+                    self.logger.info("等待 %.1f 秒后重试...", wait_time)
                     time.sleep(wait_time)
                     continue
                 else:
                     final_error = f"请求失败，请检查网络连接: {str(e)}"
                     self.set_status(final_error)
                     self.logger.error(final_error)
-                    messagebox.showerror("网络错误", final_error)
+                    self.root.after(0, messagebox.showerror, "网络错误", final_error)
                     return None
             except Exception as e:
                 error_msg = f"发生未知错误 (尝试 {attempt + 1}/{max_retries}): {str(e)}"
                 self.set_status("未知错误")
-                self.logger.error(error_msg)
-                self.logger.error(traceback.format_exc())
+                self.logger.error("%s", error_msg, exc_info=True)
                 
                 if attempt < max_retries - 1:
                     wait_time = 1
                     time.sleep(wait_time)
                     continue
                 else:
-                    messagebox.showerror("未知错误", error_msg)
+                    self.root.after(0, messagebox.showerror, "未知错误", error_msg)
                     return None
             finally:
-                # 确保连接总是被关闭
-                if conn:
+                # 确保响应总是被释放，连接归还到连接池
+                if res is not None:
                     try:
-                        conn.close()
+                        res.close()
                     except:
                         pass
         
         return None
 
+    @staticmethod
+    def _retry_delay(attempt):
+        """重试等待时间：指数退避，上限8秒，并加入随机抖动，避免多个请求同时重试"""
+        return min(8, 2 ** attempt) + random.uniform(0, 0.5)
+    
+    @staticmethod
+    def _api_cache_key(host, params):
+        """生成缓存键：直接以参数集合作为字典键，无需排序和字符串化，也不会因哈希碰撞混淆不同参数"""
+        return (host, frozenset(params.items()))
+    
     def set_status(self, message):
         """设置状态栏消息和进度指示，使用队列机制避免UI阻塞"""
         # 确保消息包含前缀
         if not message.startswith("状态:"):
             message = f"状态: {message}"
         
-        # 使用after方法避免直接更新UI，提高响应性
-        def update_status():
-            self.status_var.set(message)
-            self.root.update_idletasks()
-        
-        self.root.after(0, update_status)
-        
-        # 记录状态历史，限制最近10条
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        history_entry = f"[{timestamp}] {message}"
-        if not hasattr(self, 'query_history'):
-            self.query_history = []
-        self.query_history.append(history_entry)
-        if len(self.query_history) > 10:
-            self.query_history.pop(0)
+        # 与最近一次的消息相同时状态栏无需更新，也不重复记录历史
+        if message == self._pending_status:
+            return
+        
+        # 合并短时间内的多次状态更新：只记录最新消息，50毫秒内最多刷新一次状态栏，
+        # 由Tk的事件循环正常重绘，不再每次强制处理空闲任务
+        self._pending_status = message
+        if not self._status_scheduled:
+            self._status_scheduled = True
+            self.root.after(50, self._flush_status)
+        
+        # 记录状态历史，只记录时间戳整数，显示时再格式化
+        self.query_history.append((time.time_ns(), message))
             
+    def _flush_status(self):
+        """将最新的状态消息写入状态栏"""
+        self._status_scheduled = False
+        self.status_var.set(self._pending_status)
+    
     def update_progress(self, value):
-        """更新进度条，使用异步更新避免UI阻塞"""
-        if hasattr(self, 'progress_bar') and hasattr(self, 'progress_var'):
-            # 使用after方法异步更新进度条，提高响应性
-            def update_progress_value():
-                # 确保进度条可见
-                if not self.progress_bar.winfo_ismapped():
-                    self.progress_bar.grid()
-                    
-                # 更新进度值，范围0-100
-                self.progress_var.set(min(100, max(0, value)))
-                
-                # 如果进度达到100%，延迟隐藏进度条
-                if value >= 100:
-                    self.root.after(1000, self._hide_progress)
+        """更新进度条：只记录最新的进度值，同一轮事件循环中的多次更新合并为一次刷新"""
+        if self.progress_bar is not None:
+            scheduled = self._pending_progress is not None
+            self._pending_progress = value
+            if not scheduled:
+                self.root.after_idle(self._flush_progress)
+    
+    def _flush_progress(self):
+        """将最新的进度值写入进度条"""
+        value = self._pending_progress
+        self._pending_progress = None
+        
+        # 确保进度条可见
+        if not self.progress_bar.winfo_ismapped():
+            self.progress_bar.grid()
             
-            self.root.after(0, update_progress_value)
+        # 更新进度值，范围0-100
+        self.progress_var.set(min(100, max(0, value)))
+        
+        # 如果进度达到100%，延迟隐藏进度条
+        if value >= 100:
+            self.root.after(1000, self._hide_progress)
                 
     def _hide_progress(self):
-        """隐藏进度条"""
-        if hasattr(self, 'progress_bar') and self.progress_bar.winfo_ismapped():
+        """隐藏进度条，期间已开始新的查询时保留进度条"""
+        if self.progress_bar is not None and self.progress_bar.winfo_ismapped() and self.progress_var.get() >= 100:
             self.progress_var.set(0)
             self.progress_bar.grid_remove()
     
@@ -1417,18 +1874,12 @@ class FHZDDataQueryTool:
         self.is_querying = is_querying
         
         # 更新UI按钮状态
-        button_names = ['clear_button', 'refresh_button', 'export_button', 'clear_btn', 'refresh_btn', 'export_btn']
-        
-        for btn_name in button_names:
-            if hasattr(self, btn_name):
-                button = getattr(self, btn_name)
-                button.config(state=tk.DISABLED if is_querying else tk.NORMAL)
+        state = tk.DISABLED if is_querying else tk.NORMAL
+        for button in self._state_toggle_widgets:
+            button.config(state=state)
                 
-        # 更新进度条初始状态
-        if is_querying:
-            self.update_progress(10)  # 初始进度10%
-        else:
-            self.update_progress(100)  # 完成时进度100%
+        # 更新进度条初始状态：开始时10%，完成时100%
+        self.update_progress(10 if is_querying else 100)
 
     def query_daily_report(self):
         # 保存当前查询状态
@@ -1438,7 +1889,7 @@ class FHZDDataQueryTool:
         # 更新查询状态
         self._update_query_status(True)
         self.set_status("正在查询昨日日报...")
-        threading.Thread(target=self._query_daily_report).start()
+        self._query_daily_report()
 
     def query_weekly_report(self):
         # 保存当前查询状态
@@ -1448,7 +1899,7 @@ class FHZDDataQueryTool:
         # 更新查询状态
         self._update_query_status(True)
         self.set_status("正在查询战场周报...")
-        threading.Thread(target=self._query_weekly_report).start()
+        self._query_weekly_report()
 
     def query_friend_report(self):
         # 保存当前查询状态
@@ -1458,7 +1909,7 @@ class FHZDDataQueryTool:
         # 更新查询状态
         self._update_query_status(True)
         self.set_status("正在查询周报队友...")
-        threading.Thread(target=self._query_friend_report).start()
+        self._query_friend_report()
 
     def query_fire_weekly_report(self):
         # 保存当前查询状态
@@ -1468,7 +1919,7 @@ class FHZDDataQueryTool:
         # 更新查询状态
         self._update_query_status(True)
         self.set_status("正在查询烽火周报...")
-        threading.Thread(target=self._query_fire_weekly_report).start()
+        self._query_fire_weekly_report()
 
     def query_currency(self):
         # 保存当前查询状态
@@ -1478,7 +1929,7 @@ class FHZDDataQueryTool:
         # 更新查询状态
         self._update_query_status(True)
         self.set_status("正在查询货币资产...")
-        threading.Thread(target=self._query_currency).start()
+        self._query_currency()
 
     def query_secret(self):
         # 保存当前查询状态
@@ -1488,7 +1939,7 @@ class FHZDDataQueryTool:
         # 更新查询状态
         self._update_query_status(True)
         self.set_status("正在查询每日密码...")
-        threading.Thread(target=self._query_secret).start()
+        self._query_secret()
 
     def query_special_duty(self):
         # 保存当前查询状态
@@ -1498,12 +1949,16 @@ class FHZDDataQueryTool:
         # 更新查询状态
         self._update_query_status(True)
         self.set_status("正在查询特勤处状态...")
-        threading.Thread(target=self._query_special_duty).start()
+        self._query_special_duty()
 
     # ==================== 选择导出对话框 ====================
 
     def show_export_selection(self):
         """显示模块选择对话框"""
+        if self._export_future is not None and not self._export_future.done():
+            messagebox.showinfo("提示", "正在导出数据，请等待当前导出完成")
+            return
+        
         selection_window = tk.Toplevel(self.root)
         selection_window.title("选择导出模块")
         selection_window.geometry("500x600")
@@ -1531,9 +1986,6 @@ class FHZDDataQueryTool:
         select_all_frame = ttk.Frame(selection_window)
         select_all_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
 
-        # 复选框变量
-        self.module_vars = {}
-
         # 创建全选/全不选按钮
         def select_all():
             for var in self.module_vars.values():
@@ -1547,10 +1999,7 @@ class FHZDDataQueryTool:
         ttk.Button(select_all_frame, text="全不选", command=select_none, width=10).pack(side=tk.LEFT, padx=5)
 
         # 为每个模块创建复选框
-        for module_name in self.module_definitions.keys():
-            var = tk.BooleanVar(value=True)  # 默认全部选中
-            self.module_vars[module_name] = var
-
+        for module_name, var in self.module_vars.items():
             cb = ttk.Checkbutton(scrollable_frame, text=module_name, variable=var)
             cb.pack(anchor=tk.W, padx=20, pady=5)
 
@@ -1569,81 +2018,131 @@ class FHZDDataQueryTool:
                 return
 
             selection_window.destroy()
-            self.set_status("正在导出选中的数据...")
-            threading.Thread(target=self._export_selected_data, args=(selected_modules,)).start()
+            self._export_selected_data(selected_modules)
 
         def cancel_selection():
             selection_window.destroy()
 
         ttk.Button(button_frame, text="确认导出", command=confirm_selection, width=15).pack(side=tk.LEFT, padx=10)
         ttk.Button(button_frame, text="取消", command=cancel_selection, width=15).pack(side=tk.LEFT, padx=10)
+        
+        # 对话框中的ttk控件需要引用当前主题的样式
+        self.theme_manager.apply_theme_to_widget(selection_window)
 
     def _export_selected_data(self, selected_modules):
-        """导出选中的模块数据，支持多种格式"""
+        """导出选中的模块数据，支持多种格式
+        
+        在主线程中校验认证信息并读取界面参数，数据收集和文件写入在后台线程池中执行，
+        各阶段之间通过root.after回到主线程，提示框和文件对话框只在主线程中显示
+        """
+        cookie = self.get_cookie()
+        if not cookie:
+            messagebox.showerror("错误", "OpenID和Token不能为空，请在认证设置中填写")
+            return
+        
+        s_area = self.daily_area_var.get().strip() or "36"
+        stat_date = self.weekly_date_var.get().strip()
+        if not stat_date or len(stat_date) != 8:
+            stat_date = (datetime.now() - timedelta(days=(datetime.now().weekday() + 1) % 7)).strftime("%Y%m%d")
+        user_info = {
+            "openid": self.openid_var.get().strip(),
+            "acctype": self.acctype_var.get().strip(),
+            "战区": s_area,
+            "统计日期": stat_date
+        }
+        
+        # 请求参数都在主线程中读取，后台线程只发送请求，不接触界面变量
+        extra_params = {
+            "stat_date": stat_date,
+            "s_area": s_area,
+            "secret_source": self.secret_source_var.get().strip()
+        }
+        
+        self.set_status("正在导出选中的数据...")
+        # 导出在共享的后台线程池中执行，不再为每次导出单独创建线程
+        self._export_future = self._executor.submit(
+            self._collect_selected_data, selected_modules, user_info, cookie, extra_params)
+        self._export_future.add_done_callback(
+            lambda f: self.root.after(0, self._on_export_collected, f, selected_modules))
+    
+    def _on_export_collected(self, future, selected_modules):
+        """数据收集完成后在主线程中选择保存位置，再提交到后台线程写入文件"""
         try:
-            all_data = self._collect_selected_data(selected_modules)
-            if all_data:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                module_count = len(selected_modules)
-                
-                # 根据配置确定默认导出格式
-                default_format = self.config.get('export_format', 'json')
-                default_filename = f"三角洲行动_{module_count}个模块_{timestamp}.{default_format}"
-
-                # 定义支持的文件类型
-                filetypes = [
-                    ("JSON文件", "*.json"),
-                    ("CSV表格文件", "*.csv"),
-                    ("文本文件", "*.txt"),
-                    ("所有文件", "*.*")
-                ]
-
-                filename = filedialog.asksaveasfilename(
-                    defaultextension="." + default_format,
-                    filetypes=filetypes,
-                    title="导出选中数据",
-                    initialfile=default_filename
-                )
-
-                if filename:
-                    _, ext = os.path.splitext(filename)
-                    ext = ext.lower()
-                    
-                    # 根据不同格式导出数据
-                    if ext == '.json':
-                        # 原始的JSON格式导出
-                        with open(filename, "w", encoding="utf-8") as f:
-                            json.dump(all_data, f, ensure_ascii=False, indent=2)
-                    elif ext == '.csv':
-                        # 导出为CSV格式
-                        csv_content = self._convert_data_to_csv(all_data)
-                        with open(filename, "w", encoding="utf-8-sig") as f:
-                            f.write(csv_content)
-                    else:
-                        # 导出为文本格式
-                        text_content = self._convert_data_to_text(all_data)
-                        with open(filename, "w", encoding="utf-8") as f:
-                            f.write(text_content)
-                    
-                    self.set_status(f"选中数据已导出到: {filename}")
-                    messagebox.showinfo("成功", f"已导出 {module_count} 个模块的数据！\n文件: {filename}")
-                else:
-                    self.set_status("导出已取消")
-            else:
-                self.set_status("数据收集失败")
-                messagebox.showwarning("警告", "未能收集到任何数据，请检查认证信息是否正确")
-
+            all_data = future.result()
         except Exception as e:
             self.set_status("导出失败")
             messagebox.showerror("错误", f"导出过程中发生错误: {str(e)}")
+            return
+        
+        if not all_data:
+            self.set_status("数据收集失败")
+            messagebox.showwarning("警告", "未能收集到任何数据，请检查认证信息是否正确")
+            return
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        module_count = len(selected_modules)
+        
+        # 根据配置确定默认导出格式
+        default_format = self.config.get('export_format', 'json')
+        default_filename = f"三角洲行动_{module_count}个模块_{timestamp}.{default_format}"
+
+        # 定义支持的文件类型
+        filetypes = [
+            ("JSON文件", "*.json"),
+            ("CSV表格文件", "*.csv"),
+            ("文本文件", "*.txt"),
+            ("所有文件", "*.*")
+        ]
+
+        filename = filedialog.asksaveasfilename(
+            defaultextension="." + default_format,
+            filetypes=filetypes,
+            title="导出选中数据",
+            initialfile=default_filename
+        )
+
+        if not filename:
+            self.set_status("导出已取消")
+            return
+        
+        self._export_future = self._executor.submit(self._write_export_file, all_data, filename)
+        self._export_future.add_done_callback(
+            lambda f: self.root.after(0, self._on_export_written, f, filename, module_count))
+    
+    def _write_export_file(self, all_data, filename):
+        """在后台线程中按文件扩展名将导出数据写入文件"""
+        _, ext = os.path.splitext(filename)
+        ext = ext.lower()
+        
+        # 根据不同格式导出数据
+        if ext == '.json':
+            # 原始的JSON格式导出
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(all_data, f, ensure_ascii=False, indent=2)
+        elif ext == '.csv':
+            # 导出为CSV格式，newline=''避免Windows下出现空行
+            with open(filename, "w", encoding="utf-8-sig", newline='') as f:
+                self._write_csv(all_data, f)
+        else:
+            # 导出为文本格式
+            with open(filename, "w", encoding="utf-8") as f:
+                self._write_text(all_data, f)
     
-    def _convert_data_to_csv(self, data):
-        """将收集的数据转换为CSV格式"""
-        import csv
-        from io import StringIO
+    def _on_export_written(self, future, filename, module_count):
+        """文件写入完成后在主线程中提示导出结果"""
+        try:
+            future.result()
+        except Exception as e:
+            self.set_status("导出失败")
+            messagebox.showerror("错误", f"导出过程中发生错误: {str(e)}")
+            return
         
-        output = StringIO()
-        writer = csv.writer(output)
+        self.set_status(f"选中数据已导出到: {filename}")
+        messagebox.showinfo("成功", f"已导出 {module_count} 个模块的数据！\n文件: {filename}")
+    
+    def _write_csv(self, data, f):
+        """将收集的数据以CSV格式逐行写入文件，不在内存中拼接完整内容"""
+        writer = csv.writer(f)
         
         # 写入表头
         writer.writerow(["模块名称", "数据内容"])
@@ -1659,94 +2158,90 @@ class FHZDDataQueryTool:
                 content = str(module_data)
             
             writer.writerow([module_name, content])
-        
-        return output.getvalue()
     
-    def _convert_data_to_text(self, data):
-        """将收集的数据转换为文本格式"""
-        lines = []
-        
+    def _write_text(self, data, f):
+        """将收集的数据以文本格式逐行写入文件"""
+        separator = '=' * 50
         for module_name, module_data in data.items():
-            lines.append(f"\n{'='*50}")
-            lines.append(f"模块: {module_name}")
-            lines.append(f"{'='*50}")
+            f.write(f"\n{separator}\n")
+            f.write(f"模块: {module_name}\n")
+            f.write(f"{separator}\n")
             
             # 格式化数据
             if isinstance(module_data, dict):
                 for k, v in module_data.items():
-                    lines.append(f"{k}: {v}")
+                    f.write(f"{k}: {v}\n")
             elif isinstance(module_data, list):
                 for idx, item in enumerate(module_data, 1):
-                    lines.append(f"{idx}. {item}")
+                    f.write(f"{idx}. {item}\n")
             else:
-                lines.append(str(module_data))
-        
-        return '\n'.join(lines)
-
-    def _collect_selected_data(self, selected_modules):
-        """收集选中模块的格式化数据"""
-        cookie = self.get_cookie()
-        if not cookie:
-            messagebox.showerror("错误", "OpenID和Token不能为空，请在认证设置中填写")
-            return None
-
-        s_area = self.daily_area_var.get().strip() or "36"
-        stat_date = self.weekly_date_var.get().strip()
-        if not stat_date or len(stat_date) != 8:
-            stat_date = (datetime.now() - timedelta(days=(datetime.now().weekday() + 1) % 7)).strftime("%Y%m%d")
+                f.write(f"{module_data}\n")
 
+    def _collect_selected_data(self, selected_modules, user_info, cookie, extra_params):
+        """收集选中模块的格式化数据，在后台线程中执行，user_info、cookie和extra_params由主线程从界面读取"""
         all_data = {
             "导出时间": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "用户信息": {
-                "openid": self.openid_var.get().strip(),
-                "acctype": self.acctype_var.get().strip(),
-                "战区": s_area,
-                "统计日期": stat_date
-            },
+            "用户信息": user_info,
             "导出模块": selected_modules,
             "数据模块": {}
         }
 
-        # 获取额外参数
-        extra_params = {
-            "stat_date": stat_date,
-            "s_area": s_area
-        }
-
-        for module_name in selected_modules:
-            try:
-                self.set_status(f"正在获取: {module_name}...")
+        # 各模块的请求互不依赖，并发发送，总耗时取决于最慢的一个请求
+        # 并发数不超过连接池大小，避免线程等待空闲连接
+        max_workers = max(1, min(self.config.get('parallel_fetches', 8), 20, len(selected_modules)))
+        module_results = {}
+        self.set_status(f"正在获取 {len(selected_modules)} 个模块的数据...")
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for module_name in selected_modules:
                 module_def = self.module_definitions[module_name]
+                args = module_def["_arg_builder"](extra_params)
+                futures[pool.submit(self._fetch_module, module_def, cookie, args)] = module_name
 
-                # 准备参数
-                args = module_def["fetch_args"].copy()
-                if "extra_args" in module_def:
-                    for arg_name in module_def["extra_args"]:
-                        args.append(extra_params.get(arg_name, ""))
+            # 按完成顺序汇总各模块的数据
+            for future in as_completed(futures):
+                module_name = futures[future]
+                try:
+                    processed_data = future.result()
 
-                # 获取并处理数据
-                raw_data = module_def["fetch_func"](*args)
-                processed_data = module_def["process_func"](raw_data)
+                    module_results[module_name] = {
+                        "状态": "成功",
+                        "数据": processed_data
+                    }
+                except Exception as e:
+                    module_results[module_name] = {
+                        "状态": "失败",
+                        "错误信息": str(e)
+                    }
+                self.set_status(f"已获取: {module_name} ({len(module_results)}/{len(selected_modules)})")
 
-                all_data["数据模块"][module_name] = {
-                    "状态": "成功",
-                    "数据": processed_data
-                }
-            except Exception as e:
-                all_data["数据模块"][module_name] = {
-                    "状态": "失败",
-                    "错误信息": str(e)
-                }
+        # 保持与选择顺序一致的输出顺序
+        for module_name in selected_modules:
+            all_data["数据模块"][module_name] = module_results[module_name]
 
         self.set_status("数据收集完成，正在保存...")
         return all_data
+    
+    @staticmethod
+    def _make_arg_builder(module_def):
+        """生成模块的参数构造函数：固定参数预先转为元组，调用时返回追加了额外参数的完整参数元组"""
+        base = tuple(module_def["fetch_args"])
+        extras = tuple(module_def.get("extra_args", ()))
+        if not extras:
+            return lambda extra_params: base
+        return lambda extra_params: base + tuple(extra_params.get(name, "") for name in extras)
+    
+    @staticmethod
+    def _fetch_module(module_def, cookie, args):
+        """获取并处理单个模块的数据，在线程池中执行，各模块的数据处理也并行进行"""
+        return module_def["process_func"](module_def["fetch_func"](cookie, *args))
 
     # ==================== 查询功能实现 ====================
 
     def _parse_api_response(self, result):
         """通用API响应解析函数，处理不同格式的API返回数据"""
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             
             # 检查不同的响应格式
             if data.get('ret') != 0 or data.get('iRet') != 0:
@@ -1791,9 +2286,14 @@ class FHZDDataQueryTool:
                 - host: API主机地址
                 - display_func: 显示结果的函数
                 - success_status: 查询成功的状态消息
+        
+        在主线程中准备参数，API请求提交到后台线程池执行，完成后由_on_api_done在主线程处理结果。
+        返回请求是否已提交。
         """
-        # 初始化结果变量
-        success = False
+        # 请求提交后由_on_api_done负责恢复界面状态
+        submitted = False
+        # 标记只对本次查询有效，进入时立即清除，任何提前返回的路径都不会遗留
+        from_auto_refresh, self._awaiting_refresh_result = self._awaiting_refresh_result, False
         
         try:
             # 获取cookie
@@ -1806,7 +2306,7 @@ class FHZDDataQueryTool:
             # 获取查询参数
             try:
                 query_params = query_config['param_getter']()
-                self.logger.debug(f"获取查询参数成功: {query_params}")
+                self.logger.debug("获取查询参数成功: %s", query_params)
             except Exception as e:
                 error_msg = f"获取查询参数失败: {str(e)}"
                 self.logger.error(error_msg)
@@ -1830,10 +2330,7 @@ class FHZDDataQueryTool:
             # 显示加载状态
             try:
                 self.root.config(cursor="wait")
-                if hasattr(self, 'progress_bar'):
-                    self.progress_bar.grid()
-                    self.progress_var.set(20)
-                    self.root.update_idletasks()
+                self.update_progress(20)
             except Exception as e:
                 self.logger.error(f"更新UI状态失败: {str(e)}")
             
@@ -1841,11 +2338,8 @@ class FHZDDataQueryTool:
             try:
                 headers = {'Cookie': cookie}
                 params = query_config['param_builder'](query_params)
-                self.logger.debug(f"构建API参数成功: {params}")
-                
-                if hasattr(self, 'progress_var'):
-                    self.progress_var.set(50)
-                    self.root.update_idletasks()
+                self.logger.debug("构建API参数成功: %s", params)
+                self.update_progress(50)
             except Exception as e:
                 error_msg = f"构建API参数失败: {str(e)}"
                 self.logger.error(error_msg)
@@ -1853,162 +2347,238 @@ class FHZDDataQueryTool:
                 self.set_status("参数构建失败")
                 return False
             
-            # 执行API请求
+            # 相同的请求仍在进行中（如连续点击查询按钮）时不再重复发送，由进行中的请求显示结果
+            key = self._api_cache_key(query_config['host'], params)
+            if key in self._inflight:
+                self.logger.debug("相同的请求正在进行中，忽略重复查询")
+                self.set_status("查询进行中，请稍候...")
+                # 界面状态由进行中的请求完成后恢复
+                submitted = True
+                return True
+            
+            # 在后台线程执行API请求，完成后回到主线程处理结果
+            future = self._executor.submit(self._make_api_request, query_config['host'], params, headers)
+            self._inflight[key] = future
+            future.add_done_callback(
+                lambda f: self.root.after(0, self._on_api_done, f, query_config, query_params, key, from_auto_refresh))
+            submitted = True
+        except Exception as e:
+            # 捕获任何未预期的异常
+            error_msg = f"查询执行错误: {str(e)}"
+            self.logger.error(error_msg)
+            messagebox.showerror("错误", f"查询过程中发生未预期的错误: {str(e)}")
+            self.set_status("查询执行错误")
+        finally:
+            if not submitted:
+                self._finish_query_ui()
+        
+        return submitted
+    
+    def _on_api_done(self, future, query_config, query_params, key, from_auto_refresh=False):
+        """API请求完成后在主线程中处理结果，并恢复界面状态
+        
+        from_auto_refresh为True表示请求由自动刷新发起，请求失败或返回空结果时计入连续失败次数
+        """
+        self._inflight.pop(key, None)
+        try:
+            # 获取API请求结果
             try:
-                result = self._make_api_request(query_config['host'], params, headers)
-                
-                if hasattr(self, 'progress_var'):
-                    self.progress_var.set(80)
-                    self.root.update_idletasks()
+                result = future.result()
+                self.update_progress(80)
             except Exception as e:
+                if from_auto_refresh:
+                    self._note_auto_refresh_failure()
                 error_msg = f"API请求失败: {str(e)}"
                 self.logger.error(error_msg)
                 messagebox.showerror("网络错误", f"发送请求时发生错误: {str(e)}\n请检查网络连接或稍后重试")
                 self.set_status("请求失败")
-                return False
+                return
             
             # 处理结果
             if result:
+                if from_auto_refresh:
+                    self._auto_refresh_failures = 0
+                    self._note_refresh_result(result)
                 try:
-                    query_config['display_func'](result, query_params)
+                    try:
+                        query_config['display_func'](result, query_params)
+                    finally:
+                        # 显示函数会先清除再写入文本框，即使中途出错也标记为已写入，确保下次清除
+                        self._text_dirty = True
                     self.set_status(query_config['success_status'])
-                    self.logger.info(f"查询成功: {query_config['success_status']}")
+                    self.logger.info("查询成功: %s", query_config['success_status'])
                     
                     # 自动适应表格列宽
-                    if hasattr(self, 'result_tree') and hasattr(self, 'view_mode_var') and self.view_mode_var.get() == 'table':
-                        if hasattr(self, '_autofit_tree_columns'):
-                            try:
-                                self._autofit_tree_columns()
-                            except Exception as e:
-                                self.logger.warning(f"自动调整列宽失败: {str(e)}")
-                    success = True
+                    if self.result_tree is not None and self.view_mode_var.get() == 'table':
+                        try:
+                            self._autofit_tree_columns()
+                        except Exception as e:
+                            self.logger.warning(f"自动调整列宽失败: {str(e)}")
                 except Exception as e:
                     error_msg = f"处理查询结果失败: {str(e)}"
                     self.logger.error(error_msg)
                     messagebox.showerror("处理错误", f"处理查询结果时发生错误: {str(e)}")
                     self.set_status("结果处理失败")
             else:
+                if from_auto_refresh:
+                    self._note_auto_refresh_failure()
                 self.logger.warning("API返回空结果")
                 self.set_status("查询失败")
                 messagebox.showwarning("查询失败", "无法获取数据，请检查网络连接或稍后重试\n可能是服务器暂时不可用")
         except Exception as e:
             # 捕获任何未预期的异常
-            error_msg = f"查询执行错误: {str(e)}"
+            error_msg = f"处理查询结果时出错: {str(e)}"
             self.logger.error(error_msg)
             messagebox.showerror("错误", f"查询过程中发生未预期的错误: {str(e)}")
             self.set_status("查询执行错误")
         finally:
-            # 恢复界面状态
-            try:
-                self.root.config(cursor="")
-                if hasattr(self, 'progress_bar'):
-                    self.progress_var.set(0)
-                    self.progress_bar.grid_remove()
-                self._update_query_status(False)
-            except Exception as e:
-                self.logger.error(f"恢复界面状态失败: {str(e)}")
-                
-            if hasattr(self, 'progress_var'):
-                self.progress_var.set(100)
-                self.root.update_idletasks()
-                
-                # 延迟隐藏进度条，让用户看到完成状态
-                self.root.after(300, lambda: self.progress_bar.grid_remove() if hasattr(self, 'progress_bar') else None)
-            
-            self._update_query_status(False)
+            self._finish_query_ui()
+    
+    def _finish_query_ui(self):
+        """查询结束后恢复界面状态"""
+        # 恢复界面状态，进度条显示完成后延迟隐藏
+        try:
             self.root.config(cursor="")
-            
-        return success
-
-    def _query_daily_report(self):
-        """查询昨日日报数据"""
-        # 配置查询参数
-        query_config = {
-            'param_getter': lambda: {
-                'resource_type': self.daily_resource_var.get(),
-                's_area': self.daily_area_var.get().strip()
+            self._update_query_status(False)
+        except Exception as e:
+            self.logger.error(f"恢复界面状态失败: {str(e)}")
+
+    def _build_query_configs(self):
+        """生成各查询的配置，启动时只创建一次，每次查询直接复用
+        
+        每个配置包括：
+            - param_getter: 获取查询参数的函数
+            - validate_func: 验证参数的函数（可选）
+            - param_builder: 构建API参数的函数，固定参数取自模块级常量
+            - host: API主机地址
+            - display_func: 显示结果的函数
+            - success_status: 查询成功的状态消息
+        """
+        return {
+            'daily_report': {
+                'param_getter': lambda: {
+                    'resource_type': self.daily_resource_var.get(),
+                    's_area': self.daily_area_var.get().strip()
+                },
+                'param_builder': lambda p: {
+                    **_RECORD_CHART_PARAMS,
+                    'method': 'dfm/center.recent.detail',
+                    'source': '2',
+                    'sArea': p['s_area'],
+                    'param': json.dumps({'resourceType': p['resource_type']})
+                },
+                'host': _API_HOST,
+                'display_func': lambda r, p: self.display_daily_result(r, p['resource_type']),
+                'success_status': '昨日日报查询完成'
+            },
+            'special_duty': {
+                'param_getter': lambda: {},  # 无需额外参数
+                'param_builder': lambda p: _SPECIAL_DUTY_PARAMS,
+                'host': _API_HOST,
+                'display_func': lambda r, p: self.display_special_duty_result(r),
+                'success_status': '特勤处状态查询完成'
+            },
+            'weekly_report': {
+                'param_getter': lambda: {
+                    'stat_date': self.weekly_date_var.get().strip(),
+                    's_area': self.weekly_area_var.get().strip(),
+                    'mode': self.weekly_mode_var.get()
+                },
+                'validate_func': lambda p: self._validate_date_format(p['stat_date']),
+                'param_builder': lambda p: {
+                    **_RECORD_CHART_PARAMS,
+                    'method': f"dfm/weekly.{p['mode']}.record",
+                    'source': '5',
+                    'sArea': p['s_area'],
+                    'param': json.dumps({'statDate': p['stat_date']})
+                },
+                'host': _API_HOST,
+                'display_func': lambda r, p: self.display_weekly_result(r, p['mode']),
+                'success_status': '战场周报查询完成'
+            },
+            'secret': {
+                'param_getter': lambda: {
+                    'source': self.secret_source_var.get().strip()
+                },
+                'validate_func': lambda params: self._validate_not_empty(params['source'], "密码来源"),
+                'param_builder': lambda p: {
+                    **_RECORD_CHART_PARAMS,
+                    'method': 'dfm/center.day.secret',
+                    'source': p['source'],
+                    'param': '{}'
+                },
+                'host': _API_HOST,
+                'display_func': lambda r, p: self.display_secret_result(r),
+                'success_status': '每日密码查询完成'
             },
-            'param_builder': lambda p: {
-                'iChartId': '316969',
-                'iSubChartId': '316969',
-                'sIdeToken': 'NoOapI',
-                'method': 'dfm/center.recent.detail',
-                'source': '2',
-                'sArea': p['s_area'],
-                'param': json.dumps({'resourceType': p['resource_type']})
+            'friend_report': {
+                'param_getter': lambda: {
+                    'stat_date': self.friend_date_var.get().strip(),
+                    's_area': self.friend_area_var.get().strip(),
+                    'mode': self.friend_mode_var.get()
+                },
+                'validate_func': lambda p: self._validate_date_format(p['stat_date']),
+                'param_builder': lambda p: self._friend_record_params(
+                    f"dfm/weekly.{p['mode']}.friend.record", p['stat_date'], p['s_area']),
+                'host': _API_HOST,
+                'display_func': lambda r, p: self.display_friend_result(r, p['mode']),
+                'success_status': '周报队友查询完成'
             },
-            'host': 'comm.ams.game.qq.com',
-            'display_func': lambda r, p: self.display_daily_result(r, p['resource_type']),
-            'success_status': '昨日日报查询完成'
+            'fire_weekly_report': {
+                'param_getter': lambda: {
+                    'stat_date': self.fire_weekly_date_var.get().strip(),
+                    's_area': self.fire_weekly_area_var.get().strip()
+                },
+                'validate_func': lambda params: self._validate_date_format(params['stat_date']),
+                'param_builder': lambda p: self._friend_record_params(
+                    "dfm/weekly.sol.record", p['stat_date'], p['s_area']),
+                'host': _API_HOST,
+                'display_func': lambda r, p: self.display_fire_weekly_result(r),
+                'success_status': '烽火周报查询完成'
+            },
+            'currency': {
+                'param_getter': lambda: {
+                    'item': self.currency_type_var.get().strip()
+                },
+                'validate_func': lambda params: self._validate_not_empty(params['item'], "货币类型"),
+                'param_builder': lambda p: {
+                    **_CURRENCY_CHART_PARAMS,
+                    'item': p['item'],
+                    'type': '3'
+                },
+                'host': _API_HOST,
+                'display_func': lambda r, p: self.display_currency_result(r, p['item']),
+                'success_status': '货币资产查询完成'
+            }
         }
-        
-        self._perform_query(query_config)
+    
+    @staticmethod
+    def _friend_record_params(method, stat_date, s_area):
+        """构建周报队友和烽火周报接口的请求参数，两者只有method不同"""
+        return {
+            **_FRIEND_CHART_PARAMS,
+            'source': '5',
+            'sArea': s_area,
+            'method': method,
+            'statDate': stat_date,
+            'param': json.dumps({'source': '5', 'method': method, 'statDate': stat_date})
+        }
+
+    def _query_daily_report(self):
+        """查询昨日日报数据"""
+        self._perform_query(self._query_configs['daily_report'])
 
     def _query_special_duty(self):
         """查询特勤处状态"""
-        # 配置查询参数
-        query_config = {
-            'param_getter': lambda: {},  # 无需额外参数
-            'param_builder': lambda p: {
-                'iChartId': '365589',
-                'iSubChartId': '365589',
-                'sIdeToken': 'bQaMCQ',
-                'source': '2'
-            },
-            'host': 'comm.ams.game.qq.com',
-            'display_func': lambda r, p: self.display_special_duty_result(r),
-            'success_status': '特勤处状态查询完成'
-        }
-        
-        self._perform_query(query_config)
+        self._perform_query(self._query_configs['special_duty'])
 
     def _query_weekly_report(self):
         """查询战场周报数据"""
-        # 配置查询参数
-        query_config = {
-            'param_getter': lambda: {
-                'stat_date': self.weekly_date_var.get().strip(),
-                's_area': self.weekly_area_var.get().strip(),
-                'mode': self.weekly_mode_var.get()
-            },
-            'validate_func': lambda p: (not p['stat_date'] or len(p['stat_date']) != 8 or not p['stat_date'].isdigit()) and messagebox.showerror("错误", "统计日期格式不正确，应为YYYYMMDD格式的8位数字"),
-            'param_builder': lambda p: {
-                'iChartId': '316969',
-                'iSubChartId': '316969',
-                'sIdeToken': 'NoOapI',
-                'method': f"dfm/weekly.{p['mode']}.record",
-                'source': '5',
-                'sArea': p['s_area'],
-                'param': json.dumps({'statDate': p['stat_date']})
-            },
-            'host': 'comm.ams.game.qq.com',
-            'display_func': lambda r, p: self.display_weekly_result(r, p['mode']),
-            'success_status': '战场周报查询完成'
-        }
-        
-        self._perform_query(query_config)
+        self._perform_query(self._query_configs['weekly_report'])
 
     def _query_secret(self):
         """查询每日密码"""
-        query_config = {
-            'param_getter': lambda: {
-                'source': self.secret_source_var.get().strip()
-            },
-            'validate_func': lambda params: self._validate_not_empty(params['source'], "密码来源"),
-            'param_builder': lambda p: {
-                'iChartId': '316969',
-                'iSubChartId': '316969',
-                'sIdeToken': 'NoOapI',
-                'method': 'dfm/center.day.secret',
-                'source': p['source'],
-                'param': '{}'
-            },
-            'host': 'comm.ams.game.qq.com',
-            'display_func': lambda r, p: self.display_secret_result(r),
-            'success_status': '每日密码查询完成'
-        }
-        
-        self._perform_query(query_config)
+        self._perform_query(self._query_configs['secret'])
 
     def _validate_date_format(self, date_string):
         """验证日期格式是否为YYYYMMDD格式的8位数字
@@ -2041,120 +2611,63 @@ class FHZDDataQueryTool:
     
     def _query_friend_report(self):
         """查询周报队友数据"""
-        # 配置查询参数
-        query_config = {
-            'param_getter': lambda: {
-                'stat_date': self.friend_date_var.get().strip(),
-                's_area': self.friend_area_var.get().strip(),
-                'mode': self.friend_mode_var.get()
-            },
-            'validate_func': lambda p: self._validate_date_format(p['stat_date']),
-            'param_builder': lambda p: {
-                'iChartId': '316968',
-                'iSubChartId': '316968',
-                'sIdeToken': 'KfXJwH',
-                'source': '5',
-                'sArea': p['s_area'],
-                'method': f"dfm/weekly.{p['mode']}.friend.record",
-                'statDate': p['stat_date'],
-                'param': json.dumps({
-                    'source': '5',
-                    'method': f"dfm/weekly.{p['mode']}.friend.record",
-                    'statDate': p['stat_date']
-                })
-            },
-            'host': 'comm.ams.game.qq.com',
-            'display_func': lambda r, p: self.display_friend_result(r, p['mode']),
-            'success_status': '周报队友查询完成'
-        }
-        
-        self._perform_query(query_config)
+        self._perform_query(self._query_configs['friend_report'])
 
     def _query_fire_weekly_report(self):
         """查询烽火周报数据"""
-        query_config = {
-            'param_getter': lambda: {
-                'stat_date': self.fire_weekly_date_var.get().strip(),
-                's_area': self.fire_weekly_area_var.get().strip()
-            },
-            'validate_func': lambda params: self._validate_date_format(params['stat_date']),
-            'param_builder': lambda p: {
-                'iChartId': '316968',
-                'iSubChartId': '316968',
-                'sIdeToken': 'KfXJwH',
-                'source': '5',
-                'sArea': p['s_area'],
-                'method': "dfm/weekly.sol.record",
-                'statDate': p['stat_date'],
-                'param': json.dumps({
-                    'source': '5',
-                    'method': "dfm/weekly.sol.record",
-                    'statDate': p['stat_date']
-                })
-            },
-            'host': 'comm.ams.game.qq.com',
-            'display_func': lambda r, p: self.display_fire_weekly_result(r),
-            'success_status': '烽火周报查询完成'
-        }
-        
-        self._perform_query(query_config)
+        self._perform_query(self._query_configs['fire_weekly_report'])
 
     def _query_currency(self):
         """查询货币资产"""
-        query_config = {
-            'param_getter': lambda: {
-                'item': self.currency_type_var.get().strip()
-            },
-            'validate_func': lambda params: self._validate_not_empty(params['item'], "货币类型"),
-            'param_builder': lambda p: {
-                'iChartId': '319386',
-                'iSubChartId': '319386',
-                'sIdeToken': 'zMemOt',
-                'item': p['item'],
-                'type': '3'
-            },
-            'host': 'comm.ams.game.qq.com',
-            'display_func': lambda r, p: self.display_currency_result(r, p['item']),
-            'success_status': '货币资产查询完成'
-        }
-        
-        self._perform_query(query_config)
+        self._perform_query(self._query_configs['currency'])
 
     # ==================== 结果显示 ====================
 
-    def show_table(self, headers, data):
-        """通用表格显示方法"""
+    def show_table(self, headers, rows):
+        """通用表格显示方法
+        
+        参数:
+            headers: (列名, 列标题)对组成的元组，按显示顺序排列
+            rows: 数据行的可迭代对象（可为生成器），每行是与headers顺序一致的值元组
+        """
         # 清空表格
         self.tree.delete(*self.tree.get_children())
+        self._tree_dirty = True
         
         # 设置列
-        self.tree['columns'] = list(headers.keys())
+        self.tree['columns'] = tuple(col for col, _ in headers)
         
-        # 配置列标题和宽度
-        for col, title in headers.items():
+        # 配置列标题和宽度，每列一次column调用设置全部选项，并允许列自动调整大小
+        for col, title in headers:
             self.tree.heading(col, text=title)
-            self.tree.column(col, width=150, anchor='center')
-            # 允许列自动调整大小
-            self.tree.column(col, stretch=True, minwidth=100)
-        
-        # 添加数据行，实现斑马纹效果
-        for i, row in enumerate(data):
-            values = [row.get(col, '') for col in headers.keys()]
-            # 斑马纹效果：偶数行使用浅灰色背景
-            tags = ('evenrow',) if i % 2 == 1 else ()
-            self.tree.insert('', tk.END, values=values, tags=tags)
-        
-        # 配置斑马纹样式
-        self.tree.tag_configure('evenrow', background='#f0f0f0')
+            self.tree.column(col, width=150, anchor='center', stretch=True, minwidth=100)
         
-        # 添加鼠标悬停效果
-        self.tree.bind('<Enter>', lambda e, t=self.tree: t.bind('<Motion>', self._on_mouse_move))
-        self.tree.bind('<Leave>', lambda e, t=self.tree: t.unbind('<Motion>'))
+        # 数据行较多时只插入第一批，其余行在滚动到底部附近时再插入，因此全部行只在此处物化一次
+        self._table_rows = list(rows)
+        self._table_row_index = 0
+        self._insert_table_rows()
         
         # 切换显示模式：隐藏文本区域，显示表格
         self.result_text.grid_remove()
         self.table_frame.grid()
     
+    def _insert_table_rows(self):
+        """将下一批数据行插入表格，实现斑马纹效果"""
+        start = self._table_row_index
+        rows = self._table_rows[start:start + _TABLE_PAGE_ROWS]
+        # 斑马纹效果：偶数行使用浅灰色背景，按行号奇偶直接取预先构造的标签元组
+        row_tags = ((), ('evenrow',))
+        insert = self.tree.insert
+        for i, values in enumerate(rows, start):
+            insert('', tk.END, values=values, tags=row_tags[i & 1])
+        self._table_row_index = start + len(rows)
+    
+    def _on_tree_yscroll(self, first, last):
+        """表格滚动时更新滚动条，显示区域接近已插入行的底部时追加下一批行"""
+        self._table_vscroll.set(first, last)
+        if float(last) > 0.9 and self._table_row_index < len(self._table_rows):
+            self._insert_table_rows()
+    
     def display_special_duty_result(self, result):
         """使用表格显示特勤处状态结果"""
         try:
@@ -2162,7 +2675,8 @@ class FHZDDataQueryTool:
             # 保存当前查询结果
             self.current_query_result = result
             
-            data = json.loads(result)
+            data = _json_loads(result)
+            self._parsed_result = data
             jData = data.get("jData", {})
             place_data = jData.get("data", {}).get("data", {}).get("placeData", [])
 
@@ -2170,48 +2684,20 @@ class FHZDDataQueryTool:
                 self.result_text.insert(tk.END, "没有特勤处状态数据\n")
                 return
             
-            # 准备表格数据
-            table_data = []
-            for place in place_data:
-                name = place.get('Name', '未知')
-                status = place.get('Status', '未知')
-                level = place.get('Level', '未知')
-                left_time_seconds = place.get('leftTime', 0)
-                
-                if left_time_seconds > 0:
-                    hours = left_time_seconds // 3600
-                    minutes = (left_time_seconds % 3600) // 60
-                    seconds = left_time_seconds % 60
-                    formatted_time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                else:
-                    formatted_time = "已完成"
-                
-                table_data.append({
-                    'name': name,
-                    'status': status,
-                    'level': level,
-                    'remain_time': formatted_time
-                })
-            
-            # 定义表头
-            headers = {
-                'name': '名称',
-                'status': '状态',
-                'level': '等级',
-                'remain_time': '剩余时间'
-            }
-            
-            # 使用表格显示
-            self.show_table(headers, table_data)
+            # 使用表格显示，数据行由生成器直接交给show_table，不再先构造中间列表
+            self.show_table(_SPECIAL_DUTY_HEADERS, (
+                (place.get('Name', '未知'), place.get('Status', '未知'), place.get('Level', '未知'),
+                 _format_left_time(place.get('leftTime', 0)))
+                for place in place_data
+            ))
             
             # 根据当前视图模式设置显示
-            if hasattr(self, 'current_view_mode'):
-                if self.current_view_mode == 'table':
-                    # 表格模式，自动调整列宽
-                    self._autofit_tree_columns()
-                else:
-                    # 文本模式，格式化文本显示
-                    self._format_text_display()
+            if self.current_view_mode == 'table':
+                # 表格模式，自动调整列宽
+                self._autofit_tree_columns()
+            else:
+                # 文本模式，格式化文本显示
+                self._format_text_display()
         except Exception as e:
             error_msg = f"解析结果时发生错误: {str(e)}"
             self.result_text.insert(tk.END, error_msg)
@@ -2220,313 +2706,239 @@ class FHZDDataQueryTool:
 
     def display_daily_result(self, result, resource_type):
         self.clear_results()
-        resource_name = "烽火地带" if resource_type == "sol" else "全面战场"
-        self.result_text.insert(tk.END, f"=== {resource_name}昨日日报 ===\n\n")
+        # 输出先收集到列表中，结束时拼接后一次插入文本框
+        lines = [_DAILY_TITLES.get(resource_type, _DAILY_TITLES['mp'])]
+        add = lines.append
 
         try:
             success, actual_data = self._parse_api_response(result)
             if not success:
-                self.result_text.insert(tk.END, f"查询失败: {actual_data}\n")
+                add(f"查询失败: {actual_data}\n")
                 return
             
             if not actual_data:
-                self.result_text.insert(tk.END, "无有效数据返回\n")
+                add("无有效数据返回\n")
                 return
 
             if resource_type == "sol":
                 report_data = actual_data.get('solDetail', {})
                 if not report_data:
-                    self.result_text.insert(tk.END, "无烽火地带日报数据\n")
+                    add("无烽火地带日报数据\n")
                     return
 
-                self.result_text.insert(tk.END, f"报告日期: {report_data.get('recentGainDate', '未知')}\n")
-                self.result_text.insert(tk.END, f"昨日收益: {report_data.get('recentGain', 0):,} 金币\n\n")
+                add(f"报告日期: {report_data.get('recentGainDate', '未知')}\n")
+                add(f"昨日收益: {report_data.get('recentGain', 0):,} 金币\n\n")
 
                 user_collection = report_data.get('userCollectionTop', {})
                 top_items = user_collection.get('list', []) if isinstance(user_collection, dict) else []
 
                 if top_items:
-                    self.result_text.insert(tk.END, "=== 收益Top3物品 ===\n\n")
+                    add("=== 收益Top3物品 ===\n\n")
+                    get_item_name = self.get_item_name
                     for i, item in enumerate(top_items, 1):
                         item_id = item.get('objectID', '未知')
-                        item_name = self.get_item_name(item_id)
-                        self.result_text.insert(tk.END, f"{i}. 物品: {item_name} (ID: {item_id})\n")
-                        self.result_text.insert(tk.END, f"   带出数量: {item.get('count', 0)}\n")
-                        self.result_text.insert(tk.END, f"   物品价值: {float(item.get('price', 0)):,.1f} 金币\n\n")
+                        item_name = get_item_name(item_id)
+                        add(f"{i}. 物品: {item_name} (ID: {item_id})\n"
+                            f"   带出数量: {item.get('count', 0)}\n"
+                            f"   物品价值: {float(item.get('price', 0)):,.1f} 金币\n\n")
                 else:
-                    self.result_text.insert(tk.END, "无收益Top3物品数据\n\n")
+                    add("无收益Top3物品数据\n\n")
 
                 current_time = actual_data.get('currentTime', '未知')
-                self.result_text.insert(tk.END, f"报告生成时间: {current_time}\n")
+                add(f"报告生成时间: {current_time}\n")
             else:
                 mp_data = actual_data.get('mpDetail', {})
                 if mp_data:
-                    self.result_text.insert(tk.END, "=== 全面战场数据 ===\n\n")
-                    self.result_text.insert(tk.END, f"总得分: {mp_data.get('totalScore', 0):,}\n")
-                    self.result_text.insert(tk.END, f"总击杀: {mp_data.get('totalKill', 0):,}\n")
-                    self.result_text.insert(tk.END, f"总死亡: {mp_data.get('totalDeath', 0):,}\n")
-                    self.result_text.insert(tk.END, f"胜场: {mp_data.get('winNum', 0):,}\n")
-                    self.result_text.insert(tk.END, f"总场次: {mp_data.get('totalNum', 0):,}\n")
+                    add("=== 全面战场数据 ===\n\n"
+                        f"总得分: {mp_data.get('totalScore', 0):,}\n"
+                        f"总击杀: {mp_data.get('totalKill', 0):,}\n"
+                        f"总死亡: {mp_data.get('totalDeath', 0):,}\n"
+                        f"胜场: {mp_data.get('winNum', 0):,}\n"
+                        f"总场次: {mp_data.get('totalNum', 0):,}\n")
                 else:
-                    self.result_text.insert(tk.END, "无全面战场数据\n")
+                    add("无全面战场数据\n")
 
         except json.JSONDecodeError:
-            self.result_text.insert(tk.END, "JSON解析错误，原始响应:\n\n")
-            self.result_text.insert(tk.END, result)
+            add("JSON解析错误，原始响应:\n\n")
+            add(result)
         except Exception as e:
-            self.result_text.insert(tk.END, f"处理数据时发生错误: {str(e)}\n")
+            add(f"处理数据时发生错误: {str(e)}\n")
+        finally:
+            self.result_text.insert(tk.END, "".join(lines))
 
     def display_weekly_result(self, result, mode):
         self.clear_results()
-        mode_name = "烽火地带" if mode == "sol" else "全面战场"
-        self.result_text.insert(tk.END, f"=== {mode_name}战场周报 ===\n\n")
+        # 输出先收集到列表中，结束时拼接后一次插入文本框
+        lines = [_WEEKLY_TITLES.get(mode, _WEEKLY_TITLES['mp'])]
+        add = lines.append
 
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
 
             if data.get('ret') != 0 or data.get('iRet') != 0:
-                self.result_text.insert(tk.END, f"请求失败: {data.get('sMsg', '未知错误')}\n")
+                add(f"请求失败: {data.get('sMsg', '未知错误')}\n")
                 return
 
             jdata = data.get('jData', {}).get('data', {})
 
             if jdata.get('code') != 0:
-                self.result_text.insert(tk.END, f"数据获取失败: {jdata.get('message', '未知错误')}\n")
+                add(f"数据获取失败: {jdata.get('message', '未知错误')}\n")
                 return
 
             weekly_data = jdata.get('data', {})
 
             if isinstance(weekly_data, list) and len(weekly_data) == 0:
-                self.result_text.insert(tk.END, "本周无战场周报数据\n")
+                add("本周无战场周报数据\n")
                 return
 
-            fields = {
-                'Consume_Bullet_Num': '总消耗弹药数',
-                'Hit_Bullet_Num': '总命中子弹数',
-                'Kill_Num': '总击杀数',
-                'Kill_type1_Num': '载具击杀数量',
-                'Rank_Match_Score': '排位分',
-                'Rescue_Campmate_Count': '救援阵营队友数',
-                'Rescue_Teammate_Count': '救援小队队友数',
-                'SBattle_Support_CostScore': '局内支援呼叫消耗分数',
-                'SBattle_Support_UseNum': '局内支援呼叫次数',
-                'Teammate_Reborn_Num': '队友重生次数',
-                'Used_Time': '使用次数',
-                'by_Rescue_num': '被救援次数',
-                'continuous_Kill_Num': '最高连续击杀',
-                'total_Occupy': '占点数',
-                'total_gametime': '总游戏时长(秒)',
-                'total_num': '对局场次',
-                'total_score': '总得分',
-                'win_num': '胜场',
-                'DeployArmedForceType_KillNum': '本命干员完成击杀',
-                'DeployArmedForceType_gametime': '本命干员游戏时长(秒)',
-                'DeployArmedForceType_inum': '本命干员完成对局',
-                'max_inum_DeployArmedForceType': '本命干员ID',
-                'max_inum_mapid': '地图信息'
-            }
-
-            for field, description in fields.items():
-                value = weekly_data.get(field, '无数据')
-                if value != '无数据' and isinstance(value, (int, float, str)) and str(value).replace('.', '', 1).isdigit():
-                    try:
-                        if '.' in str(value):
-                            value = f"{float(value):,.1f}"
-                        else:
-                            value = f"{int(value):,}"
-                    except:
-                        pass
-                self.result_text.insert(tk.END, f"{description}: {value}\n")
+            lines.extend(f"{description}: {_format_stat_value(weekly_data.get(field, '无数据'))}\n"
+                         for field, description in _WEEKLY_FIELDS)
 
         except json.JSONDecodeError:
-            self.result_text.insert(tk.END, "原始响应:\n\n")
-            self.result_text.insert(tk.END, result)
+            add("原始响应:\n\n")
+            add(result)
+        finally:
+            self.result_text.insert(tk.END, "".join(lines))
 
     def display_friend_result(self, result, mode):
         self.clear_results()
         # 确保使用文本视图显示
-        if hasattr(self, '_switch_view_mode'):
-            self._switch_view_mode('text')
-        mode_name = "烽火地带" if mode == "sol" else "全面战场"
-        self.result_text.insert(tk.END, f"=== {mode_name}周报队友数据 ===\n\n")
+        self._switch_view_mode('text')
+        # 输出先收集到列表中，结束时拼接后一次插入文本框
+        lines = [_FRIEND_TITLES.get(mode, _FRIEND_TITLES['mp'])]
+        add = lines.append
 
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
 
             if data.get('ret') != 0 or data.get('iRet') != 0:
-                self.result_text.insert(tk.END, f"请求失败: {data.get('sMsg', '未知错误')}\n")
+                add(f"请求失败: {data.get('sMsg', '未知错误')}\n")
                 return
 
             jdata = data.get('jData', {}).get('data', {})
 
             if jdata.get('code') != 0:
-                self.result_text.insert(tk.END, f"数据获取失败: {jdata.get('message', '未知错误')}\n")
+                add(f"数据获取失败: {jdata.get('message', '未知错误')}\n")
                 return
 
             friends_data = jdata.get('data', {}).get('friends_sol_record', [])
 
             if not friends_data:
-                self.result_text.insert(tk.END, "无队友数据\n")
+                add("无队友数据\n")
                 return
 
-            self.result_text.insert(tk.END, f"共找到 {len(friends_data)} 位队友\n\n")
+            add(f"共找到 {len(friends_data)} 位队友\n\n")
 
             for i, friend in enumerate(friends_data, 1):
-                self.result_text.insert(tk.END, f"=== 队友 {i} ===\n")
-                self.result_text.insert(tk.END, f"OpenID: {friend.get('friend_openid', '未知')}\n")
-
-                friend_fields = {
-                    'Friend_total_sol_num': '总场次',
-                    'Friend_is_Escape1_num': '撤离成功',
-                    'Friend_is_Escape2_num': '撤离失败',
-                    'Friend_Sum_Gained_Price': '总带出价值',
-                    'Friend_Max_Gained_Price': '最高带出价值',
-                    'Friend_consume_Price': '总战损',
-                    'Friend_total_sol_KillPlayer': '击杀玩家数',
-                    'Friend_total_sol_DeathCount': '死亡次数',
-                    'Friend_total_sol_AssistCnt': '救援次数'
-                }
+                get_field = friend.get
+                add(f"=== 队友 {i} ===\n")
+                add(f"OpenID: {get_field('friend_openid', '未知')}\n")
 
-                for field, desc in friend_fields.items():
-                    value = friend.get(field, 0)
+                for field, desc in _FRIEND_FIELDS:
+                    value = get_field(field, 0)
                     if isinstance(value, (int, float)):
                         value = f"{value:,}"
-                    self.result_text.insert(tk.END, f"{desc}: {value}\n")
+                    add(f"{desc}: {value}\n")
 
-                self.result_text.insert(tk.END, "\n")
+                add("\n")
 
         except json.JSONDecodeError:
-            self.result_text.insert(tk.END, "原始响应:\n\n")
-            self.result_text.insert(tk.END, result)
+            add("原始响应:\n\n")
+            add(result)
+        finally:
+            self.result_text.insert(tk.END, "".join(lines))
 
     def display_fire_weekly_result(self, result):
         self.clear_results()
         # 确保使用文本视图显示
-        if hasattr(self, '_switch_view_mode'):
-            self._switch_view_mode('text')
-        self.result_text.insert(tk.END, "=== 烽火周报数据 ===\n\n")
+        self._switch_view_mode('text')
+        # 输出先收集到列表中，结束时拼接后一次插入文本框
+        lines = ["=== 烽火周报数据 ===\n\n"]
+        add = lines.append
 
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
 
             if data.get('ret') != 0 or data.get('iRet') != 0:
-                self.result_text.insert(tk.END, f"请求失败: {data.get('sMsg', '未知错误')}\n")
+                add(f"请求失败: {data.get('sMsg', '未知错误')}\n")
                 return
 
             jdata = data.get('jData', {}).get('data', {})
 
             if jdata.get('code') != 0:
-                self.result_text.insert(tk.END, f"数据获取失败: {jdata.get('message', '未知错误')}\n")
+                add(f"数据获取失败: {jdata.get('message', '未知错误')}\n")
                 return
 
             fire_weekly_data = jdata.get('data', {})
 
             if not fire_weekly_data:
-                self.result_text.insert(tk.END, "无烽火周报数据\n")
+                add("无烽火周报数据\n")
                 return
 
-            fields = {
-                'Gained_Price': '本周总带出哈夫币',
-                'consume_Price': '本周总带入',
-                'rise_Price': '本周总利润',
-                'total_sol_num': '本周对局数',
-                'total_exacuation_num': '本周撤离成功数',
-                'total_Kill_Player': '本周击败干员数',
-                'total_Kill_AI': '本周击杀AI数',
-                'total_Kill_Boss': '本周击杀BOSS数',
-                'total_Death_Count': '本周死亡数',
-                'GainedPrice_overmillion_num': '本周百万撤离场次',
-                'total_Online_Time': '本周在线时长(秒)',
-                'Rank_Score': '排位分数',
-                'Mandel_brick_num': '本周曼德尔砖破译数',
-            }
-
-            for field, description in fields.items():
-                value = fire_weekly_data.get(field, '无数据')
-                if value != '无数据' and isinstance(value, (int, float, str)) and str(value).replace('.', '', 1).isdigit():
-                    try:
-                        if '.' in str(value):
-                            value = f"{float(value):,.1f}"
-                        else:
-                            value = f"{int(value):,}"
-                    except:
-                        pass
-                self.result_text.insert(tk.END, f"{description}: {value}\n")
+            lines.extend(f"{description}: {_format_stat_value(fire_weekly_data.get(field, '无数据'))}\n"
+                         for field, description in _FIRE_WEEKLY_FIELDS)
 
             operator_data = fire_weekly_data.get('total_ArmedForceId_num', '')
             if operator_data:
-                self.result_text.insert(tk.END, f"\n=== 干员使用情况 ===\n")
+                add(f"\n=== 干员使用情况 ===\n")
                 try:
                     if isinstance(operator_data, str) and '#' in operator_data:
-                        operator_dict = {}
-                        for op_str in operator_data.split('#'):
-                            if op_str.strip():
-                                try:
-                                    op_item = parse_dict_like_string(op_str.strip())
-                                    op_id = str(op_item.get('ArmedForceId', ''))
-                                    op_count = int(op_item.get('inum', 0))
-                                    if op_id:
-                                        operator_dict[op_id] = operator_dict.get(op_id, 0) + op_count
-                                except:
-                                    continue
-
-                        if operator_dict:
-                            total_uses = sum(operator_dict.values())
-                            for op_id, op_count in sorted(operator_dict.items(), key=lambda x: int(x[1]), reverse=True):
-                                op_name = self.operator_map.get(op_id, f"未知干员({op_id})")
-                                percentage = (int(op_count) / total_uses * 100) if total_uses > 0 else 0
-                                self.result_text.insert(tk.END, f"  {op_name}: {op_count}次 ({percentage:.1f}%)\n")
+                        operator_counts = _aggregate_operators(operator_data)
+
+                        if operator_counts:
+                            total_uses = sum(op_count for _, op_count in operator_counts)
+                            get_operator_name = self.operator_map.get
+                            for op_id, op_count in operator_counts:
+                                op_name = get_operator_name(op_id) or f"未知干员({op_id})"
+                                percentage = (op_count / total_uses * 100) if total_uses > 0 else 0
+                                add(f"  {op_name}: {op_count}次 ({percentage:.1f}%)\n")
                         else:
-                            self.result_text.insert(tk.END, f"  无有效干员数据\n")
+                            add(f"  无有效干员数据\n")
                     else:
-                        self.result_text.insert(tk.END, f"  数据格式异常: {operator_data}\n")
+                        add(f"  数据格式异常: {operator_data}\n")
                 except Exception as e:
-                    self.result_text.insert(tk.END, f"  解析失败: {str(e)}\n")
+                    add(f"  解析失败: {str(e)}\n")
 
             highprice_list_str = fire_weekly_data.get('CarryOut_highprice_list', '')
             if highprice_list_str:
-                self.result_text.insert(tk.END, f"\n=== 高价值物品列表 ===\n")
+                add(f"\n=== 高价值物品列表 ===\n")
                 try:
                     if isinstance(highprice_list_str, str) and '#' in highprice_list_str:
-                        items = []
-                        for item_str in highprice_list_str.split('#'):
-                            if item_str.strip():
-                                try:
-                                    item_dict = parse_dict_like_string(item_str.strip())
-                                    items.append(item_dict)
-                                except:
-                                    continue
+                        items = _parse_records(highprice_list_str)
 
                         if items:
                             total_items = len(items)
-                            self.result_text.insert(tk.END, f"  共 {total_items} 件物品\n\n")
-                            sorted_items = sorted(items, key=lambda x: float(x.get('iPrice', 0)), reverse=True)
+                            add(f"  共 {total_items} 件物品\n\n")
+                            # 价格只转换一次，排序和显示共用
+                            sorted_items = sorted([(float(item.get('iPrice', 0)), item) for item in items],
+                                                  key=itemgetter(0), reverse=True)
 
-                            for i, item in enumerate(sorted_items, 1):
+                            get_item_name = self.get_item_name
+                            for i, (price, item) in enumerate(sorted_items, 1):
                                 item_id = item.get('itemid', '未知')
-                                item_name = self.get_item_name(item_id)
+                                item_name = get_item_name(item_id)
                                 item_type = item.get('auctontype', '未知类型')
                                 item_subtype = item.get('auctonsubtype', '')
                                 quality = item.get('quality', 0)
-                                price = float(item.get('iPrice', 0))
                                 count = int(item.get('inum', 1))
 
-                                self.result_text.insert(tk.END, f"  {i}. {item_name} (ID: {item_id})\n")
-                                self.result_text.insert(tk.END, f"     类型: {item_type} - {item_subtype}\n")
-                                self.result_text.insert(tk.END,
-                                                        f"     品质: {quality}级 | 数量: {count} | 总价值: {price:,.0f}哈夫币\n\n")
+                                add(f"  {i}. {item_name} (ID: {item_id})\n"
+                                    f"     类型: {item_type} - {item_subtype}\n"
+                                    f"     品质: {quality}级 | 数量: {count} | 总价值: {price:,.0f}哈夫币\n\n")
                         else:
-                            self.result_text.insert(tk.END, f"  无有效物品数据\n")
+                            add(f"  无有效物品数据\n")
                     else:
-                        self.result_text.insert(tk.END, f"  - {str(highprice_list_str)}\n")
+                        add(f"  - {str(highprice_list_str)}\n")
                 except Exception as e:
-                    self.result_text.insert(tk.END, f"  解析失败: {str(e)}\n")
+                    add(f"  解析失败: {str(e)}\n")
 
         except json.JSONDecodeError:
-            self.result_text.insert(tk.END, "原始响应:\n\n")
-            self.result_text.insert(tk.END, result)
+            add("原始响应:\n\n")
+            add(result)
         except Exception as e:
-            self.result_text.insert(tk.END, f"处理数据时发生错误: {str(e)}\n")
+            add(f"处理数据时发生错误: {str(e)}\n")
+        finally:
+            self.result_text.insert(tk.END, "".join(lines))
 
     def display_currency_result(self, result, item_type):
         """使用表格显示货币资产数据"""
@@ -2538,7 +2950,7 @@ class FHZDDataQueryTool:
         }.get(item_type, '未知货币')
 
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
 
             if data.get('ret') != 0 or data.get('iRet') != 0:
                 self.result_text.insert(tk.END, f"请求失败: {data.get('sMsg', '未知错误')}\n")
@@ -2554,30 +2966,16 @@ class FHZDDataQueryTool:
             total_money = currency_data.get('totalMoney', '0')
             
             # 准备表格数据
-            table_data = [{
-                'currency_type': currency_name,
-                'amount': f"{int(total_money):,}",
-                'description': '当前可用数量'
-            }]
+            table_rows = [(currency_name, f"{int(total_money):,}", '当前可用数量')]
             
             # 添加详细信息（如果有）
             if 'details' in currency_data:
+                detail_name = f"{currency_name}明细"
                 for detail in currency_data['details']:
-                    table_data.append({
-                        'currency_type': f"{currency_name}明细",
-                        'amount': str(detail.get('amount', 0)),
-                        'description': detail.get('source', '未知来源')
-                    })
-            
-            # 定义表头
-            headers = {
-                'currency_type': '货币类型',
-                'amount': '数量',
-                'description': '说明'
-            }
+                    table_rows.append((detail_name, str(detail.get('amount', 0)), detail.get('source', '未知来源')))
             
             # 使用表格显示
-            self.show_table(headers, table_data)
+            self.show_table(_CURRENCY_HEADERS, table_rows)
 
         except json.JSONDecodeError:
             self.result_text.insert(tk.END, "原始响应:\n\n")
@@ -2586,30 +2984,27 @@ class FHZDDataQueryTool:
     def display_secret_result(self, result, *args):
         try:
             self.clear_results()
-            data = json.loads(result)
+            data = _json_loads(result)
             jdata = data.get('jData', {})
             secret_data = jdata.get('data', {})
 
             if secret_data.get('code') == 0:
                 secret_list = secret_data.get('data', {}).get('list', [])
 
-                result_text = "每日密码查询结果：\n"
-                result_text += "=" * 50 + "\n"
+                # 输出先收集到列表中，结束时拼接后一次插入文本框（clear_results已清空文本框）
+                lines = ["每日密码查询结果：\n", "=" * 50 + "\n"]
+                separator = "-" * 30 + "\n"
 
                 for secret_info in secret_list:
-                    map_id = secret_info.get('mapID', '')
-                    map_name = secret_info.get('mapName', '')
-                    password = secret_info.get('secret', '')
-
-                    result_text += f"地图ID: {map_id}\n"
-                    result_text += f"地图名称: {map_name}\n"
-                    result_text += f"密码: {password}\n"
-                    result_text += "-" * 30 + "\n"
-
-                self.result_text.delete(1.0, tk.END)
-                self.result_text.insert(tk.END, result_text)
+                    lines.extend((
+                        f"地图ID: {secret_info.get('mapID', '')}\n",
+                        f"地图名称: {secret_info.get('mapName', '')}\n",
+                        f"密码: {secret_info.get('secret', '')}\n",
+                        separator,
+                    ))
+
+                self.result_text.insert(tk.END, ''.join(lines))
             else:
-                self.result_text.delete(1.0, tk.END)
                 self.result_text.insert(tk.END, f"查询失败: {secret_data.get('msg', '未知错误')}")
 
         except Exception as e:
@@ -2619,7 +3014,7 @@ class FHZDDataQueryTool:
     def clear_results(self):
         """清除结果并重置视图，使用批量操作优化性能"""
         # 批量删除表格数据
-        if hasattr(self, 'tree'):
+        if self.tree is not None and self._tree_dirty:
             children = self.tree.get_children()
             if children:
                 self.tree.delete(*children)
@@ -2628,113 +3023,108 @@ class FHZDDataQueryTool:
             for col in self.tree['columns']:
                 self.tree.heading(col, text='')
             self.tree['columns'] = ()
+            
+            # 清空待插入的数据行
+            self._table_rows = []
+            self._table_row_index = 0
+            self._tree_dirty = False
         
         # 清空文本内容
-        if hasattr(self, 'result_text'):
+        if self.result_text is not None and self._text_dirty:
             self.result_text.delete(1.0, tk.END)
+            self._text_dirty = False
         
         # 保留当前视图模式
-        if hasattr(self, 'result_text') and hasattr(self, 'table_frame'):
-            if self.current_view_mode == 'table' and hasattr(self, 'table_frame'):
+        if self.result_text is not None and self.table_frame is not None:
+            if self.current_view_mode == 'table':
                 self.result_text.grid_remove()
                 self.table_frame.grid()
             else:
                 self.table_frame.grid_remove()
                 self.result_text.grid()
         
-        # 重置当前查询结果
+        # 重置当前查询结果及其解析结果、格式化文本
         self.current_query_result = None
+        self._parsed_result = None
+        self._formatted_source = None
+        self._formatted_text = None
     
     def _on_tab_changed(self, event=None):
         """处理标签页切换事件"""
-        if hasattr(self, 'notebook'):
+        if self.notebook is not None:
             try:
                 current_tab = self.notebook.select()
                 self.current_tab_index = self.notebook.index(current_tab)
             except:
                 self.current_tab_index = 0
+            self._ensure_tab_built(self.current_tab_index)
+    
+    def _ensure_tab_built(self, index):
+        """首次显示标签页时构建其控件，并只对新建的控件应用主题"""
+        if index in self._built_tabs or index not in self._tab_builders:
+            return
+        frame, builder = self._tab_builders[index]
+        builder(frame)
+        self._built_tabs.add(index)
+        for child in frame.winfo_children():
+            self.theme_manager.apply_theme_to_widget(child)
     
     def _on_closing(self):
-        """窗口关闭确认函数"""
-        if messagebox.askyesno("确认退出", "确定要退出烽火地带数据查询工具吗？"):
+        """窗口关闭确认函数，配置中关闭了退出确认时不弹出对话框直接退出"""
+        if not self.config.get('confirm_exit', True) or messagebox.askyesno("确认退出", "确定要退出烽火地带数据查询工具吗？"):
+            # 取消尚未触发的自动刷新，避免窗口销毁后回调仍被调用
+            if self.auto_refresh_timer:
+                self.root.after_cancel(self.auto_refresh_timer)
+                self.auto_refresh_timer = None
+            self._executor.shutdown(wait=False)
+            # 等待尚未完成的配置写入：写入线程不接触Tk，主线程在此等待不会互相阻塞
+            self._config_executor.shutdown(wait=True)
+            self.http.close()
             self.root.destroy()
     
     def _autofit_tree_columns(self):
         """自动调整表格列宽以适应内容，同时处理多种表格对象"""
         # 配置悬停样式
-        if hasattr(self, 'tree'):
+        if self.tree is not None:
             self.tree.tag_configure('hover', background='#e0e0ff')
-        if hasattr(self, 'result_tree'):
+        if self.result_tree is not None:
             self.result_tree.tag_configure('hover', background='#e0e0ff')
         
         # 处理self.tree表格
-        if hasattr(self, 'tree'):
+        if self.tree is not None:
             self._autofit_specific_tree(self.tree)
         
         # 处理self.result_tree表格
-        if hasattr(self, 'result_tree'):
+        if self.result_tree is not None:
             self._autofit_specific_tree(self.result_tree)
     
     def _autofit_specific_tree(self, tree_widget):
         """自动调整特定Treeview组件的列宽
         
+        按单元格文本长度估算列宽，不再逐个单元格调用bbox；主表格直接使用内存中的全部数据行，
+        其余表格每行只读取一次值
+        
         参数:
             tree_widget: 要调整的Treeview组件
         """
         # 获取配置的最大列宽（可从配置中读取或使用默认值）
         max_col_width = self.config.get('max_column_width', 500)
         
-        # 为每一列调整宽度
-        for col in tree_widget['columns']:
-            # 首先设置一个合理的初始宽度
-            tree_widget.column(col, width=120)
+        if tree_widget is self.tree:
+            rows = self._table_rows
+        else:
+            item = tree_widget.item
+            rows = [item(row_id, 'values') for row_id in tree_widget.get_children()]
+        
+        for idx, col in enumerate(tree_widget['columns']):
+            # 至少显示完整的列名和列标题
+            header_text = tree_widget.heading(col, 'text') or col
+            cell_len = max((len(str(row[idx])) for row in rows if idx < len(row)), default=0)
+            max_len = max(len(col), len(header_text), cell_len)
             
-            try:
-                # 尝试使用bbox方法获取实际渲染宽度（更准确）
-                # 先尝试获取列标题宽度
-                header_width = 0
-                try:
-                    # 注意：bbox可能在某些环境中不可靠
-                    header_width = tree_widget.bbox('@0,0', col)[2] if tree_widget.bbox('@0,0', col) else 0
-                except:
-                    # 如果获取失败，使用文字长度估算
-                    header_text = tree_widget.heading(col).get('text', col)
-                    header_width = len(header_text) * 10
-                
-                # 获取该列所有项的最大宽度
-                max_width = max(header_width, len(col) * 10)  # 至少显示完整的列名
-                
-                # 遍历所有行计算最大宽度
-                for item in tree_widget.get_children():
-                    try:
-                        # 尝试使用bbox获取实际宽度
-                        cell_width = 0
-                        try:
-                            cell_bbox = tree_widget.bbox(item, col)
-                            cell_width = cell_bbox[2] if cell_bbox else 0
-                        except:
-                            # 如果bbox不可用，使用字符串长度估算
-                            index = tree_widget['columns'].index(col)
-                            value = str(tree_widget.item(item, 'values')[index]) if index < len(tree_widget.item(item, 'values')) else ''
-                            cell_width = len(value) * 9
-                        
-                        if cell_width > max_width:
-                            max_width = cell_width
-                    except Exception as e:
-                        # 忽略单个单元格的错误，继续处理其他单元格
-                        self.logger.debug(f"计算单元格宽度失败: {str(e)}")
-                
-                # 设置列宽为最大宽度加一些边距
-                final_width = min(max_width + 20, max_col_width)  # 限制最大宽度
-                tree_widget.column(col, width=final_width, anchor='center')
-                
-                # 配置列标题居中显示
-                tree_widget.heading(col, anchor='center')
-                
-            except Exception as e:
-                # 如果整列调整失败，使用默认宽度并记录错误
-                tree_widget.column(col, width=150, anchor='center')
-                self.logger.warning(f"调整列'{col}'宽度失败: {str(e)}")
+            # 设置列宽为估算宽度加一些边距，并限制最大宽度；列标题居中显示
+            tree_widget.column(col, width=min(max_len * 9 + 20, max_col_width), anchor='center')
+            tree_widget.heading(col, anchor='center')
         
         # 确保Treeview自动扩展填充可用空间
         tree_widget.column('#0', width=0, stretch=tk.NO)  # 隐藏默认的#0列
@@ -2743,20 +3133,20 @@ class FHZDDataQueryTool:
         """切换结果显示模式"""
         # 如果未指定模式，则使用切换按钮的状态
         if mode is None:
-            mode = self.view_mode_var.get() if hasattr(self, 'view_mode_var') else self.current_view_mode
+            mode = self.view_mode_var.get() if self.view_mode_var is not None else self.current_view_mode
         
         self.current_view_mode = mode
         
         # 切换视图显示
-        if hasattr(self, 'result_text') and hasattr(self, 'table_frame'):
+        if self.result_text is not None and self.table_frame is not None:
             # 切换到表格视图时自动适应列宽
-            if mode == 'table' and hasattr(self, 'result_tree'):
+            if mode == 'table' and self.result_tree is not None:
                 self._autofit_tree_columns()
             if mode == 'table':
                 self.result_text.grid_remove()
                 self.table_frame.grid()
                 # 自动调整列宽以适应内容
-                if hasattr(self, 'tree'):
+                if self.tree is not None:
                     # 先设置一个初始宽度
                     for col in self.tree['columns']:
                         self.tree.column(col, width=120, anchor='center')
@@ -2766,59 +3156,55 @@ class FHZDDataQueryTool:
                 self.table_frame.grid_remove()
                 self.result_text.grid()
                 # 更新文本显示格式
-                if hasattr(self, 'current_query_result') and self.current_query_result:
+                if self.current_query_result:
                     self._format_text_display()
                     
 
             
     def _format_text_display(self):
         """格式化文本显示，使输出更易读"""
-        if not hasattr(self, 'result_text') or not self.current_query_result:
+        if self.result_text is None or not self.current_query_result:
             return
             
         # 清空现有文本
         self.result_text.delete(1.0, tk.END)
         
-        try:
-            # 尝试将结果解析为JSON
-            import json
-            parsed = json.loads(self.current_query_result)
-            # 格式化JSON以提高可读性
-            formatted = json.dumps(parsed, ensure_ascii=False, indent=2)
-            self.result_text.insert(tk.END, formatted)
-        except:
-            # 如果解析失败，直接显示原始文本
-            self.result_text.insert(tk.END, self.current_query_result)
-        
-        # 如果有当前查询结果，尝试在当前视图中显示
-        if hasattr(self, 'current_query_result') and self.current_query_result:
-            # 这里可以添加逻辑，将当前结果根据视图模式重新显示
-            pass
+        # 同一查询结果的格式化文本只生成一次，反复切换视图时直接复用
+        result = self.current_query_result
+        if result is not self._formatted_source:
+            try:
+                # 尝试将结果解析为JSON，格式化以提高可读性；显示方法已解析过时直接使用其结果
+                data = self._parsed_result
+                if data is None:
+                    data = _json_loads(result)
+                formatted = json.dumps(data, ensure_ascii=False, indent=2)
+            except (ValueError, TypeError):
+                # 如果解析失败，直接显示原始文本
+                formatted = result
+            self._formatted_source = result
+            self._formatted_text = formatted
+        self.result_text.insert(tk.END, self._formatted_text)
+        self._text_dirty = True
     
     def refresh_data(self):
         """优化的刷新数据方法"""
         # 保存当前视图模式
-        previous_mode = self.current_view_mode if hasattr(self, 'current_view_mode') else 'text'
+        previous_mode = self.current_view_mode
         
         self.set_status("正在刷新数据...")
         self.clear_results()
         
         try:
             # 清除缓存
-            if hasattr(self, 'result_cache'):
-                self.result_cache = {}
-            if hasattr(self, 'cache_timestamps'):
-                self.cache_timestamps = {}
+            with self._cache_lock:
+                self.result_cache.clear()
             
             # 优先使用保存的查询状态
-            if hasattr(self, 'current_query_function') and self.current_query_function:
+            if self.current_query_function:
                 self.current_query_function(*self.current_query_args)
             else:
                 # 回退到基于标签页的刷新
-                if hasattr(self, '_refresh_by_current_tab'):
-                    self._refresh_by_current_tab()
-                else:
-                    messagebox.showinfo("提示", "请先执行一次查询操作")
+                self._refresh_by_current_tab()
             
         except Exception as e:
             error_msg = f"刷新数据失败: {str(e)}"
@@ -2828,27 +3214,16 @@ class FHZDDataQueryTool:
     
     def _refresh_by_current_tab(self):
         """根据当前标签页刷新数据"""
-        if hasattr(self, 'notebook'):
+        if self.notebook is not None:
             current_tab = self.notebook.select()
             tab_id = self.notebook.index(current_tab)
             
-            # 根据标签页索引重新执行相应的查询
-            if tab_id == 0:  # 认证设置 - 无需查询
+            # 根据标签页索引直接取出相应的查询重新执行
+            handler = self._tab_handlers[tab_id] if tab_id < len(self._tab_handlers) else None
+            if handler is not None:
+                handler()
+            elif tab_id == 0:
                 self.set_status("认证设置页面无需刷新数据")
-            elif tab_id == 1:  # 昨日日报
-                self.query_daily_report()
-            elif tab_id == 2:  # 战场周报
-                self.query_weekly_report()
-            elif tab_id == 3:  # 周报队友
-                self.query_friend_report()
-            elif tab_id == 4:  # 烽火周报
-                self.query_fire_weekly_report()
-            elif tab_id == 5:  # 货币查询
-                self.query_currency()
-            elif tab_id == 6:  # 每日密码
-                self.query_secret()
-            elif tab_id == 7:  # 特勤处状态
-                self.query_special_duty()
 
     def export_data(self):
         """导出当前显示的数据，支持多种格式，优化用户体验"""
@@ -2858,90 +3233,82 @@ class FHZDDataQueryTool:
             messagebox.showinfo("提示", "没有数据可以导出")
             return
 
+        # 根据配置确定默认导出格式
+        default_ext = "." + self.config.get('export_format', 'txt')
+        
+        # 定义支持的文件类型
+        filetypes = [
+            ("文本文件 (TXT)", "*.txt"),
+            ("CSV表格文件", "*.csv"),
+            ("所有文件", "*.*")
+        ]
+        
+        # 显示文件保存对话框，添加初始文件名建议
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        initial_filename = f"查询结果_{timestamp}{default_ext}"
+        
+        filename = filedialog.asksaveasfilename(
+            defaultextension=default_ext,
+            filetypes=filetypes,
+            title="导出数据",
+            initialfile=initial_filename
+        )
+        if not filename:
+            return
+        
+        # 显示进度条
+        self.set_status("正在导出数据...")
+        self.update_progress(30)
+        
+        # 只有文件写入可能失败，异常处理只包住写入部分
         try:
-            # 根据配置确定默认导出格式
-            default_ext = "." + self.config.get('export_format', 'txt')
-            
-            # 定义支持的文件类型
-            filetypes = [
-                ("文本文件 (TXT)", "*.txt"),
-                ("CSV表格文件", "*.csv"),
-                ("所有文件", "*.*")
-            ]
-            
-            # 显示文件保存对话框，添加初始文件名建议
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            initial_filename = f"查询结果_{timestamp}{default_ext}"
-            
-            filename = filedialog.asksaveasfilename(
-                defaultextension=default_ext,
-                filetypes=filetypes,
-                title="导出数据",
-                initialfile=initial_filename
-            )
-            
-            if filename:
-                # 显示进度条
-                self.set_status("正在导出数据...")
-                self.update_progress(30)
-                
-                # 确定文件扩展名
-                _, ext = os.path.splitext(filename)
-                ext = ext.lower()
-                
-                # 根据不同格式导出数据
-                if ext == '.csv':
-                    # 尝试将表格数据转换为CSV格式
-                    csv_content = self._convert_to_csv(content)
-                    with open(filename, "w", encoding="utf-8-sig") as f:  # 使用UTF-8 BOM以便Excel正确识别
-                        f.write(csv_content)
-                else:
-                    # 默认使用TXT格式
-                    with open(filename, "w", encoding="utf-8") as f:
-                        f.write(content)
-                
-                # 更新进度
-                self.update_progress(100)
-                self.set_status(f"数据导出完成: {os.path.basename(filename)}")
-                messagebox.showinfo("成功", f"数据已导出到 {filename}")
-        except Exception as e:
+            self._write_displayed_content(filename, content)
+        except OSError as e:
             self.update_progress(0)
             messagebox.showerror("错误", f"导出失败: {str(e)}")
-            
-    def _convert_to_csv(self, content):
-        """尝试将表格格式的文本转换为CSV格式"""
-        lines = content.strip().split('\n')
-        csv_lines = []
+            return
         
-        for line in lines:
-            # 尝试检测常见的表格分隔符（制表符或多个空格）
-            import re
-            # 将多个空格或制表符替换为逗号
-            csv_line = re.sub(r'\s{2,}|\t', ',', line.strip())
-            csv_lines.append(csv_line)
+        # 更新进度
+        self.update_progress(100)
+        self.set_status(f"数据导出完成: {os.path.basename(filename)}")
+        messagebox.showinfo("成功", f"数据已导出到 {filename}")
+    
+    def _write_displayed_content(self, filename, content):
+        """按文件扩展名将显示的内容写为CSV或TXT文件，没有扩展名时按TXT处理"""
+        if os.path.splitext(filename)[1].lower() == '.csv':
+            # 尝试将表格数据转换为CSV格式，逐行写入较大的文件缓冲区，不在内存中拼接完整内容
+            with open(filename, "w", encoding="utf-8-sig", newline='', buffering=1 << 20) as f:  # 使用UTF-8 BOM以便Excel正确识别
+                csv.writer(f).writerows(self._iter_csv_rows(content))
+        else:
+            # 默认使用TXT格式
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(content)
+            
+    @staticmethod
+    def _iter_csv_rows(content):
+        """将表格格式的文本逐行拆分为CSV数据行
         
-        return '\n'.join(csv_lines)
+        按多个空格或制表符拆分各列，交给csv.writer写出时含逗号、引号的单元格会被正确转义
+        """
+        split = _CSV_SEP_RE.split
+        for line in content.strip().split('\n'):
+            line = line.strip()
+            # 空行写为空行，不写成只含一个空字符串的行
+            yield split(line) if line else ()
 
     # ==================== 数据处理函数（供导出使用） ====================
 
     def _process_special_duty_data(self, result):
         """处理特勤处状态数据（格式化版）"""
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             jData = data.get("jData", {})
             place_data = jData.get("data", {}).get("data", {}).get("placeData", [])
 
             facilities = []
             for place in place_data:
                 left_time_seconds = place.get('leftTime', 0)
-                if left_time_seconds > 0:
-                    hours = left_time_seconds // 3600
-                    minutes = (left_time_seconds % 3600) // 60
-                    seconds = left_time_seconds % 60
-                    formatted_time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                else:
-                    formatted_time = "已完成"
+                formatted_time = _format_left_time(left_time_seconds)
 
                 facilities.append({
                     "名称": place.get('Name', '未知'),
@@ -2956,7 +3323,7 @@ class FHZDDataQueryTool:
     def _process_daily_data(self, result, resource_type):
         """处理昨日日报数据（格式化版）"""
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             if data.get('ret') != 0 or data.get('iRet') != 0:
                 return {"错误": f"请求失败: {data.get('sMsg', '未知错误')}"}
 
@@ -2972,16 +3339,17 @@ class FHZDDataQueryTool:
                 report_data = actual_data.get('solDetail', {})
                 top_items = report_data.get('userCollectionTop', {}).get('list', [])
 
-                processed_items = []
-                for i, item in enumerate(top_items, 1):
-                    item_id = item.get('objectID', '未知')
-                    processed_items.append({
+                get_item_name = self.get_item_name
+                processed_items = [
+                    {
                         "排名": i,
-                        "物品ID": item_id,
-                        "物品名称": self.get_item_name(item_id),
+                        "物品ID": (item_id := item.get('objectID', '未知')),
+                        "物品名称": get_item_name(item_id),
                         "带出数量": item.get('count', 0),
                         "物品价值": float(item.get('price', 0))
-                    })
+                    }
+                    for i, item in enumerate(top_items, 1)
+                ]
 
                 return {
                     "报告日期": report_data.get('recentGainDate', '未知'),
@@ -3004,7 +3372,7 @@ class FHZDDataQueryTool:
     def _process_weekly_data(self, result, mode):
         """处理战场周报数据（格式化版）"""
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             if data.get('ret') != 0 or data.get('iRet') != 0:
                 return {"错误": f"请求失败: {data.get('sMsg', '未知错误')}"}
 
@@ -3017,44 +3385,8 @@ class FHZDDataQueryTool:
             if isinstance(weekly_data, list) and len(weekly_data) == 0:
                 return {"信息": "本周无战场周报数据"}
 
-            fields = {
-                'Consume_Bullet_Num': '总消耗弹药数',
-                'Hit_Bullet_Num': '总命中子弹数',
-                'Kill_Num': '总击杀数',
-                'Kill_type1_Num': '载具击杀数量',
-                'Rank_Match_Score': '排位分',
-                'Rescue_Campmate_Count': '救援阵营队友数',
-                'Rescue_Teammate_Count': '救援小队队友数',
-                'SBattle_Support_CostScore': '局内支援呼叫消耗分数',
-                'SBattle_Support_UseNum': '局内支援呼叫次数',
-                'Teammate_Reborn_Num': '队友重生次数',
-                'Used_Time': '使用次数',
-                'by_Rescue_num': '被救援次数',
-                'continuous_Kill_Num': '最高连续击杀',
-                'total_Occupy': '占点数',
-                'total_gametime': '总游戏时长(秒)',
-                'total_num': '对局场次',
-                'total_score': '总得分',
-                'win_num': '胜场',
-                'DeployArmedForceType_KillNum': '本命干员完成击杀',
-                'DeployArmedForceType_gametime': '本命干员游戏时长(秒)',
-                'DeployArmedForceType_inum': '本命干员完成对局',
-                'max_inum_DeployArmedForceType': '本命干员ID',
-                'max_inum_mapid': '地图信息'
-            }
-
-            processed_data = {}
-            for field, description in fields.items():
-                value = weekly_data.get(field, '无数据')
-                if value != '无数据' and isinstance(value, (int, float, str)) and str(value).replace('.', '', 1).isdigit():
-                    try:
-                        if '.' in str(value):
-                            value = f"{float(value):,.1f}"
-                        else:
-                            value = f"{int(value):,}"
-                    except:
-                        pass
-                processed_data[description] = value
+            processed_data = {description: _format_stat_value(weekly_data.get(field, '无数据'))
+                              for field, description in _WEEKLY_FIELDS}
 
             return processed_data
         except Exception as e:
@@ -3063,7 +3395,7 @@ class FHZDDataQueryTool:
     def _process_friend_data(self, result, mode):
         """处理队友数据（格式化版）"""
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             if data.get('ret') != 0 or data.get('iRet') != 0:
                 return {"错误": f"请求失败: {data.get('sMsg', '未知错误')}"}
 
@@ -3076,22 +3408,14 @@ class FHZDDataQueryTool:
             if not friends_data:
                 return {"信息": "无队友数据"}
 
+            # 各队友的字段与显示方法共用_FRIEND_FIELDS，每个字典由一次推导式直接构造
             processed_friends = []
+            add_friend = processed_friends.append
             for i, friend in enumerate(friends_data, 1):
-                friend_info = {
-                    "序号": i,
-                    "OpenID": friend.get('friend_openid', '未知'),
-                    "总场次": f"{friend.get('Friend_total_sol_num', 0):,}",
-                    "撤离成功": f"{friend.get('Friend_is_Escape1_num', 0):,}",
-                    "撤离失败": f"{friend.get('Friend_is_Escape2_num', 0):,}",
-                    "总带出价值": f"{friend.get('Friend_Sum_Gained_Price', 0):,}",
-                    "最高带出价值": f"{friend.get('Friend_Max_Gained_Price', 0):,}",
-                    "总战损": f"{friend.get('Friend_consume_Price', 0):,}",
-                    "击杀玩家数": f"{friend.get('Friend_total_sol_KillPlayer', 0):,}",
-                    "死亡次数": f"{friend.get('Friend_total_sol_DeathCount', 0):,}",
-                    "救援次数": f"{friend.get('Friend_total_sol_AssistCnt', 0):,}"
-                }
-                processed_friends.append(friend_info)
+                get_field = friend.get
+                friend_info = {"序号": i, "OpenID": get_field('friend_openid', '未知')}
+                friend_info.update((desc, f"{get_field(field, 0):,}") for field, desc in _FRIEND_FIELDS)
+                add_friend(friend_info)
 
             return {
                 "队友数量": len(friends_data),
@@ -3103,7 +3427,7 @@ class FHZDDataQueryTool:
     def _process_fire_weekly_data(self, result):
         """处理烽火周报数据（格式化版）"""
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             if data.get('ret') != 0 or data.get('iRet') != 0:
                 return {"错误": f"请求失败: {data.get('sMsg', '未知错误')}"}
 
@@ -3116,57 +3440,21 @@ class FHZDDataQueryTool:
             if not fire_weekly_data:
                 return {"信息": "无烽火周报数据"}
 
-            # 基础字段
-            fields = {
-                'Gained_Price': '本周总带出哈夫币',
-                'consume_Price': '本周总带入',
-                'rise_Price': '本周总利润',
-                'total_sol_num': '本周对局数',
-                'total_exacuation_num': '本周撤离成功数',
-                'total_Kill_Player': '本周击败干员数',
-                'total_Kill_AI': '本周击杀AI数',
-                'total_Kill_Boss': '本周击杀BOSS数',
-                'total_Death_Count': '本周死亡数',
-                'GainedPrice_overmillion_num': '本周百万撤离场次',
-                'total_Online_Time': '本周在线时长(秒)',
-                'Rank_Score': '排位分数',
-                'Mandel_brick_num': '本周曼德尔砖破译数',
-            }
-
-            processed_data = {}
-            for field, description in fields.items():
-                value = fire_weekly_data.get(field, '无数据')
-                if value != '无数据' and isinstance(value, (int, float, str)) and str(value).replace('.', '', 1).isdigit():
-                    try:
-                        if '.' in str(value):
-                            value = f"{float(value):,.1f}"
-                        else:
-                            value = f"{int(value):,}"
-                    except:
-                        pass
-                processed_data[description] = value
+            processed_data = {description: _format_stat_value(fire_weekly_data.get(field, '无数据'))
+                              for field, description in _FIRE_WEEKLY_FIELDS}
 
             # 干员使用情况
             operator_data = fire_weekly_data.get('total_ArmedForceId_num', '')
             operators = []
             if operator_data and isinstance(operator_data, str) and '#' in operator_data:
-                operator_dict = {}
-                for op_str in operator_data.split('#'):
-                    if op_str.strip():
-                        try:
-                            op_item = parse_dict_like_string(op_str.strip())
-                            op_id = str(op_item.get('ArmedForceId', ''))
-                            op_count = int(op_item.get('inum', 0))
-                            if op_id:
-                                operator_dict[op_id] = operator_dict.get(op_id, 0) + op_count
-                        except:
-                            continue
-
-                if operator_dict:
-                    total_uses = sum(operator_dict.values())
-                    for op_id, op_count in sorted(operator_dict.items(), key=lambda x: int(x[1]), reverse=True):
-                        op_name = self.operator_map.get(op_id, f"未知干员({op_id})")
-                        percentage = (int(op_count) / total_uses * 100) if total_uses > 0 else 0
+                operator_counts = _aggregate_operators(operator_data)
+
+                if operator_counts:
+                    total_uses = sum(op_count for _, op_count in operator_counts)
+                    get_operator_name = self.operator_map.get
+                    for op_id, op_count in operator_counts:
+                        op_name = get_operator_name(op_id) or f"未知干员({op_id})"
+                        percentage = (op_count / total_uses * 100) if total_uses > 0 else 0
                         operators.append({
                             "干员名称": op_name,
                             "使用次数": op_count,
@@ -3179,27 +3467,29 @@ class FHZDDataQueryTool:
             highprice_list_str = fire_weekly_data.get('CarryOut_highprice_list', '')
             highprice_items = []
             if highprice_list_str and isinstance(highprice_list_str, str) and '#' in highprice_list_str:
-                for item_str in highprice_list_str.split('#'):
-                    if item_str.strip():
-                        try:
-                            item_dict = parse_dict_like_string(item_str.strip())
-                            item_id = item_dict.get('itemid', '未知')
-                            price = float(item_dict.get('iPrice', 0))
-                            highprice_items.append({
-                                "物品名称": self.get_item_name(item_id),
-                                "物品ID": item_id,
-                                "类型": f"{item_dict.get('auctontype', '未知类型')} - {item_dict.get('auctonsubtype', '')}",
-                                "品质": f"{item_dict.get('quality', 0)}级",
-                                "数量": int(item_dict.get('inum', 1)),
-                                "总价值": f"{price:,.0f}哈夫币"
-                            })
-                        except:
-                            continue
+                get_item_name = self.get_item_name
+                # 与显示方法共用_parse_records，一次完成按'#'拆分、去除空白和键值对提取
+                add_item = highprice_items.append
+                for item_dict in _parse_records(highprice_list_str):
+                    try:
+                        item_id = item_dict.get('itemid', '未知')
+                        price = float(item_dict.get('iPrice', 0))
+                        # 数值价格与格式化后的物品一起保存，排序时不必再解析"总价值"文本
+                        add_item((price, {
+                            "物品名称": get_item_name(item_id),
+                            "物品ID": item_id,
+                            "类型": f"{item_dict.get('auctontype', '未知类型')} - {item_dict.get('auctonsubtype', '')}",
+                            "品质": f"{item_dict.get('quality', 0)}级",
+                            "数量": int(item_dict.get('inum', 1)),
+                            "总价值": f"{price:,.0f}哈夫币"
+                        }))
+                    except (TypeError, ValueError):
+                        continue
 
+            highprice_items.sort(key=itemgetter(0), reverse=True)
             processed_data["高价值物品列表"] = {
                 "物品总数": len(highprice_items),
-                "物品详情": sorted(highprice_items, key=lambda x: float(x["总价值"].replace(',', '').replace('哈夫币', '')),
-                               reverse=True)
+                "物品详情": [item for _, item in highprice_items]
             }
 
             return processed_data
@@ -3209,7 +3499,7 @@ class FHZDDataQueryTool:
     def _process_currency_data(self, result, item_type):
         """处理货币数据（格式化版）"""
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             if data.get('ret') != 0 or data.get('iRet') != 0:
                 return {"错误": f"请求失败: {data.get('sMsg', '未知错误')}"}
 
@@ -3236,7 +3526,7 @@ class FHZDDataQueryTool:
     def _process_secret_data(self, result):
         """处理每日密码数据（格式化版）"""
         try:
-            data = json.loads(result)
+            data = _json_loads(result)
             jdata = data.get('jData', {})
             secret_data = jdata.get('data', {})
 
@@ -3256,17 +3546,12 @@ class FHZDDataQueryTool:
             return {"错误": f"解析失败: {str(e)}"}
 
     # ==================== 数据获取方法（原始数据） ====================
+    # 以下方法在导出线程池中执行，cookie和界面参数由主线程读取后传入，不访问Tk变量
 
-    def _get_daily_report_data(self, resource_type, s_area=None):
+    def _get_daily_report_data(self, cookie, resource_type, s_area):
         """获取昨日日报原始数据"""
-        if s_area is None:
-            s_area = self.daily_area_var.get().strip() or "36"
-        cookie = self.get_cookie()
-
         params = {
-            'iChartId': '316969',
-            'iSubChartId': '316969',
-            'sIdeToken': 'NoOapI',
+            **_RECORD_CHART_PARAMS,
             'method': 'dfm/center.recent.detail',
             'source': '2',
             'sArea': s_area,
@@ -3274,16 +3559,12 @@ class FHZDDataQueryTool:
         }
 
         headers = {'Cookie': cookie}
-        return self._make_api_request("comm.ams.game.qq.com", params, headers)
+        return self._make_api_request(_API_HOST, params, headers)
 
-    def _get_weekly_report_data(self, mode, stat_date, s_area):
+    def _get_weekly_report_data(self, cookie, mode, stat_date, s_area):
         """获取战场周报原始数据"""
-        cookie = self.get_cookie()
-
         params = {
-            'iChartId': '316969',
-            'iSubChartId': '316969',
-            'sIdeToken': 'NoOapI',
+            **_RECORD_CHART_PARAMS,
             'method': f'dfm/weekly.{mode}.record',
             'source': '5',
             'sArea': s_area,
@@ -3291,94 +3572,60 @@ class FHZDDataQueryTool:
         }
 
         headers = {'Cookie': cookie}
-        return self._make_api_request("comm.ams.game.qq.com", params, headers)
+        return self._make_api_request(_API_HOST, params, headers)
 
-    def _get_friend_report_data(self, mode, stat_date, s_area):
+    def _get_friend_report_data(self, cookie, mode, stat_date, s_area):
         """获取队友数据原始数据"""
-        cookie = self.get_cookie()
-
-        method = f"dfm/weekly.{mode}.friend.record"
-        param_data = {'source': '5', 'method': method, 'statDate': stat_date}
-
-        params = {
-            'iChartId': '316968',
-            'iSubChartId': '316968',
-            'sIdeToken': 'KfXJwH',
-            'source': '5',
-            'sArea': s_area,
-            'method': method,
-            'statDate': stat_date,
-            'param': json.dumps(param_data)
-        }
-
+        params = self._friend_record_params(f"dfm/weekly.{mode}.friend.record", stat_date, s_area)
         headers = {'Cookie': cookie}
-        return self._make_api_request("comm.ams.game.qq.com", params, headers)
+        return self._make_api_request(_API_HOST, params, headers)
 
-    def _get_fire_weekly_report_data(self, stat_date, s_area):
+    def _get_fire_weekly_report_data(self, cookie, stat_date, s_area):
         """获取烽火周报原始数据"""
-        cookie = self.get_cookie()
-
-        params = {
-            'iChartId': '316968',
-            'iSubChartId': '316968',
-            'sIdeToken': 'KfXJwH',
-            'source': '5',
-            'sArea': s_area,
-            'method': 'dfm/weekly.sol.record',
-            'statDate': stat_date,
-            'param': json.dumps({'source': '5', 'method': 'dfm/weekly.sol.record', 'statDate': stat_date})
-        }
-
+        params = self._friend_record_params('dfm/weekly.sol.record', stat_date, s_area)
         headers = {'Cookie': cookie}
-        return self._make_api_request("comm.ams.game.qq.com", params, headers)
+        return self._make_api_request(_API_HOST, params, headers)
 
-    def _get_currency_data(self, item_type):
+    def _get_currency_data(self, cookie, item_type):
         """获取货币资产原始数据"""
-        cookie = self.get_cookie()
-
         params = {
-            'iChartId': '319386',
-            'iSubChartId': '319386',
-            'sIdeToken': 'zMemOt',
+            **_CURRENCY_CHART_PARAMS,
             'item': item_type,
             'type': '3'
         }
 
         headers = {'Cookie': cookie}
-        return self._make_api_request("comm.ams.game.qq.com", params, headers)
+        return self._make_api_request(_API_HOST, params, headers)
 
-    def _get_secret_data(self):
+    def _get_secret_data(self, cookie, source):
         """获取每日密码原始数据"""
-        cookie = self.get_cookie()
-
         params = {
-            'iChartId': '316969',
-            'iSubChartId': '316969',
-            'sIdeToken': 'NoOapI',
+            **_RECORD_CHART_PARAMS,
             'method': 'dfm/center.day.secret',
-            'source': self.secret_source_var.get().strip(),
+            'source': source,
             'param': '{}'
         }
 
         headers = {'Cookie': cookie}
-        return self._make_api_request("comm.ams.game.qq.com", params, headers)
+        return self._make_api_request(_API_HOST, params, headers)
 
-    def _get_special_duty_data(self):
+    def _get_special_duty_data(self, cookie):
         """获取特勤处状态原始数据"""
-        cookie = self.get_cookie()
-
-        params = {
-            'iChartId': '365589',
-            'iSubChartId': '365589',
-            'sIdeToken': 'bQaMCQ',
-            'source': '2'
-        }
-
         headers = {'Cookie': cookie}
-        return self._make_api_request("comm.ams.game.qq.com", params, headers)
+        return self._make_api_request(_API_HOST, _SPECIAL_DUTY_PARAMS, headers)
     
     def show_config_dialog(self):
-        """显示配置选项对话框"""
+        """显示配置选项对话框，对话框只创建一次，再次打开时按当前配置刷新各选项后重新显示"""
+        config_window = self._config_window
+        if config_window is not None and config_window.winfo_exists():
+            self._sync_config_dialog()
+            # 主题可能已切换，重新设置窗口背景
+            config_window.configure(bg=self.current_theme['bg'])
+            self.theme_manager.apply_theme_to_widget(config_window, recursive=False)
+            config_window.deiconify()
+            config_window.grab_set()
+            return
+        
         # 创建配置对话框
         config_window = tk.Toplevel(self.root)
         config_window.title("配置选项")
@@ -3394,23 +3641,31 @@ class FHZDDataQueryTool:
         notebook = ttk.Notebook(config_window)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # 各选项的变量先创建为空，由sync_vars按当前配置填入
+        timeout_var = tk.StringVar()
+        retry_var = tk.StringVar()
+        cache_var = tk.StringVar()
+        theme_var = tk.StringVar()
+        confirm_exit_var = tk.BooleanVar()
+        auto_refresh_var = tk.BooleanVar()
+        refresh_var = tk.StringVar()
+        log_var = tk.BooleanVar()
+        export_var = tk.StringVar()
+        
         # 网络设置页
         network_frame = ttk.Frame(notebook)
         notebook.add(network_frame, text="网络设置")
         
         # API超时设置
         ttk.Label(network_frame, text="API超时时间 (秒):", style="TLabel").grid(row=0, column=0, sticky=tk.W, padx=10, pady=10)
-        timeout_var = tk.StringVar(value=str(self.config['timeout']))
         ttk.Entry(network_frame, textvariable=timeout_var, width=10).grid(row=0, column=1, sticky=tk.W, padx=10, pady=10)
         
         # 重试次数设置
         ttk.Label(network_frame, text="请求重试次数:", style="TLabel").grid(row=1, column=0, sticky=tk.W, padx=10, pady=10)
-        retry_var = tk.StringVar(value=str(self.config['retry_count']))
         ttk.Entry(network_frame, textvariable=retry_var, width=10).grid(row=1, column=1, sticky=tk.W, padx=10, pady=10)
         
         # 缓存过期时间
         ttk.Label(network_frame, text="缓存过期时间 (秒):", style="TLabel").grid(row=2, column=0, sticky=tk.W, padx=10, pady=10)
-        cache_var = tk.StringVar(value=str(self.config['cache_expiry']))
         ttk.Entry(network_frame, textvariable=cache_var, width=10).grid(row=2, column=1, sticky=tk.W, padx=10, pady=10)
         
         # 显示设置页
@@ -3419,44 +3674,65 @@ class FHZDDataQueryTool:
         
         # 主题选择
         ttk.Label(display_frame, text="应用主题:", style="TLabel").grid(row=0, column=0, sticky=tk.W, padx=10, pady=10)
-        theme_var = tk.StringVar(value=self.theme_manager.current_theme)
         theme_frame = ttk.Frame(display_frame)
         theme_frame.grid(row=0, column=1, sticky=tk.W, padx=10, pady=10)
         
         ttk.Radiobutton(theme_frame, text="浅色", variable=theme_var, value="light").pack(side=tk.LEFT)
         ttk.Radiobutton(theme_frame, text="深色", variable=theme_var, value="dark").pack(side=tk.LEFT)
         
+        # 退出确认
+        ttk.Checkbutton(display_frame, text="关闭窗口时确认退出", variable=confirm_exit_var).grid(row=1, column=0, columnspan=2, sticky=tk.W, padx=10, pady=10)
+        
         # 数据设置页
         data_frame = ttk.Frame(notebook)
         notebook.add(data_frame, text="数据设置")
         
-        # 自动刷新
-        auto_refresh_var = tk.BooleanVar(value=self.config['auto_refresh'])
-        ttk.Checkbutton(data_frame, text="启用自动刷新", variable=auto_refresh_var, command=lambda: refresh_frame.grid(row=1, column=0) if auto_refresh_var.get() else refresh_frame.grid_remove()).grid(row=0, column=0, sticky=tk.W, padx=10, pady=10)
-        
         # 刷新间隔
         refresh_frame = ttk.Frame(data_frame)
         ttk.Label(refresh_frame, text="刷新间隔 (秒):", style="TLabel").pack(side=tk.LEFT, padx=5)
-        refresh_var = tk.StringVar(value=str(self.config['refresh_interval']))
         ttk.Entry(refresh_frame, textvariable=refresh_var, width=10).pack(side=tk.LEFT)
         
-        # 根据当前设置显示或隐藏刷新间隔
-        if auto_refresh_var.get():
-            refresh_frame.grid(row=1, column=0, sticky=tk.W, padx=30, pady=5)
+        def update_refresh_frame():
+            """根据是否启用自动刷新显示或隐藏刷新间隔"""
+            if auto_refresh_var.get():
+                refresh_frame.grid(row=1, column=0, sticky=tk.W, padx=30, pady=5)
+            else:
+                refresh_frame.grid_remove()
+        
+        # 自动刷新
+        ttk.Checkbutton(data_frame, text="启用自动刷新", variable=auto_refresh_var, command=update_refresh_frame).grid(row=0, column=0, sticky=tk.W, padx=10, pady=10)
         
         # 详细日志
-        log_var = tk.BooleanVar(value=self.config['show_detailed_logs'])
         ttk.Checkbutton(data_frame, text="显示详细日志", variable=log_var).grid(row=2, column=0, sticky=tk.W, padx=10, pady=10)
         
         # 导出格式
         ttk.Label(data_frame, text="默认导出格式:", style="TLabel").grid(row=3, column=0, sticky=tk.W, padx=10, pady=10)
-        export_var = tk.StringVar(value=self.config['export_format'])
         export_frame = ttk.Frame(data_frame)
         export_frame.grid(row=3, column=1, sticky=tk.W, padx=10, pady=10)
         
         ttk.Radiobutton(export_frame, text="文本 (TXT)", variable=export_var, value="txt").pack(side=tk.LEFT, padx=5)
         ttk.Radiobutton(export_frame, text="表格 (CSV)", variable=export_var, value="csv").pack(side=tk.LEFT, padx=5)
         
+        def sync_vars():
+            """按当前配置设置各选项的值，取消后再次打开时丢弃未应用的修改"""
+            timeout_var.set(str(self.config['timeout']))
+            retry_var.set(str(self.config['retry_count']))
+            cache_var.set(str(self.config['cache_expiry']))
+            theme_var.set(self.theme_manager.current_theme)
+            confirm_exit_var.set(self.config.get('confirm_exit', True))
+            auto_refresh_var.set(self.config['auto_refresh'])
+            refresh_var.set(str(self.config['refresh_interval']))
+            log_var.set(self.config['show_detailed_logs'])
+            export_var.set(self.config['export_format'])
+            update_refresh_frame()
+        
+        def close_dialog():
+            """隐藏对话框以便下次打开时复用"""
+            config_window.grab_release()
+            config_window.withdraw()
+        
+        sync_vars()
+        
         # 底部按钮区域
         button_frame = ttk.Frame(config_window)
         button_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -3471,32 +3747,34 @@ class FHZDDataQueryTool:
                 self.config['refresh_interval'] = int(refresh_var.get())
                 self.config['show_detailed_logs'] = log_var.get()
                 self.config['export_format'] = export_var.get()
+                self.config['confirm_exit'] = confirm_exit_var.get()
+                
+                # 按新的设置重新安排自动刷新
+                self.setup_auto_refresh()
                 
                 # 更新主题
                 if theme_var.get() != self.theme_manager.current_theme:
-                    self.theme_manager.current_theme = theme_var.get()
-                    self.current_theme = self.theme_manager.get_theme()
-                    self._update_style()
+                    self.toggle_theme()
                 
-                # 保存配置
-                self.save_config()
-                messagebox.showinfo("成功", "配置已保存")
-                config_window.destroy()
+                # 保存配置，写入完成后再提示
+                self.save_config(lambda: messagebox.showinfo("成功", "配置已保存"))
+                close_dialog()
                 
             except ValueError as e:
                 messagebox.showerror("输入错误", f"请检查输入值: {str(e)}")
         
-        ttk.Button(button_frame, text="取消", command=config_window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="取消", command=close_dialog).pack(side=tk.RIGHT, padx=5)
         ttk.Button(button_frame, text="应用", command=apply_settings).pack(side=tk.RIGHT, padx=5)
+        # 关闭窗口按钮同样只隐藏对话框
+        config_window.protocol("WM_DELETE_WINDOW", close_dialog)
         
-        # 更新样式以应用当前主题
-        for frame in [network_frame, display_frame, data_frame]:
-            for widget in frame.winfo_children():
-                if isinstance(widget, ttk.Widget):
-                    widget.configure(style="TLabel")
+        self._config_window = config_window
+        self._sync_config_dialog = sync_vars
+        
+        # 更新样式以应用当前主题：对话框内都是ttk控件，样式随ttk主题自动更新，只需处理窗口本身，不必遍历子控件
+        self.theme_manager.apply_theme_to_widget(config_window, recursive=False)
 
     # 数据可视化相关方法已移除
-            messagebox.showerror("错误", error_msg)
     
     def show_help(self):
         help_text = """使用说明：
@@ -3564,7 +3842,7 @@ class FHZDDataQueryTool:
 
     def _setup_logging(self):
         """优化的日志系统设置"""
-        log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+        log_dir = os.path.join(_APP_DIR, 'logs')
         os.makedirs(log_dir, exist_ok=True)
         
         log_filename = os.path.join(log_dir, f"app_{datetime.now().strftime('%Y%m%d')}.log")
@@ -3594,8 +3872,9 @@ class FHZDDataQueryTool:
             for handler in self.logger.handlers[:]:
                 self.logger.removeHandler(handler)
         
-        # 创建文件处理器
-        file_handler = logging.FileHandler(log_filename, encoding='utf-8')
+        # 创建文件处理器：单个日志文件超过10MB时轮转，最多保留5个备份，避免日志无限增长
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_filename, maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8')
         file_handler.setLevel(log_level)
         file_handler.setFormatter(formatter)
         
@@ -3632,55 +3911,143 @@ class FHZDDataQueryTool:
     def log_error(self, message):
         """记录错误日志"""
         if hasattr(self, 'logger'):
-            self.logger.error(message)
-            # 如果有异常信息，记录异常堆栈
-            if traceback.format_exc() != 'NoneType: None\n':
-                self.logger.error(traceback.format_exc())
+            # 如果正在处理异常，一并记录异常堆栈
+            self.logger.error("%s", message, exc_info=sys.exc_info()[1] is not None)
     
     def setup_auto_refresh(self):
         """设置自动刷新功能"""
         # 取消现有的定时器（如果有）
-        if hasattr(self, 'auto_refresh_timer') and self.auto_refresh_timer:
+        if self.auto_refresh_timer:
             self.root.after_cancel(self.auto_refresh_timer)
             self.auto_refresh_timer = None
         
         # 根据配置决定是否启用自动刷新
-        if self.config.get('auto_refresh', False):
-            interval = self.config.get('refresh_interval', 60) * 1000  # 转换为毫秒
+        self._auto_refresh_enabled = self.config.get('auto_refresh', False)
+        self._refresh_interval = self.config.get('refresh_interval', 60)
+        self._auto_refresh_failures = 0
+        self._current_refresh_interval = self._refresh_interval
+        self._last_refresh_digest = None
+        self._awaiting_refresh_result = False
+        if self._auto_refresh_enabled:
+            interval = self._refresh_interval * 1000  # 转换为毫秒
+            self._next_refresh_at = time.monotonic() + self._refresh_interval
             self.auto_refresh_timer = self.root.after(interval, self._auto_refresh_callback)
             self.log_info(f"已启用自动刷新，刷新间隔：{interval/1000}秒")
         else:
             self.log_info("自动刷新已禁用")
     
+    def _note_refresh_result(self, result):
+        """根据自动刷新得到的数据是否变化调整刷新间隔：未变化时间隔加倍（有上限），变化时恢复为配置的间隔"""
+        digest = hash(result)
+        if digest == self._last_refresh_digest:
+            self._current_refresh_interval = min(self._current_refresh_interval * 2,
+                                                 max(self._refresh_interval, _MAX_REFRESH_INTERVAL))
+        else:
+            self._current_refresh_interval = self._refresh_interval
+        self._last_refresh_digest = digest
+    
+    def _note_auto_refresh_failure(self):
+        """自动刷新发起的请求失败时累计连续失败次数，并按退避后的间隔重新设置定时器"""
+        self._auto_refresh_failures += 1
+        self.log_error(f"自动刷新失败（连续{self._auto_refresh_failures}次）")
+        if self._auto_refresh_enabled:
+            if self.auto_refresh_timer:
+                self.root.after_cancel(self.auto_refresh_timer)
+            self._schedule_auto_refresh()
+    
+    def _schedule_auto_refresh(self):
+        """按连续失败次数和当前刷新间隔计算下一次自动刷新的时刻并设置定时器"""
+        interval = self._refresh_interval
+        now = time.monotonic()
+        if self._auto_refresh_failures:
+            # 连续失败时间隔按2的幂次延长，最长10分钟，避免持续出错时反复刷新和写日志
+            self._next_refresh_at = now + min(interval * 2 ** self._auto_refresh_failures, max(interval, _MAX_REFRESH_INTERVAL))
+        else:
+            interval = self._current_refresh_interval
+            # 从本次的预定时刻起算下一次刷新，扣除回调延迟和刷新本身的耗时
+            self._next_refresh_at += interval
+            # 落后超过一个周期时不补做错过的刷新，从当前时刻重新计时
+            if self._next_refresh_at < now:
+                self._next_refresh_at = now + interval
+        delay = int((self._next_refresh_at - now) * 1000)
+        self.auto_refresh_timer = self.root.after(delay, self._auto_refresh_callback)
+    
     def _auto_refresh_callback(self):
-        """自动刷新的回调函数"""
+        """自动刷新的回调函数
+        
+        查询在后台完成，失败次数由_on_api_done在请求结束时统计
+        """
         try:
-            # 只有在有数据显示时才执行自动刷新
-            if hasattr(self, 'tree') and len(self.tree.get_children()) > 0 or hasattr(self, 'result_text') and self.result_text.get(1.0, tk.END).strip():
-                self.refresh_data()
-        except Exception as e:
-            error_msg = f"自动刷新失败: {str(e)}"
-            self.log_error(error_msg)
+            # 已有查询正在进行（如用户手动刷新）时不再叠加一次刷新，由进行中的查询更新显示
+            if self._inflight:
+                self.logger.debug("查询正在进行中，跳过自动刷新")
+            # 只有在有数据显示时才执行自动刷新：直接使用写入结果时维护的标记，不再取出表格行和整个文本内容检查
+            elif self._tree_dirty or self._text_dirty:
+                # 查询在后台完成，结果返回时由_note_refresh_result据此调整刷新间隔
+                self._awaiting_refresh_result = True
+                try:
+                    self.refresh_data()
+                finally:
+                    # 当前页面没有发起查询时也不能把标记留给之后的手动查询
+                    self._awaiting_refresh_result = False
         finally:
             # 无论成功失败，都重新设置定时器
-            if self.config.get('auto_refresh', False):
-                interval = self.config.get('refresh_interval', 60) * 1000
-                self.auto_refresh_timer = self.root.after(interval, self._auto_refresh_callback)
-            
-    def _on_mouse_move(self, event):
-        """处理鼠标悬停效果"""
-        # 检查组件类型，确保只对Text组件应用标签操作
-        if hasattr(event.widget, 'tag_remove') and hasattr(event.widget, 'tag_add'):
-            # 获取鼠标位置对应的项
-            item = event.widget.identify_row(event.y) if hasattr(event.widget, 'identify_row') else None
-            if item:
-                # 高亮当前行
-                event.widget.tag_remove('hover', '*')
-                event.widget.tag_add('hover', item)
-            else:
-                # 移除所有高亮
-                event.widget.tag_remove('hover', '*')
+            if self._auto_refresh_enabled:
+                self._schedule_auto_refresh()
             
+    def _on_tree_mouse_move(self, event):
+        """处理表格（Treeview）的鼠标悬停效果，合并快速移动产生的大量事件，只按最后一次移动更新高亮"""
+        if not self._hover_tracking:
+            return
+        scheduled = self._pending_hover is not None
+        self._pending_hover = (event.widget, event.y)
+        if not scheduled:
+            self.root.after(30, self._flush_hover)
+    
+    def _on_tree_enter(self, event):
+        """鼠标进入表格时开始跟踪移动"""
+        self._hover_tracking = True
+    
+    def _on_tree_leave(self, event):
+        """鼠标离开表格时停止跟踪移动，丢弃尚未处理的移动并清除悬停高亮"""
+        self._hover_tracking = False
+        self._pending_hover = None
+        last_path, last_item = self._last_hover
+        self._last_hover = (None, None)
+        if last_item is not None:
+            try:
+                event.widget.tk.call(last_path, 'tag', 'remove', 'hover', last_item)
+            except tk.TclError:
+                pass
+    
+    def _flush_hover(self):
+        """按最近一次鼠标位置更新表格的悬停高亮，只用于绑定了_on_tree_mouse_move的Treeview"""
+        pending = self._pending_hover
+        if pending is None:
+            # 鼠标已离开表格
+            return
+        widget, y = pending
+        self._pending_hover = None
+        # 鼠标移动时调用频繁，直接以控件路径调用Tcl命令，跳过tkinter包装方法的参数处理
+        call = widget.tk.call
+        path = widget._w
+        # 获取鼠标位置对应的项
+        item = call(path, 'identify', 'row', 0, y) or None
+        # 仍在同一行（或仍不在任何行上）时高亮不变，不再发出Tcl调用
+        if (path, item) == self._last_hover:
+            return
+        last_path, last_item = self._last_hover
+        self._last_hover = (path, item)
+        # 只从上一次高亮的行移除hover标签并加到新行上，不再用通配符处理全部行；
+        # tkinter没有封装Treeview的tag add/remove子命令
+        if last_item is not None:
+            try:
+                call(last_path, 'tag', 'remove', 'hover', last_item)
+            except tk.TclError:
+                # 上一次高亮的行已随表格清空被删除
+                pass
+        if item is not None:
+            call(path, 'tag', 'add', 'hover', item)
 
 
 if __name__ == "__main__":